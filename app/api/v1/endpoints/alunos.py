@@ -1,11 +1,11 @@
 # app/api/v1/endpoints/alunos.py
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_async_session
 from app.crud.aluno import aluno as crud_aluno
 from app.schemas.aluno import AlunoResponse, AlunoListResponse, AlunoFull
-from app.services.sync_aluno import sync_alunos
+from app.api.v1.endpoints.sync import sync_alunos_endpoint
 import logging
 
 router = APIRouter()
@@ -75,23 +75,11 @@ async def estatisticas_alunos(
 
 @router.post("/sync", response_model=dict)
 async def sincronizar_alunos(
-    background_tasks: BackgroundTasks,
     incremental: bool = False,
+    resume: bool = False,
     db: AsyncSession = Depends(get_async_session),
 ):
-    """
-    Inicia a sincronização completa dos alunos com a API Lyceum.
-    A execução ocorre em background.
-    """
-    async def task():
-        stats = await sync_alunos(db, incremental=incremental)
-        logger.info(f"Sincronização de alunos concluída: {stats}")
-
-    background_tasks.add_task(task)
-    return {
-        "message": "Sincronização de alunos iniciada em background",
-        "incremental": incremental,
-        "status": "processing"
-    }
+    """Atalho para `POST /sync/alunos` (mesmo job, single-flight e resposta)."""
+    return await sync_alunos_endpoint(incremental=incremental, resume=resume, db=db)
 
 # Inclua outros endpoints conforme necessidade (ex: por curso, por série, etc.)
\ No newline at end of file
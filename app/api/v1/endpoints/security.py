@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db
 from app.services.lyceum_api import LyceumAPIClientReadOnly
+from app.services.rate_limiter import get_rate_limiter
 from app.core.security import APISecurity
 import logging
 
@@ -35,6 +36,8 @@ async def check_lyceum_api_health():
         
         return {
             "api_lyceum": health_status,
+            "rate_limiter": await client.rate_limiter.snapshot(),
+            "http_cache": client.cache.stats() if client.cache is not None else None,
             "security_mode": "read_only",
             "allowed_methods": ["GET"],
             "message": "API Lyceum configurada em modo READ-ONLY"
@@ -50,6 +53,17 @@ async def check_lyceum_api_health():
         )
 
 
+@router.get("/lyceum/rate-limit")
+async def get_lyceum_rate_limit():
+    """
+    Estado atual do limitador adaptativo de chamadas a API Lyceum
+
+    Taxa corrente (req/s), fichas disponiveis e quantas reducoes
+    por congestionamento (429, 5xx, latencia alta) ja ocorreram
+    """
+    return await get_rate_limiter().snapshot()
+
+
 @router.get("/lyceum/endpoints")
 async def list_lyceum_endpoints():
     """
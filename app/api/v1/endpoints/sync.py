@@ -1,51 +1,255 @@
 # app/api/v1/endpoints/sync.py
+import functools
+from graphlib import CycleError
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, status
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.api.deps import get_async_session
+from app.models.sync_job import SyncJob
+from app.schemas.sync_job import SyncJobDetail, SyncJobResponse
 from app.services.sync_aluno import sync_alunos
+from app.services.sync_jobs import spawn_job, start_job
+from app.services.lyceum_api import LyceumAPIError
+from app.services.sync_registry import SYNC_SERVICES, diff_entity, sync_entity
+from app.services.sync_dag import SyncDAGRunner, dependency_levels
+from app.services.sync_shards import ShardWorker, plan_sharded_job
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+async def start_sync(
+    db: AsyncSession,
+    entidade: str,
+    sync: Callable[..., Awaitable[Dict[str, Any]]],
+    incremental: bool = False,
+    resume: bool = False,
+) -> Dict[str, Any]:
+    """
+    Dispara `sync(session, incremental=, resume=, job_id=)` em background com
+    single-flight por entidade; com outra execução em andamento, devolve o job
+    dela (409 se ele ainda não apareceu). Usado por todas as rotas de sync.
+    """
+    job_id, lock = await start_job(db, entidade, incremental=incremental)
+    if lock is None:
+        # Single-flight: o gatilho se junta à execução em andamento
+        if job_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Sincronização de {entidade} já em andamento"
+            )
+        return {
+            "message": f"Sincronização de {entidade} já em andamento",
+            "job_id": job_id,
+            "coalescido": True,
+        }
+    await spawn_job(
+        job_id,
+        lambda session: sync(session, incremental=incremental, resume=resume, job_id=job_id),
+        lock,
+    )
+
+    return {
+        "message": f"Sincronização de {entidade} iniciada em background",
+        "job_id": job_id,
+        "coalescido": False,
+        "incremental": incremental,
+        "resume": resume,
+        "started_at": datetime.now().isoformat(),
+    }
+
+
 @router.post("/alunos", response_model=dict)
 async def sync_alunos_endpoint(
-    background_tasks: BackgroundTasks,
     incremental: bool = False,
+    resume: bool = False,
     db: AsyncSession = Depends(get_async_session),
 ):
     """
     Inicia a sincronização completa dos alunos com a API Lyceum.
-    A execução ocorre em background.
+    A execução ocorre em background; o progresso fica em `/sync/jobs/{job_id}`.
+    Se já houver uma sincronização de alunos em andamento (em qualquer réplica),
+    nenhuma outra é iniciada e a resposta traz o job em andamento.
+    Com `resume=true` retoma a última execução interrompida a partir do checkpoint.
     """
-    async def task():
-        try:
-            stats = await sync_alunos(db, incremental=incremental)
-            logger.info(f"Sincronização de alunos concluída: {stats}")
-        except Exception as e:
-            logger.error(f"Erro na sincronização em background: {e}")
+    return await start_sync(db, "alunos", sync_alunos, incremental=incremental, resume=resume)
+
+
+@router.post("/dag", response_model=dict)
+async def sync_dag_endpoint(
+    background_tasks: BackgroundTasks,
+    incremental: bool = False,
+    entidades: Optional[List[str]] = Query(None, description="Entidades a sincronizar (padrão: todas)"),
+):
+    """
+    Sincroniza várias entidades respeitando as dependências do registro
+    (`depends_on`): independentes em paralelo, dependentes assim que as
+    dependências terminam. Cada entidade vira um job em `/sync/jobs`; o
+    relatório de tempos (total, serial, caminho crítico) vai para o log.
+    """
+    try:
+        runner = SyncDAGRunner(entidades, incremental=incremental)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    try:
+        niveis = dependency_levels(runner.graph)
+    except CycleError as e:
+        # Ciclo em `depends_on`: erro de configuração do registro, não recurso ausente
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Dependências entre entidades formam um ciclo: {e.args[1]}",
+        )
+    background_tasks.add_task(runner.run)
 
-    background_tasks.add_task(task)
-    
     return {
-        "message": "Sincronização de alunos iniciada em background",
+        "message": "Sincronização por dependências iniciada em background",
+        "niveis": niveis,
         "incremental": incremental,
         "started_at": datetime.now().isoformat(),
     }
 
 
-@router.get("/status", response_model=dict)
-async def get_sync_status():
+@router.post("/{entidade}", response_model=dict)
+async def sync_entidade_endpoint(
+    entidade: str,
+    incremental: bool = False,
+    resume: bool = False,
+    db: AsyncSession = Depends(get_async_session),
+):
     """
-    Obter status da última sincronização.
-    Em produção, implementar tracking de jobs com Redis/Celery.
+    Inicia em background a sincronização de qualquer entidade registrada
+    (`SYNC_SERVICES`: cursos, disciplinas, turmas, ...), com o mesmo
+    single-flight e acompanhamento em `/sync/jobs/{job_id}` de alunos.
     """
+    if entidade not in SYNC_SERVICES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entidade sem sincronização registrada: {entidade}"
+        )
+    sync = functools.partial(sync_entity, entidade=entidade)
+    return await start_sync(db, entidade, sync, incremental=incremental, resume=resume)
+
+
+@router.post("/{entidade}/shards", response_model=dict)
+async def sync_entidade_shards_endpoint(
+    entidade: str,
+    background_tasks: BackgroundTasks,
+    pages_per_shard: Optional[int] = Query(None, ge=1, description="Páginas por faixa (padrão SYNC_SHARD_PAGES)"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Inicia uma carga completa distribuída: a entidade é dividida em faixas de
+    páginas (`sync_shard`) que qualquer worker (scripts/sync_worker.py, em
+    qualquer nó) reivindica por lease. Um worker local é iniciado em background;
+    o job é encerrado por quem concluir a última faixa.
+    """
+    if entidade not in SYNC_SERVICES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entidade sem sincronização registrada: {entidade}"
+        )
+    try:
+        job_id, criado = await plan_sharded_job(db, entidade, pages_per_shard=pages_per_shard)
+    except LyceumAPIError as e:
+        logger.error(f"❌ Planejamento da carga distribuída de {entidade} falhou: {e}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    if not criado:
+        if job_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Sincronização de {entidade} já em andamento"
+            )
+        return {
+            "message": f"Sincronização de {entidade} já em andamento",
+            "job_id": job_id,
+            "coalescido": True,
+        }
+    background_tasks.add_task(ShardWorker(entidade=entidade).run)
+
+    return {
+        "message": f"Carga distribuída de {entidade} iniciada",
+        "job_id": job_id,
+        "coalescido": False,
+        "started_at": datetime.now().isoformat(),
+    }
+
+
+@router.get("/{entidade}/diff", response_model=dict)
+async def diff_entidade_endpoint(
+    entidade: str,
+    sample: Optional[int] = Query(None, ge=0, le=1000, description="Chaves de exemplo por tipo de mudança"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Dry-run da carga completa: quantos registros seriam inseridos, atualizados
+    e marcados como removidos na origem (com exemplos), sem gravar nada.
+    """
+    if entidade not in SYNC_SERVICES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entidade sem sincronização registrada: {entidade}"
+        )
+    try:
+        return await diff_entity(db, entidade, sample=sample)
+    except LyceumAPIError as e:
+        logger.error(f"❌ Dry-run de {entidade} falhou: {e}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+
+@router.get("/jobs", response_model=List[SyncJobResponse])
+async def listar_jobs(
+    db: AsyncSession = Depends(get_async_session),
+    entidade: Optional[str] = Query(None, description="Filtrar por entidade (ex: alunos)"),
+    status_job: Optional[str] = Query(None, alias="status", description="Filtrar por status"),
+    limit: int = Query(50, ge=1, le=500, description="Quantidade máxima de jobs"),
+):
+    """Lista os jobs de sincronização, do mais recente para o mais antigo."""
+    query = select(SyncJob).order_by(SyncJob.criado_em.desc()).limit(limit)
+    if entidade:
+        query = query.where(SyncJob.entidade == entidade)
+    if status_job:
+        query = query.where(SyncJob.status == status_job)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.get("/jobs/{job_id}", response_model=SyncJobDetail)
+async def obter_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Progresso (páginas, registros, vazão, ETA) e estatísticas finais de um job."""
+    job = await db.get(SyncJob, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job de sincronização não encontrado"
+        )
+    return job
+
+
+@router.get("/status", response_model=dict)
+async def get_sync_status(
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Último job de sincronização de cada entidade."""
+    ultimos = (
+        select(SyncJob.entidade, func.max(SyncJob.criado_em).label("criado_em"))
+        .group_by(SyncJob.entidade)
+        .subquery()
+    )
+    jobs = (await db.execute(
+        select(SyncJob).join(
+            ultimos,
+            (SyncJob.entidade == ultimos.c.entidade) & (SyncJob.criado_em == ultimos.c.criado_em),
+        )
+    )).scalars().all()
     return {
-        "status": "not_implemented",
-        "message": "Status tracking não implementado nesta versão",
-        "suggestion": "Verifique os logs para informações de sincronização",
-    }
\ No newline at end of file
+        "entidades": {
+            job.entidade: SyncJobResponse.model_validate(job).model_dump(mode="json") for job in jobs
+        },
+    }
@@ -1,5 +1,5 @@
 # app/core/config.py
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -39,7 +39,60 @@ class Settings(BaseSettings):
     LYCEUM_API_PASSWORD: str = ""
     LYCEUM_API_TIMEOUT: int = 30
     LYCEUM_API_PAGE_SIZE: int = 100
-    LYCEUM_API_DELAY: float = 0.1
+    LYCEUM_API_DELAY: float = 0.1  # define a taxa inicial do limitador (1/delay req/s)
+    LYCEUM_API_PREFETCH_WINDOW: int = 1  # páginas em voo por endpoint (1 = sequencial)
+    LYCEUM_FETCH_MAX_CONCURRENCY: int = 8  # páginas em voo somando todos os endpoints (orquestrador)
+    LYCEUM_API_MAX_RETRIES: int = 4  # novas tentativas por página (timeout, 429, 5xx)
+    LYCEUM_API_BACKOFF_BASE: float = 0.5
+    LYCEUM_API_BACKOFF_MAX: float = 30.0
+    LYCEUM_API_JSON_DECODER: str = "auto"  # "auto" (orjson se instalado), "orjson" ou "json"
+    # Pool de conexões HTTP compartilhado (aberto no lifespan da aplicação)
+    LYCEUM_API_HTTP2: bool = False
+    LYCEUM_API_MAX_CONNECTIONS: int = 20
+    LYCEUM_API_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LYCEUM_API_KEEPALIVE_EXPIRY: float = 30.0
+    # Limitador adaptativo (token bucket + AIMD) – "local" ou "redis" (entre processos)
+    LYCEUM_RATE_LIMIT_BACKEND: str = "local"
+    LYCEUM_RATE_LIMIT_MIN: float = 0.5
+    LYCEUM_RATE_LIMIT_MAX: float = 50.0
+    LYCEUM_RATE_LIMIT_BURST: float = 5.0
+    LYCEUM_RATE_LIMIT_TARGET_LATENCY: float = 2.0
+    # Cache em disco das páginas (GET condicional com ETag/Last-Modified)
+    LYCEUM_HTTP_CACHE_ENABLED: bool = False
+    LYCEUM_HTTP_CACHE_DIR: str = ".cache/lyceum"
+    LYCEUM_HTTP_CACHE_TTL: int = 300  # segundos servindo sem revalidar
+    LYCEUM_HTTP_CACHE_MAX_MB: int = 512
+
+    # Sincronização
+    SYNC_STREAMING: bool = False  # consome a API página a página (memória limitada a uma página)
+    SYNC_WATERMARK_ENABLED: bool = True  # incremental envia a marca d'água à API (só alterados)
+    SYNC_UPSERT_CHUNK_SIZE: int = 1000  # linhas por INSERT .. ON CONFLICT (limitado pelos parâmetros do banco)
+    SYNC_COMMIT_EVERY: int = 5000  # registros por lote/savepoint (commit por lote fora do streaming)
+    SYNC_PIPELINE_QUEUE_SIZE: int = 4  # páginas por fila entre busca → normalização → gravação (streaming)
+    SYNC_NORMALIZE_WORKERS: int = 0  # >0: normaliza páginas fora do event loop (pool de workers)
+    SYNC_NORMALIZE_EXECUTOR: str = "auto"  # process | thread | auto (thread só em Python sem GIL)
+    SYNC_FULL_COPY: bool = False  # carga completa via COPY em staging UNLOGGED + merge (só PostgreSQL)
+    SYNC_MARK_SWEEP: bool = True  # carga completa marca registros sumidos da origem (removido_origem)
+    SYNC_JOB_PROGRESS_SECONDS: float = 1.0  # intervalo mínimo entre atualizações de progresso em sync_job
+    SYNC_LOCK_JOIN_ATTEMPTS: int = 10  # tentativas (0,1 s) de achar o job em andamento ao agregar um gatilho
+    SYNC_SCHEDULER_ENABLED: bool = False  # agendador em processo (lifespan) de sincronizações periódicas
+    SYNC_SCHEDULE_INCREMENTAL_SECONDS: int = 900  # intervalo padrão entre sincronizações incrementais
+    SYNC_SCHEDULE_FULL_SECONDS: int = 86400  # carga completa quando a última concluída é mais antiga
+    SYNC_SCHEDULE_FULL_RETRY_SECONDS: int = 3600  # espera mínima após uma carga completa que falhou
+    SYNC_SCHEDULE_INTERVALS: Dict[str, int] = {}  # intervalo incremental por entidade (JSON; 0 desliga)
+    SYNC_SCHEDULE_FULL_INTERVALS: Dict[str, int] = {}  # intervalo da carga completa por entidade (JSON)
+    SYNC_SCHEDULE_JITTER: float = 0.1  # variação aleatória (±fração) dos intervalos
+    SYNC_SCHEDULER_MAX_CONCURRENT: int = 2  # entidades sincronizando ao mesmo tempo pelo agendador
+    SYNC_SHARD_PAGES: int = 50  # páginas por faixa na carga completa distribuída (sync_shard)
+    SYNC_SHARD_LEASE_SECONDS: int = 120  # validade do lease de uma faixa, renovado a cada página gravada
+    SYNC_SHARD_MAX_ATTEMPTS: int = 3  # reivindicações de uma faixa antes de marcá-la com erro
+    SYNC_SHARD_RETRY_SECONDS: float = 30.0  # espera antes de reivindicar de novo uma faixa que falhou (dobra a cada tentativa)
+    SYNC_SHARD_RETRY_MAX_SECONDS: float = 600.0  # teto da espera entre tentativas de uma faixa
+    SYNC_SHARD_POLL_SECONDS: float = 5.0  # espera do worker contínuo quando não há faixa livre
+    SYNC_DAG_MAX_CONCURRENT: int = 3  # entidades sincronizando ao mesmo tempo no DAG de dependências
+    SYNC_DIFF_SAMPLE: int = 10  # chaves de exemplo por tipo de mudança no dry-run
+    SYNC_DIFF_DB_BATCH: int = 5000  # linhas por lote ao ler o banco em streaming no dry-run
+    SYNC_DIFF_API_CHUNK: int = 200000  # chaves da API em memória no dry-run; além disso, blocos ordenados em disco
 
     # Redis (opcional)
     REDIS_HOST: str = "redis"
@@ -6,6 +6,10 @@ from fastapi.responses import HTMLResponse
 from app.core.config import settings
 from app.core.database import engine
 from app.api.v1.api import api_router
+from app.services.lyceum_api import LyceumAPIClient
+from app.services.normalizer import shutdown_normalization_executor
+from app.services.sync_jobs import cancel_running_jobs
+from app.services.sync_scheduler import SyncScheduler
 from app.middleware.security import LyceumAPISecurityMiddleware, RateLimitMiddleware
 import logging
 
@@ -18,8 +22,17 @@ async def lifespan(app: FastAPI):
     """Lifespan manager para eventos de startup/shutdown"""
     logger.info("🚀 Iniciando API Lyceum Sync (MODO READ-ONLY)")
     logger.info("⚠  AVISO: Apenas metodos GET sao permitidos para API Lyceum")
+    await LyceumAPIClient.open_pool()
+    scheduler = SyncScheduler() if settings.SYNC_SCHEDULER_ENABLED else None
+    if scheduler is not None:
+        scheduler.start()
     yield
     logger.info("🛑 Encerrando API Lyceum Sync")
+    if scheduler is not None:
+        await scheduler.stop()
+    await cancel_running_jobs()
+    await LyceumAPIClient.close_pool()
+    shutdown_normalization_executor()
 
 
 # Criar aplicacao FastAPI
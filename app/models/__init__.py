@@ -1,6 +1,21 @@
-# app/models/__init__.py
 from .ly_aluno import LYAluno
+from .sync_checkpoint import SyncCheckpoint
+from .sync_job import SyncJob
+from .sync_shard import SyncShard
+from .sync_watermark import SyncWatermark
+from .registry import ENTITIES, MODELS, EntitySpec
+
+# Modelos gerados pelo registro (LYCurso, LYTurma, ...)
+globals().update({model.__name__: model for model in MODELS.values()})
 
 __all__ = [
     "LYAluno",
-]
\ No newline at end of file
+    "SyncCheckpoint",
+    "SyncJob",
+    "SyncShard",
+    "SyncWatermark",
+    "ENTITIES",
+    "MODELS",
+    "EntitySpec",
+    *(model.__name__ for model in MODELS.values()),
+]
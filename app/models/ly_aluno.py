@@ -1,6 +1,6 @@
 # app/models/ly_aluno.py
 from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 from app.core.database import Base
 
 class LYAluno(Base):
@@ -58,6 +58,10 @@ class LYAluno(Base):
     data_criacao = Column(DateTime, server_default=func.now(), nullable=False, comment="Data de criação no sistema")
     data_atualizacao = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Data da última atualização")
     sincronizado = Column(Boolean, default=False, nullable=False, comment="Sincronizado com sucesso")
+    hash_conteudo = Column(String(64), nullable=True, comment="SHA-256 do registro normalizado (sem campos de controle)")
+    geracao_sync = Column(Integer, nullable=True, comment="Geração da última carga completa que trouxe o registro")
+    removido_origem = Column(Boolean, default=False, server_default=false(), nullable=False, comment="Registro não existe mais no Lyceum")
+    data_remocao_origem = Column(DateTime, nullable=True, comment="Data em que o registro foi marcado como removido na origem")
 
     def __repr__(self):
         return f"<LYAluno(aluno='{self.aluno}', nome='{self.nome_compl}')>"
\ No newline at end of file
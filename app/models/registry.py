@@ -0,0 +1,235 @@
+# app/models/registry.py
+"""
+Registro declarativo das tabelas Lyceum sincronizadas.
+
+Cada `EntitySpec` descreve endpoint, tabela, chave (simples ou composta) e
+colunas; dela saem o modelo SQLAlchemy (`build_model`, com as colunas de
+controle do sync), o serviço de sincronização (app/services/sync_registry.py)
+e as migrations (`alembic revision --autogenerate` enxerga todos os modelos
+registrados em Base.metadata). Nova tabela = nova entrada em ENTITIES;
+`depends_on` ordena a sincronização entre entidades (DAG).
+"""
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Type
+
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float
+from sqlalchemy.sql import false, func
+from sqlalchemy.types import TypeEngine
+
+from app.core.database import Base
+
+# coluna -> (tipo, comentário)
+Campos = Dict[str, Tuple[TypeEngine, str]]
+
+
+class EntitySpec(NamedTuple):
+    endpoint: str  # chave em LyceumAPIClient.ENDPOINTS
+    table: str
+    class_name: str
+    key: Tuple[str, ...]
+    columns: Campos  # inclui as colunas da chave
+    comment: str
+    converters: Dict[str, Callable[[Any], Any]] = {}  # coluna -> conversor (padrão: derivado do tipo)
+    field_map: Dict[str, str] = {}  # coluna -> campo da API, quando os nomes diferem
+    # Marca d'água no servidor: só com um filtro >= aceito pelo endpoint (ambos ou nenhum);
+    # sem ela, o incremental compara `stamp_atualizacao` com os stamps locais
+    watermark_field: Optional[str] = None
+    watermark_param: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()  # entidades referenciadas, sincronizadas antes (app/services/sync_dag.py)
+
+
+def control_columns() -> Dict[str, Column]:
+    """Colunas de controle do sync (as mesmas de LYAluno), novas a cada modelo."""
+    return {
+        "data_sincronizacao": Column(DateTime, server_default=func.now(), nullable=False, comment="Data da última sincronização"),
+        "data_criacao": Column(DateTime, server_default=func.now(), nullable=False, comment="Data de criação no sistema"),
+        "data_atualizacao": Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Data da última atualização"),
+        "sincronizado": Column(Boolean, default=False, nullable=False, comment="Sincronizado com sucesso"),
+        "hash_conteudo": Column(String(64), nullable=True, comment="SHA-256 do registro normalizado (sem campos de controle)"),
+        "geracao_sync": Column(Integer, nullable=True, comment="Geração da última carga completa que trouxe o registro"),
+        "removido_origem": Column(Boolean, default=False, server_default=false(), nullable=False, comment="Registro não existe mais no Lyceum"),
+        "data_remocao_origem": Column(DateTime, nullable=True, comment="Data em que o registro foi marcado como removido na origem"),
+    }
+
+
+def build_model(spec: EntitySpec) -> Type[Base]:
+    """Modelo declarativo da entidade: colunas da spec (chave = PK) + colunas de controle."""
+    attrs: Dict[str, Any] = {
+        "__tablename__": spec.table,
+        "__doc__": spec.comment,
+        "__table_args__": {"comment": spec.comment},
+    }
+    for nome, (tipo, comentario) in spec.columns.items():
+        chave = nome in spec.key
+        attrs[nome] = Column(tipo, primary_key=chave, nullable=not chave, comment=comentario)
+    attrs.update(control_columns())
+
+    def __repr__(self):
+        valores = ", ".join(f"{c}='{getattr(self, c)}'" for c in spec.key)
+        return f"<{spec.class_name}({valores})>"
+
+    attrs["__repr__"] = __repr__
+    return type(spec.class_name, (Base,), attrs)
+
+
+STAMP = (String(50), "Timestamp atualização")
+
+ENTITIES: Tuple[EntitySpec, ...] = (
+    EntitySpec(
+        endpoint="cursos", table="ly_curso", class_name="LYCurso", key=("curso",),
+        comment="Cursos (LY_CURSO)",
+        columns={
+            "curso": (String(50), "Código do curso"),
+            "nome": (String(200), "Nome do curso"),
+            "descricao": (String(200), "Descrição"),
+            "tipo": (String(50), "Tipo do curso"),
+            "modalidade": (String(50), "Modalidade"),
+            "faculdade": (String(100), "Faculdade"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="disciplinas", table="ly_disciplina", class_name="LYDisciplina", key=("disciplina",),
+        depends_on=("cursos",),
+        comment="Disciplinas (LY_DISCIPLINA)",
+        columns={
+            "disciplina": (String(50), "Código da disciplina"),
+            "nome": (String(200), "Nome da disciplina"),
+            "descricao": (String(200), "Descrição"),
+            "curso": (String(50), "Curso responsável"),
+            "creditos": (Integer, "Créditos"),
+            "horas_aula": (Float, "Carga horária"),
+            "depto": (String(50), "Departamento"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="turmas", table="ly_turma", class_name="LYTurma",
+        key=("turma", "disciplina", "ano", "semestre"),
+        depends_on=("cursos", "disciplinas"),
+        comment="Turmas por disciplina e período (LY_TURMA)",
+        columns={
+            "turma": (String(50), "Código da turma"),
+            "disciplina": (String(50), "Disciplina"),
+            "ano": (Integer, "Ano letivo"),
+            "semestre": (Integer, "Semestre letivo"),
+            "descricao": (String(200), "Descrição"),
+            "curso": (String(50), "Curso"),
+            "turno": (String(50), "Turno"),
+            "serie": (Integer, "Série"),
+            "num_alunos": (Integer, "Alunos matriculados"),
+            "sit_turma": (String(50), "Situação da turma"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="docentes", table="ly_docente", class_name="LYDocente", key=("num_func",),
+        depends_on=("cursos",),
+        comment="Docentes (LY_DOCENTE)",
+        columns={
+            "num_func": (String(50), "Número funcional"),
+            "nome_compl": (String(200), "Nome completo"),
+            "descricao": (String(200), "Descrição"),
+            "e_mail": (String(200), "E-mail"),
+            "titulacao": (String(50), "Titulação"),
+            "depto": (String(50), "Departamento"),
+            "curso": (String(50), "Curso de lotação"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="matriculas", table="ly_matricula", class_name="LYMatricula",
+        key=("aluno", "disciplina", "turma", "ano", "semestre"),
+        depends_on=("alunos", "turmas"),
+        comment="Matrículas de alunos em turmas (LY_MATRICULA)",
+        columns={
+            "aluno": (String(50), "Matrícula do aluno"),
+            "disciplina": (String(50), "Disciplina"),
+            "turma": (String(50), "Turma"),
+            "ano": (Integer, "Ano letivo"),
+            "semestre": (Integer, "Semestre letivo"),
+            "descricao": (String(200), "Descrição"),
+            "curso": (String(50), "Curso"),
+            "serie": (Integer, "Série"),
+            "sit_matricula": (String(50), "Situação da matrícula"),
+            "dt_matricula": (DateTime, "Data da matrícula"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="curriculos", table="ly_curriculo", class_name="LYCurriculo",
+        key=("curso", "turno", "curriculo"),
+        depends_on=("cursos",),
+        comment="Currículos por curso e turno (LY_CURRICULO)",
+        columns={
+            "curso": (String(50), "Curso"),
+            "turno": (String(50), "Turno"),
+            "curriculo": (String(50), "Código do currículo"),
+            "descricao": (String(200), "Descrição"),
+            "dt_inicio": (DateTime, "Início de vigência"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="grades", table="ly_grade", class_name="LYGrade",
+        key=("curso", "turno", "curriculo", "disciplina"),
+        depends_on=("curriculos", "disciplinas"),
+        comment="Disciplinas da grade de cada currículo (LY_GRADE)",
+        columns={
+            "curso": (String(50), "Curso"),
+            "turno": (String(50), "Turno"),
+            "curriculo": (String(50), "Currículo"),
+            "disciplina": (String(50), "Disciplina"),
+            "descricao": (String(200), "Descrição"),
+            "serie": (Integer, "Série ideal"),
+            "creditos": (Integer, "Créditos"),
+            "obrigatoria": (String(1), "Obrigatória (S/N)"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="coordenacao", table="ly_coordenacao", class_name="LYCoordenacao",
+        key=("curso", "num_func"),
+        depends_on=("cursos", "docentes"),
+        comment="Coordenadores de curso (LY_COORDENACAO)",
+        columns={
+            "curso": (String(50), "Curso"),
+            "num_func": (String(50), "Número funcional do coordenador"),
+            "descricao": (String(200), "Descrição"),
+            "tipo_coord": (String(50), "Tipo de coordenação"),
+            "dt_inicio": (DateTime, "Início"),
+            "dt_fim": (DateTime, "Fim"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+    EntitySpec(
+        endpoint="turma_docente", table="ly_turma_docente", class_name="LYTurmaDocente",
+        key=("turma", "disciplina", "ano", "semestre", "num_func"),
+        depends_on=("turmas", "docentes"),
+        comment="Docentes de cada turma (LY_TURMA_DOCENTE)",
+        columns={
+            "turma": (String(50), "Turma"),
+            "disciplina": (String(50), "Disciplina"),
+            "ano": (Integer, "Ano letivo"),
+            "semestre": (Integer, "Semestre letivo"),
+            "num_func": (String(50), "Número funcional do docente"),
+            "descricao": (String(200), "Descrição"),
+            "curso": (String(50), "Curso"),
+            "tipo_docente": (String(50), "Tipo de vínculo na turma"),
+            "ativo": (String(1), "Ativo (S/N)"),
+            "stamp_atualizacao": STAMP,
+        },
+    ),
+)
+
+SPECS: Dict[str, EntitySpec] = {spec.endpoint: spec for spec in ENTITIES}
+MODELS: Dict[str, Type[Base]] = {spec.endpoint: build_model(spec) for spec in ENTITIES}
+# Classes acessíveis como atributos do módulo (pickle do ModelNormalizer no pool de processos)
+globals().update({model.__name__: model for model in MODELS.values()})
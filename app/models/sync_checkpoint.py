@@ -0,0 +1,22 @@
+# app/models/sync_checkpoint.py
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SyncCheckpoint(Base):
+    """Última página gravada com sucesso por endpoint, para retomar sincronizações interrompidas."""
+    __tablename__ = "sync_checkpoint"
+
+    endpoint = Column(String(50), primary_key=True, comment="Chave do endpoint em LyceumAPIClient.ENDPOINTS")
+    run_id = Column(String(36), nullable=False, comment="Identificador da execução")
+    status = Column(String(20), nullable=False, comment="em_andamento, interrompido ou concluido")
+    incremental = Column(Boolean, default=False, nullable=False, comment="Execução incremental")
+    parametros = Column(JSON, nullable=True, comment="Filtros enviados à API (ex.: marca d'água)")
+    ultima_pagina = Column(Integer, nullable=True, comment="Última página gravada com sucesso")
+    geracao = Column(Integer, nullable=True, comment="Geração da carga completa (mark-and-sweep)")
+    registros = Column(Integer, default=0, nullable=False, comment="Registros recebidos até o checkpoint")
+    iniciado_em = Column(DateTime, server_default=func.now(), nullable=False, comment="Início da execução")
+    atualizado_em = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Último checkpoint")
+
+    def __repr__(self):
+        return f"<SyncCheckpoint(endpoint='{self.endpoint}', status='{self.status}', pagina={self.ultima_pagina})>"
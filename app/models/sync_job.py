@@ -0,0 +1,32 @@
+# app/models/sync_job.py
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SyncJob(Base):
+    """Execução de uma sincronização, com progresso atualizado em lotes e estatísticas finais."""
+    __tablename__ = "sync_job"
+
+    id = Column(String(36), primary_key=True, comment="Identificador do job")
+    entidade = Column(String(50), nullable=False, index=True, comment="Chave do endpoint em LyceumAPIClient.ENDPOINTS")
+    run_id = Column(String(36), nullable=True, comment="Execução do checkpoint (streaming)")
+    status = Column(String(30), nullable=False, comment="pendente, em_andamento, concluido, concluido_com_erros, interrompido ou erro")
+    modo = Column(String(20), nullable=True, comment="lista, streaming ou staging")
+    incremental = Column(Boolean, default=False, nullable=False, comment="Execução incremental")
+    retomado = Column(Boolean, default=False, nullable=False, comment="Retomada a partir do checkpoint")
+    paginas = Column(Integer, default=0, nullable=False, comment="Páginas recebidas da API")
+    registros = Column(Integer, default=0, nullable=False, comment="Registros recebidos da API")
+    processados = Column(Integer, default=0, nullable=False, comment="Registros gravados, inalterados ou ignorados")
+    erros = Column(Integer, default=0, nullable=False, comment="Registros com erro")
+    registros_por_segundo = Column(Float, nullable=True, comment="Vazão de registros processados")
+    total_estimado = Column(Integer, nullable=True, comment="Total esperado (última carga completa ou tabela local)")
+    eta_segundos = Column(Float, nullable=True, comment="Tempo restante estimado")
+    estatisticas = Column(JSON, nullable=True, comment="Estatísticas finais retornadas por sync_all")
+    erro = Column(Text, nullable=True, comment="Mensagem do erro que encerrou o job")
+    criado_em = Column(DateTime, server_default=func.now(), nullable=False, comment="Criação do job")
+    iniciado_em = Column(DateTime, nullable=True, comment="Início da execução")
+    atualizado_em = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Último progresso")
+    concluido_em = Column(DateTime, nullable=True, comment="Fim da execução")
+
+    def __repr__(self):
+        return f"<SyncJob(id='{self.id}', entidade='{self.entidade}', status='{self.status}')>"
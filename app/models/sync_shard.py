@@ -0,0 +1,28 @@
+# app/models/sync_shard.py
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SyncShard(Base):
+    """Faixa de páginas de uma carga completa distribuída, reivindicada por workers via lease."""
+    __tablename__ = "sync_shard"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="Identificador do shard")
+    job_id = Column(String(36), nullable=False, index=True, comment="Job (sync_job) da carga distribuída")
+    entidade = Column(String(50), nullable=False, comment="Chave do endpoint em LyceumAPIClient.ENDPOINTS")
+    pagina_inicial = Column(Integer, nullable=False, comment="Primeira página da faixa")
+    pagina_final = Column(Integer, nullable=True, comment="Página final (exclusiva); nula = até a página vazia")
+    ultima_pagina = Column(Integer, nullable=True, comment="Última página gravada (retomada após perda do lease)")
+    geracao = Column(Integer, nullable=True, comment="Geração da carga completa (mark-and-sweep)")
+    status = Column(String(20), nullable=False, index=True, comment="pendente, em_andamento, concluido ou erro")
+    worker = Column(String(100), nullable=True, comment="Worker dono do lease")
+    lease_ate = Column(DateTime, nullable=True, comment="Validade do lease; expirado pode ser reivindicado")
+    tentativas = Column(Integer, default=0, nullable=False, comment="Reivindicações do shard")
+    proxima_tentativa = Column(DateTime, nullable=True, comment="Após uma falha, não reivindicar antes desta data")
+    watermark = Column(String(100), nullable=True, comment="Maior marca d'água vista na faixa")
+    estatisticas = Column(JSON, nullable=True, comment="Contadores do sync da faixa")
+    erro = Column(Text, nullable=True, comment="Último erro")
+    atualizado_em = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Último heartbeat")
+
+    def __repr__(self):
+        return f"<SyncShard(job_id='{self.job_id}', paginas={self.pagina_inicial}-{self.pagina_final}, status='{self.status}')>"
@@ -0,0 +1,16 @@
+# app/models/sync_watermark.py
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SyncWatermark(Base):
+    """Maior valor de atualização já sincronizado por entidade (marca d'água incremental)."""
+    __tablename__ = "sync_watermark"
+
+    entidade = Column(String(50), primary_key=True, comment="Chave do endpoint em LyceumAPIClient.ENDPOINTS")
+    campo = Column(String(100), nullable=False, comment="Campo da API usado como marca d'água")
+    valor = Column(String(100), nullable=False, comment="Maior valor sincronizado com sucesso")
+    atualizado_em = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, comment="Data da última atualização")
+
+    def __repr__(self):
+        return f"<SyncWatermark(entidade='{self.entidade}', {self.campo}='{self.valor}')>"
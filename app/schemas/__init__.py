@@ -8,6 +8,7 @@ from .aluno import (
     AlunoFull,
     AlunoListResponse,
 )
+from .sync_job import SyncJobResponse, SyncJobDetail
 
 __all__ = [
     "AlunoBase",
@@ -17,4 +18,6 @@ __all__ = [
     "AlunoResponse",
     "AlunoFull",
     "AlunoListResponse",
+    "SyncJobResponse",
+    "SyncJobDetail",
 ]
\ No newline at end of file
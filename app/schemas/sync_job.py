@@ -0,0 +1,37 @@
+# app/schemas/sync_job.py
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+# ------------------------------------------------------------
+# SyncJobResponse – progresso de um job de sincronização
+# ------------------------------------------------------------
+class SyncJobResponse(BaseModel):
+    id: str
+    entidade: str
+    run_id: Optional[str] = None
+    status: str
+    modo: Optional[str] = None
+    incremental: bool
+    retomado: bool
+    paginas: int
+    registros: int
+    processados: int
+    erros: int
+    registros_por_segundo: Optional[float] = None
+    total_estimado: Optional[int] = None
+    eta_segundos: Optional[float] = None
+    erro: Optional[str] = None
+    criado_em: datetime
+    iniciado_em: Optional[datetime] = None
+    atualizado_em: datetime
+    concluido_em: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# ------------------------------------------------------------
+# SyncJobDetail – inclui as estatísticas finais do sync
+# ------------------------------------------------------------
+class SyncJobDetail(SyncJobResponse):
+    estatisticas: Optional[Dict[str, Any]] = None
@@ -2,6 +2,10 @@
 from .base_sync import BaseSyncService
 from .sync_aluno import SyncAlunoService, sync_alunos
 from .lyceum_api import LyceumAPIClient, LyceumAPIClientReadOnly
+from .fetch_orchestrator import LyceumFetchOrchestrator
+from .sync_registry import SYNC_SERVICES, diff_entity, get_sync_service, sync_entity
+from .sync_shards import ShardWorker, plan_sharded_job
+from .sync_dag import SyncDAGRunner
 
 __all__ = [
     "BaseSyncService",
@@ -9,4 +13,12 @@ __all__ = [
     "sync_alunos",
     "LyceumAPIClient",
     "LyceumAPIClientReadOnly",
+    "LyceumFetchOrchestrator",
+    "SYNC_SERVICES",
+    "get_sync_service",
+    "sync_entity",
+    "diff_entity",
+    "ShardWorker",
+    "plan_sharded_job",
+    "SyncDAGRunner",
 ]
\ No newline at end of file
@@ -1,12 +1,25 @@
 # app/services/base_sync.py
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Type
+from abc import ABC
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 from datetime import datetime
 import logging
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
 from app.core.database import Base
-from app.services.lyceum_api import LyceumAPIClientReadOnly
+from app.models.sync_checkpoint import SyncCheckpoint
+from app.models.sync_watermark import SyncWatermark
+from app.services.bulk_upsert import (
+    GENERATION_COLUMN, HASH_COLUMN, Key, bulk_upsert, content_hash, dedupe_rows, generation_fields,
+    key_fields, next_generation, sweep_generation,
+)
+from app.services.lyceum_api import LyceumAPIClientReadOnly, LyceumAPIError
+from app.services.normalizer import ModelNormalizer, normalize_many_async, to_datetime, to_float, to_int, to_str
+from app.services.staging_copy import StagingCopyLoader
+from app.services.sync_diff import SortedMergeDiff
+from app.services.sync_jobs import SyncJobTracker
+from app.services.sync_pipeline import SyncPipeline
 from app.core.config import settings
 from app.core.security import APISecurity
 
@@ -18,15 +31,34 @@ class BaseSyncService(ABC):
     Herdeiros devem definir:
         - MODEL: classe do modelo SQLAlchemy
         - API_ENDPOINT_METHOD: nome do método no cliente (ex: "get_all_alunos")
-        - UNIQUE_FIELD: nome do campo chave primária na API (ex: "aluno")
+        - API_ENDPOINT: chave em LyceumAPIClient.ENDPOINTS (ex: "alunos"), usada no modo streaming
+        - UNIQUE_FIELD: nome do campo chave primária na API (ex: "aluno"), ou
+          tupla de campos se a chave é composta (ex: ("curso", "turno", "curriculo"))
+    Opcionalmente (sincronização incremental por marca d'água no servidor):
+        - WATERMARK_FIELD: campo de atualização da API (ex: "stamp_atualizacao");
+          precisa ser comparável como texto (ex: AAAAMMDDHHMMSS)
+        - WATERMARK_PARAM: parâmetro de filtro da API que recebe a marca d'água
+    DEPENDS_ON: entidades referenciadas, sincronizadas antes desta pelo DAG.
+    Normalização: por padrão derivada das colunas de MODEL (`ModelNormalizer`);
+        - FIELD_MAP: coluna -> campo da API, quando os nomes diferem
+        - CONVERTERS: coluna -> conversor, substituindo o derivado do tipo
     """
 
     MODEL: Type[Base]
     API_ENDPOINT_METHOD: str
-    UNIQUE_FIELD: str
+    API_ENDPOINT: str
+    UNIQUE_FIELD: Key
+    WATERMARK_FIELD: Optional[str] = None
+    WATERMARK_PARAM: Optional[str] = None
+    DEPENDS_ON: Tuple[str, ...] = ()
+    FIELD_MAP: Dict[str, str] = {}
+    CONVERTERS: Dict[str, Callable[[Any], Any]] = {}
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self._max_watermark: Optional[str] = None
+        self._generation: Optional[int] = None
+        self._job: Optional[SyncJobTracker] = None
         self.api_client = LyceumAPIClientReadOnly()
         # Valida credenciais uma vez
         APISecurity.validate_api_credentials({
@@ -35,90 +67,163 @@ class BaseSyncService(ABC):
             "LYCEUM_API_PASSWORD": settings.LYCEUM_API_PASSWORD,
         })
 
-    @abstractmethod
+    @classmethod
+    def get_normalizer(cls) -> ModelNormalizer:
+        """Normalizador do modelo, compilado uma vez por classe de serviço."""
+        normalizer = cls.__dict__.get("_normalizer")
+        if normalizer is None:
+            normalizer = ModelNormalizer(cls.MODEL, cls.FIELD_MAP, cls.CONVERTERS)
+            cls._normalizer = normalizer
+        return normalizer
+
     async def normalize_data(self, raw_data: Dict) -> Dict:
         """Converte dados crus da API para o formato do modelo."""
-        pass
+        return self.get_normalizer().normalize(raw_data)
 
-    async def sync_all(self, incremental: bool = False) -> Dict[str, Any]:
+    async def sync_all(
+        self,
+        incremental: bool = False,
+        streaming: Optional[bool] = None,
+        resume: bool = False,
+        staging: Optional[bool] = None,
+        job_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Executa sincronização completa de todos os registros.
+        Com `streaming` os registros são consumidos página a página (`iter_pages`),
+        cada página é gravada junto com um checkpoint e liberada da sessão,
+        limitando a memória a uma página. Com `resume` (implica streaming) uma
+        execução interrompida continua a partir da página seguinte ao checkpoint.
+        Em modo incremental, serviços com WATERMARK_PARAM pedem à API apenas os
+        registros alterados desde a última execução concluída.
+        Com `staging` (só PostgreSQL, só carga completa) as páginas vão por COPY
+        para uma tabela UNLOGGED e entram no destino com um único merge.
+        Cargas completas de modelos com `geracao_sync` carimbam uma nova geração
+        em cada registro visto e, se terminam sem erros, marcam com um único
+        UPDATE os registros de gerações anteriores como `removido_origem`.
+        A execução é registrada em `sync_job` (`job_id` reaproveita um job já
+        criado pela API), com progresso a cada página/lote gravado.
         Retorna estatísticas da operação.
         """
-        logger.info(f"Iniciando sincronização de {self.MODEL.__tablename__} (incremental={incremental})")
+        if streaming is None:
+            streaming = settings.SYNC_STREAMING
+        streaming = streaming or resume
+        if staging is None:
+            staging = settings.SYNC_FULL_COPY
+        staging = staging and not incremental and not resume and self._supports_staging()
+        logger.info(
+            f"Iniciando sincronização de {self.MODEL.__tablename__} "
+            f"(incremental={incremental}, streaming={streaming}, resume={resume}, staging={staging})"
+        )
         stats = {
             "total_api": 0,
             "inseridos": 0,
             "atualizados": 0,
             "ignorados": 0,
+            "inalterados": 0,
             "erros": 0,
+            "lotes_com_erro": 0,
+            "removidos_origem": 0,
+            "paginas": 0,
+            "interrompido": False,
             "iniciado_em": datetime.now(),
         }
+        modo = "staging" if staging else "streaming" if streaming else "lista"
+        self._job = await SyncJobTracker.start(
+            self.db, self.MODEL, self.API_ENDPOINT, incremental, modo, resume, job_id=job_id
+        )
+        stats["job_id"] = self._job.id
+        try:
+            await self._run(stats, incremental, streaming, resume, staging)
+        except Exception as e:
+            await self._job.finish(self._finish_stats(stats), erro=e)
+            raise
+        self._finish_stats(stats)
+        await self._job.finish(stats)
+        return stats
 
-        # 1. Obter dados da API
-        method = getattr(self.api_client, self.API_ENDPOINT_METHOD)
-        items = await method()
-        stats["total_api"] = len(items)
-
-        if not items:
-            logger.warning(f"Nenhum dado obtido para {self.MODEL.__tablename__}")
-            return stats
+    async def dry_run(self, sample: Optional[int] = None) -> Dict[str, Any]:
+        """
+        O que uma carga completa mudaria, sem gravar: chaves e hashes da API e
+        do banco comparados por merge-join ordenado (`SortedMergeDiff`).
+        Retorna contagens e amostras de inserções, atualizações e remoções.
+        """
+        return await SortedMergeDiff(self, sample=sample).run()
 
-        # 2. (Opcional) Para incremental, carregar stamps existentes
+    async def _run(
+        self,
+        stats: Dict[str, Any],
+        incremental: bool,
+        streaming: bool,
+        resume: bool,
+        staging: bool,
+    ) -> None:
+        """Etapas da sincronização: marca d'água, busca/gravação, varredura e commit."""
+        # 1. Incremental: marca d'água no servidor ou, sem ela, stamps locais
+        custom_params = None
         existing_stamps = {}
-        if incremental and hasattr(self.MODEL, "stamp_atualizacao"):
+        self._max_watermark = None
+        watermark = await self._load_watermark() if incremental else None
+        if watermark is not None:
+            custom_params = {self.WATERMARK_PARAM: watermark.valor}
+            stats["watermark_anterior"] = watermark.valor
+            logger.info(f"🔖 Incremental por marca d'água: {self.WATERMARK_FIELD} >= {watermark.valor}")
+        elif incremental and hasattr(self.MODEL, "stamp_atualizacao"):
+            campos = key_fields(self.UNIQUE_FIELD)
             result = await self.db.execute(
-                select(self.MODEL.id, getattr(self.MODEL, self.UNIQUE_FIELD), self.MODEL.stamp_atualizacao)
+                select(*(getattr(self.MODEL, c) for c in campos), self.MODEL.stamp_atualizacao)
             )
-            existing_stamps = {getattr(row, self.UNIQUE_FIELD): row.stamp_atualizacao for row in result.all()}
+            n = len(campos)
+            existing_stamps = {(row[0] if n == 1 else tuple(row[:n])): row[n] for row in result.all()}
 
-        # 3. Processar cada item
-        for i, item in enumerate(items, 1):
-            try:
-                unique_value = item.get(self.UNIQUE_FIELD)
-                if not unique_value:
-                    stats["ignorados"] += 1
-                    continue
+        # Mark-and-sweep: só cargas completas veem todos os registros da origem
+        self._generation = None
+        if not incremental and settings.SYNC_MARK_SWEEP and GENERATION_COLUMN in self.MODEL.__table__.c:
+            self._generation = await next_generation(self.db, self.MODEL)
 
-                # Incremental: verificar se stamp mudou
-                if incremental and unique_value in existing_stamps:
-                    stamp_atual = item.get("stamp_atualizacao")
-                    if stamp_atual == existing_stamps[unique_value]:
-                        stats["ignorados"] += 1
-                        if i % 100 == 0:
-                            logger.info(f"Processados {i}/{len(items)} registros...")
-                        continue
-
-                # Normalizar dados
-                normalized = await self.normalize_data(item)
-
-                # Buscar existente
-                stmt = select(self.MODEL).where(
-                    getattr(self.MODEL, self.UNIQUE_FIELD) == unique_value
+        # 2. Obter dados da API e processar
+        try:
+            if staging:
+                await self._sync_staging(stats)
+            elif streaming:
+                await self._sync_streaming(stats, incremental, existing_stamps, resume, custom_params)
+            else:
+                method = getattr(self.api_client, self.API_ENDPOINT_METHOD)
+
+                async def pagina_recebida(page: int, items: List[Dict]) -> None:
+                    await self._page_received(stats, items)
+
+                items = await method(custom_params=custom_params, on_page=pagina_recebida)
+                stats["total_api"] = len(items)
+                await self._process_items(items, stats, incremental, existing_stamps, commit=True)
+            # A marca d'água só avança após uma execução completa: um registro
+            # perdido (normalização ou lote com erro) ficaria abaixo do próximo filtro >=
+            if stats["erros"] or stats["lotes_com_erro"]:
+                logger.warning(
+                    f"{stats['erros']} registro(s) com erro – marca d'água de {self.API_ENDPOINT} mantida"
                 )
-                result = await self.db.execute(stmt)
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    # Atualizar
-                    for key, value in normalized.items():
-                        if key != self.UNIQUE_FIELD and key not in ["id", "data_criacao"]:
-                            setattr(existing, key, value)
-                    stats["atualizados"] += 1
-                else:
-                    # Inserir
-                    new_obj = self.MODEL(**normalized)
-                    self.db.add(new_obj)
-                    stats["inseridos"] += 1
-
-                if i % 100 == 0:
-                    logger.info(f"Processados {i}/{len(items)} registros...")
-
-            except Exception as e:
-                stats["erros"] += 1
-                logger.error(f"Erro no registro {i} ({self.UNIQUE_FIELD}={item.get(self.UNIQUE_FIELD)}): {e}")
-
-        # 4. Commit
+            else:
+                await self._save_watermark(stats)
+            await self._sweep(stats)
+        except (LyceumAPIError, SQLAlchemyError) as e:
+            # Nunca tratar um resultado parcial como completo
+            await self.db.rollback()
+            stats["erros"] += 1
+            stats["interrompido"] = True
+            stats["erro"] = str(e)
+            logger.error(f"❌ Sincronização de {self.MODEL.__tablename__} interrompida: {e}")
+            if streaming and not staging:
+                await self._set_checkpoint_status("interrompido")
+            return
+
+        if not stats["total_api"]:
+            if custom_params:
+                logger.info(f"Nenhuma alteração em {self.MODEL.__tablename__} desde a última marca d'água")
+            else:
+                logger.warning(f"Nenhum dado obtido para {self.MODEL.__tablename__}")
+            return
+
+        # 3. Commit
         try:
             await self.db.commit()
             logger.info(f"Sincronização de {self.MODEL.__tablename__} concluída com sucesso")
@@ -127,47 +232,310 @@ class BaseSyncService(ABC):
             logger.error(f"Erro no commit: {e}")
             stats["erros"] += 1
 
+    @staticmethod
+    def _finish_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
         stats["concluido_em"] = datetime.now()
         stats["duracao"] = (stats["concluido_em"] - stats["iniciado_em"]).total_seconds()
         return stats
 
-    # Conversores auxiliares (podem ser reutilizados)
-    @staticmethod
-    def _safe_int(v):
-        if v is None:
-            return None
-        try:
-            return int(v)
-        except (ValueError, TypeError):
-            return None
+    async def _sync_streaming(
+        self,
+        stats: Dict[str, Any],
+        incremental: bool,
+        existing_stamps: Dict[Any, Any],
+        resume: bool,
+        custom_params: Optional[Dict] = None,
+    ) -> None:
+        """
+        Consome a API página a página em pipeline (`SyncPipeline`): enquanto uma
+        página é gravada (dados + checkpoint na mesma transação) as seguintes já
+        estão sendo baixadas e normalizadas.
+        """
+        page_start = 0
+        checkpoint = await self.db.get(SyncCheckpoint, self.API_ENDPOINT) if resume else None
+        if checkpoint is not None and (checkpoint.status == "concluido" or checkpoint.ultima_pagina is None):
+            checkpoint = None
+        if checkpoint is not None and (
+            checkpoint.incremental != incremental or (checkpoint.parametros or None) != (custom_params or None)
+        ):
+            # Páginas de outra listagem (modo ou filtros diferentes) não se alinham com esta
+            logger.warning(
+                f"Checkpoint de {self.API_ENDPOINT} é de outra listagem (incremental={checkpoint.incremental}, "
+                f"parâmetros={checkpoint.parametros}) – iniciando da página 0"
+            )
+            checkpoint = None
+        elif checkpoint is None and resume:
+            logger.info(f"Nenhum checkpoint pendente para {self.API_ENDPOINT} – iniciando da página 0")
+        if checkpoint is not None:
+            run_id = checkpoint.run_id
+            page_start = checkpoint.ultima_pagina + 1
+            # Páginas anteriores foram carimbadas com a geração da execução original
+            self._generation = checkpoint.geracao if self._generation is not None else None
+            logger.info(f"⏯️ Retomando {self.API_ENDPOINT} (run {run_id}) a partir da página {page_start}")
+        else:
+            run_id = str(uuid4())
+            await self.db.merge(SyncCheckpoint(
+                endpoint=self.API_ENDPOINT,
+                run_id=run_id,
+                status="em_andamento",
+                incremental=incremental,
+                parametros=custom_params,
+                geracao=self._generation,
+                ultima_pagina=None,
+                registros=0,
+                iniciado_em=datetime.now(),
+            ))
+            await self.db.commit()
+        stats["run_id"] = run_id
+        stats["pagina_inicial"] = page_start
 
-    @staticmethod
-    def _safe_float(v):
-        if v is None:
-            return None
-        try:
-            return float(v)
-        except (ValueError, TypeError):
-            return None
+        async def paginas():
+            endpoint = self.api_client.ENDPOINTS[self.API_ENDPOINT]
+            async for page, items in self.api_client.iter_pages(endpoint, custom_params, page_start=page_start):
+                stats["total_api"] += len(items)
+                stats["paginas"] += 1
+                yield page, items
 
-    @staticmethod
-    def _safe_str(v):
-        if v is None:
-            return None
-        return str(v).strip()
+        async def normalizar(items: List[Dict]) -> List[Dict]:
+            return await self._normalize_items(items, stats, incremental, existing_stamps)
 
-    @staticmethod
-    def _parse_datetime(v):
-        if v is None:
+        async def gravar(page: int, rows: List[Dict], recebidos: int) -> None:
+            await self._write_rows(rows, stats)
+            # Página e checkpoint gravados na mesma transação
+            await self.db.execute(
+                update(SyncCheckpoint)
+                .where(SyncCheckpoint.endpoint == self.API_ENDPOINT)
+                .values(ultima_pagina=page, registros=SyncCheckpoint.registros + recebidos, status="em_andamento")
+            )
+            await self._report_progress(stats)
+            await self.db.commit()
+            # Solta os objetos da sessão: memória limitada às páginas em voo
+            self.db.expunge_all()
+            logger.info(f"Página {page} gravada ({stats['total_api']} registros recebidos nesta execução)")
+
+        # Busca, normalização e gravação em paralelo (filas limitadas)
+        stats["pipeline"] = await SyncPipeline().run(paginas(), normalizar, gravar)
+        await self._set_checkpoint_status("concluido")
+
+    def _supports_staging(self) -> bool:
+        dialect = self.db.get_bind().dialect.name
+        if dialect != "postgresql":
+            logger.warning(f"Carga via staging/COPY requer PostgreSQL (banco: {dialect}) – usando upsert em lote")
+            return False
+        return True
+
+    async def _sync_staging(self, stats: Dict[str, Any]) -> None:
+        """Carga completa: páginas → COPY na staging UNLOGGED → um merge set-based."""
+        loader = StagingCopyLoader(self.db, self.MODEL, self.UNIQUE_FIELD)
+        await loader.prepare()
+        endpoint = self.api_client.ENDPOINTS[self.API_ENDPOINT]
+        async for _, items in self.api_client.iter_pages(endpoint):
+            rows = await self._normalize_items(items, stats, False, {}, dedupe=False)
+            await loader.copy(rows)
+            self._track_watermark(rows)
+            await self._page_received(stats, items)
+        stats["inseridos"], stats["atualizados"], stats["inalterados"] = await loader.merge()
+        stats["staging"] = loader.staging.name
+
+    async def _report_progress(self, stats: Dict[str, Any]) -> None:
+        if self._job is not None:
+            await self._job.progress(stats)
+
+    async def _page_received(self, stats: Dict[str, Any], items: List[Dict]) -> None:
+        """
+        Conta uma página baixada (modos lista e staging) e confirma o progresso:
+        sem isso o job ficaria parado em 0 páginas até o fim do download.
+        """
+        stats["total_api"] += len(items)
+        stats["paginas"] += 1
+        if self._job is not None:
+            await self._job.progress(stats)
+            await self.db.commit()
+
+    async def _sweep(self, stats: Dict[str, Any]) -> None:
+        """Marca como removidos na origem os registros que a carga completa não trouxe."""
+        if self._generation is None:
+            return
+        stats["geracao"] = self._generation
+        if not stats["total_api"]:
+            return
+        if stats["erros"] or stats["lotes_com_erro"]:
+            # Registros com erro não foram carimbados: varrer os marcaria por engano
+            logger.warning(f"Varredura de {self.MODEL.__tablename__} ignorada: carga com erros")
+            return
+        stats["removidos_origem"] = await sweep_generation(self.db, self.MODEL, self._generation)
+        if stats["removidos_origem"]:
+            logger.info(
+                f"🧹 {stats['removidos_origem']} registros de {self.MODEL.__tablename__} "
+                f"marcados como removidos na origem (geração {self._generation})"
+            )
+
+    async def _load_watermark(self) -> Optional[SyncWatermark]:
+        if not (settings.SYNC_WATERMARK_ENABLED and self.WATERMARK_FIELD and self.WATERMARK_PARAM):
             return None
+        return await self.db.get(SyncWatermark, self.API_ENDPOINT)
+
+    async def _save_watermark(self, stats: Dict[str, Any]) -> None:
+        # Sem filtro na API a marca d'água nunca seria lida (`_load_watermark`)
+        if not (self.WATERMARK_FIELD and self.WATERMARK_PARAM and self._max_watermark is not None):
+            return
+        anterior = stats.get("watermark_anterior")
+        novo = max(self._max_watermark, anterior) if anterior else self._max_watermark
+        await self.db.merge(SyncWatermark(
+            entidade=self.API_ENDPOINT,
+            campo=self.WATERMARK_FIELD,
+            valor=novo,
+            atualizado_em=datetime.now(),
+        ))
+        stats["watermark"] = novo
+
+    async def _set_checkpoint_status(self, status: str) -> None:
         try:
-            if isinstance(v, (int, float)):
-                if v > 1_000_000_000_000:
-                    v = v / 1000
-                return datetime.fromtimestamp(v)
-            elif isinstance(v, str):
-                v = v.replace("Z", "+00:00")
-                return datetime.fromisoformat(v.split("+")[0])
-        except Exception:
-            return None
-        return None
\ No newline at end of file
+            await self.db.execute(
+                update(SyncCheckpoint)
+                .where(SyncCheckpoint.endpoint == self.API_ENDPOINT)
+                .values(status=status)
+            )
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Erro ao atualizar checkpoint de {self.API_ENDPOINT}: {e}")
+
+    async def _process_items(
+        self,
+        items: List[Dict],
+        stats: Dict[str, Any],
+        incremental: bool,
+        existing_stamps: Dict[Any, Any],
+        commit: bool = False,
+    ) -> None:
+        """
+        Normaliza e grava os registros em lotes de SYNC_COMMIT_EVERY (`_write_rows`).
+        Com `commit` cada lote é confirmado e a sessão é esvaziada (memória
+        limitada a um lote); sem ele o commit fica com o chamador.
+        """
+        tamanho = settings.SYNC_COMMIT_EVERY or len(items) or 1
+        for inicio in range(0, len(items), tamanho):
+            lote = items[inicio:inicio + tamanho]
+            rows = await self._normalize_items(lote, stats, incremental, existing_stamps)
+            if await self._write_rows(rows, stats) and commit:
+                await self._report_progress(stats)
+                await self.db.commit()
+                self.db.expunge_all()
+
+    async def _write_rows(self, rows: List[Dict], stats: Dict[str, Any]) -> bool:
+        """
+        Grava linhas normalizadas com upsert em lote (`bulk_upsert`), em blocos de
+        SYNC_COMMIT_EVERY, cada um dentro de um savepoint: um bloco com erro de
+        banco é desfeito sozinho e contado em `erros`/`lotes_com_erro`, sem
+        derrubar os demais. Retorna False se algum bloco foi descartado.
+        """
+        tamanho = settings.SYNC_COMMIT_EVERY or len(rows) or 1
+        ok = True
+        for inicio in range(0, len(rows), tamanho):
+            bloco = rows[inicio:inicio + tamanho]
+            try:
+                async with self.db.begin_nested():
+                    inseridos, atualizados, inalterados = await bulk_upsert(
+                        self.db, self.MODEL, bloco, self.UNIQUE_FIELD
+                    )
+            except SQLAlchemyError as e:
+                ok = False
+                stats["erros"] += len(bloco)
+                stats["lotes_com_erro"] += 1
+                logger.error(f"❌ Lote de {self.MODEL.__tablename__} descartado ({len(bloco)} registros): {e}")
+                continue
+            stats["inseridos"] += inseridos
+            stats["atualizados"] += atualizados
+            stats["inalterados"] += inalterados
+            self._track_watermark(bloco)
+            logger.info(
+                f"Lote gravado: {inseridos} inseridos, {atualizados} atualizados, {inalterados} inalterados"
+            )
+        return ok
+
+    def _track_watermark(self, rows: List[Dict]) -> None:
+        """Acompanha a marca d'água só com linhas efetivamente gravadas."""
+        if not self.WATERMARK_FIELD:
+            return
+        coluna = {v: k for k, v in self.FIELD_MAP.items()}.get(self.WATERMARK_FIELD, self.WATERMARK_FIELD)
+        stamps = [str(v) for v in (row.get(coluna) for row in rows) if v]
+        if stamps:
+            maior = max(stamps)
+            if self._max_watermark is None or maior > self._max_watermark:
+                self._max_watermark = maior
+
+    async def _normalize_items(
+        self,
+        items: List[Dict],
+        stats: Dict[str, Any],
+        incremental: bool,
+        existing_stamps: Dict[Any, Any],
+        dedupe: bool = True,
+    ) -> List[Dict]:
+        """
+        Normaliza um lote, descartando registros sem chave ou com stamp inalterado
+        (incremental). Modelos com `hash_conteudo` recebem o hash do registro
+        normalizado. Erros de normalização contam por registro. Com `dedupe`
+        chaves repetidas mantêm a última ocorrência.
+        """
+        com_hash = HASH_COLUMN in self.MODEL.__table__.c
+
+        campos_chave = key_fields(self.UNIQUE_FIELD)
+
+        def chave(item: Dict) -> Any:
+            if len(campos_chave) == 1:
+                return item.get(campos_chave[0])
+            valores = tuple(item.get(c) for c in campos_chave)
+            # Chave composta incompleta vale como ausente
+            return None if any(v is None or v == "" for v in valores) else valores
+
+        candidatos = []
+        for item in items:
+            unique_value = chave(item)
+            if not unique_value:
+                stats["ignorados"] += 1
+                continue
+
+            # Incremental: verificar se stamp mudou
+            if incremental and unique_value in existing_stamps:
+                if item.get("stamp_atualizacao") == existing_stamps[unique_value]:
+                    stats["ignorados"] += 1
+                    continue
+            candidatos.append(item)
+
+        def registrar_erro(item: Dict, e: Exception) -> None:
+            stats["erros"] += 1
+            logger.error(f"Erro no registro ({self.UNIQUE_FIELD}={chave(item)}): {e}")
+
+        if getattr(self.normalize_data, "__func__", None) is BaseSyncService.normalize_data:
+            # Caminho quente: normalizador compilado, lote inteiro de uma vez
+            rows = await normalize_many_async(self.get_normalizer(), candidatos, on_error=registrar_erro)
+        else:
+            rows = []
+            for item in candidatos:
+                try:
+                    rows.append(await self.normalize_data(item))
+                except Exception as e:
+                    registrar_erro(item, e)
+            if com_hash:
+                for row in rows:
+                    row[HASH_COLUMN] = content_hash(row)
+
+        if self._generation is not None:
+            campos = generation_fields(self.MODEL, self._generation)
+            for row in rows:
+                row.update(campos)
+
+        if dedupe:
+            rows, repetidos = dedupe_rows(rows, self.UNIQUE_FIELD)
+            if repetidos:
+                stats["ignorados"] += repetidos
+                logger.warning(f"{repetidos} registros repetidos no lote de {self.MODEL.__tablename__} (mantida a última ocorrência)")
+        return rows
+
+    # Conversores auxiliares (podem ser reutilizados)
+    _safe_int = staticmethod(to_int)
+    _safe_float = staticmethod(to_float)
+    _safe_str = staticmethod(to_str)
+    _parse_datetime = staticmethod(to_datetime)
@@ -0,0 +1,246 @@
+# app/services/bulk_upsert.py
+import hashlib
+import json
+import logging
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Table, false, func, insert, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Chave única: uma coluna ("aluno") ou composta (("turma", "disciplina", "ano", "semestre"))
+Key = Union[str, Sequence[str]]
+
+# Limite de parâmetros por statement (asyncpg/PostgreSQL: 32767; SQLite >= 3.32: 32766)
+MAX_BIND_PARAMS = {"postgresql": 32767, "sqlite": 32766}
+DEFAULT_MAX_BIND_PARAMS = 999
+
+# Colunas nunca sobrescritas quando o registro já existe
+PRESERVED_ON_UPDATE = ("id", "data_criacao")
+
+# Hash do conteúdo normalizado: linhas com o mesmo hash não são regravadas
+HASH_COLUMN = "hash_conteudo"
+# Mark-and-sweep: geração da carga completa que trouxe o registro por último
+GENERATION_COLUMN = "geracao_sync"
+REMOVED_COLUMN = "removido_origem"
+REMOVED_AT_COLUMN = "data_remocao_origem"
+# Campos de controle preenchidos pelo sync (não fazem parte do conteúdo)
+CONTROL_FIELDS = frozenset({
+    "data_sincronizacao", "data_criacao", "data_atualizacao", "sincronizado", HASH_COLUMN,
+    GENERATION_COLUMN, REMOVED_COLUMN, REMOVED_AT_COLUMN,
+})
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """SHA-256 estável do registro normalizado, ignorando CONTROL_FIELDS."""
+    conteudo = [(k, row[k]) for k in sorted(row) if k not in CONTROL_FIELDS]
+    return hashlib.sha256(json.dumps(conteudo, default=str, separators=(",", ":")).encode()).hexdigest()
+
+
+def key_fields(key: Key) -> Tuple[str, ...]:
+    return (key,) if isinstance(key, str) else tuple(key)
+
+
+def key_getter(key: Key) -> Callable[[Dict[str, Any]], Any]:
+    """Valor da chave de uma linha: o próprio valor, ou uma tupla se a chave é composta."""
+    return itemgetter(*key_fields(key))
+
+
+def key_in(table: Table, key: Key, values: Sequence[Any]):
+    """`chave IN (...)`; chaves compostas usam tupla de colunas (`(a, b) IN ((..), ..)`)."""
+    campos = key_fields(key)
+    if len(campos) == 1:
+        return table.c[campos[0]].in_(values)
+    return tuple_(*(table.c[c] for c in campos)).in_(values)
+
+
+def chunk_size_for(dialect: str, columns: int, desired: int) -> int:
+    """Maior lote que cabe no limite de parâmetros do banco (e não passa de `desired`)."""
+    limite = MAX_BIND_PARAMS.get(dialect, DEFAULT_MAX_BIND_PARAMS)
+    return max(1, min(desired, limite // max(1, columns)))
+
+
+def dedupe_rows(rows: Iterable[Dict[str, Any]], key: Key) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Remove chaves repetidas mantendo a última ocorrência (a mais recente na
+    paginação). Um mesmo INSERT .. ON CONFLICT não pode tocar a mesma linha
+    duas vezes no PostgreSQL. Retorna (linhas, quantidade descartada).
+    """
+    unicas: Dict[Any, Dict[str, Any]] = {}
+    chave = key_getter(key)
+    total = 0
+    for row in rows:
+        total += 1
+        unicas[chave(row)] = row
+    return list(unicas.values()), total - len(unicas)
+
+
+def generation_fields(model: Type[Base], generation: int) -> Dict[str, Any]:
+    """
+    Campos que marcam um registro como visto na carga `generation` (e, se
+    estava marcado como removido na origem, o reativam). Vazio se o modelo
+    não tem GENERATION_COLUMN.
+    """
+    columns = model.__table__.c
+    if GENERATION_COLUMN not in columns:
+        return {}
+    campos: Dict[str, Any] = {GENERATION_COLUMN: generation}
+    if REMOVED_COLUMN in columns:
+        campos[REMOVED_COLUMN] = False
+    if REMOVED_AT_COLUMN in columns:
+        campos[REMOVED_AT_COLUMN] = None
+    return campos
+
+
+async def next_generation(db: AsyncSession, model: Type[Base]) -> int:
+    """Próxima geração de carga completa: maior GENERATION_COLUMN gravada + 1."""
+    coluna = model.__table__.c[GENERATION_COLUMN]
+    return (await db.execute(select(func.coalesce(func.max(coluna), 0) + 1))).scalar_one()
+
+
+async def sweep_generation(db: AsyncSession, model: Type[Base], generation: int) -> int:
+    """
+    Varredura set-based após uma carga completa bem-sucedida: um único UPDATE
+    marca REMOVED_COLUMN nos registros que não foram vistos na geração
+    `generation` (geração anterior ou nula). Retorna quantos foram marcados.
+    Não faz commit.
+    """
+    table = model.__table__
+    geracao = table.c[GENERATION_COLUMN]
+    valores: Dict[str, Any] = {REMOVED_COLUMN: True}
+    if REMOVED_AT_COLUMN in table.c:
+        valores[REMOVED_AT_COLUMN] = func.now()
+    result = await db.execute(
+        update(table)
+        .where(or_(geracao < generation, geracao.is_(None)), table.c[REMOVED_COLUMN].is_(false()))
+        .values(valores)
+    )
+    return result.rowcount or 0
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Type[Base],
+    rows: Sequence[Dict[str, Any]],
+    key: Key,
+    chunk_size: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """
+    Insere ou atualiza `rows` (já normalizadas, sem chaves repetidas) em lotes,
+    com um statement por lote em vez de um SELECT por registro.
+
+    - PostgreSQL: INSERT .. ON CONFLICT (key) DO UPDATE .. RETURNING (xmax = 0),
+      que distingue inserções de atualizações sem consulta extra.
+    - SQLite: o mesmo ON CONFLICT, com as chaves existentes do lote consultadas
+      em um único SELECT .. IN para a contagem.
+    - Demais bancos: SELECT .. IN + INSERT/UPDATE em lote do ORM (`key` precisa ser a
+      chave primária).
+
+    `key` pode ser composta (tupla de colunas com índice único/PK).
+
+    Se as linhas trazem HASH_COLUMN, registros existentes com o mesmo hash não
+    recebem UPDATE (guarda `WHERE hash IS DISTINCT FROM excluded.hash`): sem
+    WAL e sem mexer em `data_atualizacao`.
+
+    Se as linhas trazem GENERATION_COLUMN (carga completa), os registros
+    barrados pela guarda recebem só a nova geração, em um UPDATE por lote
+    restrito às chaves com geração diferente – assim a varredura
+    (`sweep_generation`) enxerga todos os registros vistos.
+
+    Retorna (inseridos, atualizados, inalterados). Não faz commit.
+    """
+    if not rows:
+        return 0, 0, 0
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    columns = list(rows[0].keys())
+    campos_chave = key_fields(key)
+    chave = key_getter(key)
+    update_columns = [c for c in columns if c not in campos_chave and c not in PRESERVED_ON_UPDATE]
+    # onupdate=func.now() só vale para UPDATE via ORM/Core, não para ON CONFLICT
+    touch = {"data_atualizacao": func.now()} if "data_atualizacao" in table.c and "data_atualizacao" not in columns else {}
+    size = chunk_size_for(dialect, len(columns), chunk_size or settings.SYNC_UPSERT_CHUNK_SIZE)
+    key_columns = [table.c[c] for c in campos_chave]
+    hash_column = table.c[HASH_COLUMN] if HASH_COLUMN in table.c and HASH_COLUMN in columns else None
+    marca_geracao = None
+    if hash_column is not None and GENERATION_COLUMN in table.c and GENERATION_COLUMN in columns:
+        geracao = rows[0][GENERATION_COLUMN]
+        valores = {c: rows[0][c] for c in (GENERATION_COLUMN, REMOVED_COLUMN, REMOVED_AT_COLUMN) if c in columns}
+        if "data_atualizacao" in table.c:
+            # Conteúdo igual: não dispara o onupdate de data_atualizacao
+            valores["data_atualizacao"] = table.c["data_atualizacao"]
+        marca_geracao = update(table).where(table.c[GENERATION_COLUMN].is_distinct_from(geracao)).values(valores)
+
+    # Um único statement com parâmetros executemany: compilado uma vez (cache do
+    # SQLAlchemy) e enviado em VALUES de várias linhas via "insertmanyvalues"
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={**{c: stmt.excluded[c] for c in update_columns}, **touch},
+            where=hash_column.is_distinct_from(stmt.excluded[HASH_COLUMN]) if hash_column is not None else None,
+        )
+        if dialect == "postgresql":
+            stmt = stmt.returning(literal_column("(xmax = 0)"))
+
+    inseridos = atualizados = inalterados = 0
+    for inicio in range(0, len(rows), size):
+        chunk = rows[inicio:inicio + size]
+
+        if dialect == "postgresql":
+            # Linhas barradas pela guarda de hash não voltam no RETURNING
+            flags = (await db.execute(stmt, chunk)).scalars().all()
+            novos = sum(1 for inserido in flags if inserido)
+            inseridos += novos
+            atualizados += len(flags) - novos
+            inalterados += len(chunk) - len(flags)
+            if marca_geracao is not None and len(flags) < len(chunk):
+                await db.execute(marca_geracao.where(key_in(table, key, [chave(row) for row in chunk])))
+            continue
+
+        n = len(campos_chave)
+        existentes = {
+            (r[0] if n == 1 else tuple(r[:n])): r[n]
+            for r in (await db.execute(
+                select(*key_columns, hash_column if hash_column is not None else literal_column("NULL"))
+                .where(key_in(table, key, [chave(row) for row in chunk]))
+            )).all()
+        }
+        # Linhas idênticas às gravadas nem são enviadas
+        if hash_column is not None:
+            pendentes = [row for row in chunk if existentes.get(chave(row), None) != row[HASH_COLUMN]]
+        else:
+            pendentes = chunk
+        iguais = len(chunk) - len(pendentes)
+        inseridos += len(chunk) - len(existentes)
+        atualizados += len(existentes) - iguais
+        inalterados += iguais
+        if marca_geracao is not None and iguais:
+            vistos = {chave(row) for row in pendentes}
+            await db.execute(marca_geracao.where(key_in(table, key, [chave(row) for row in chunk if chave(row) not in vistos])))
+        if not pendentes:
+            continue
+
+        if dialect == "sqlite":
+            await db.execute(stmt, pendentes)
+        else:
+            # Bulk ORM: INSERT em lote + UPDATE em lote por chave primária (executemany)
+            novos = [row for row in pendentes if chave(row) not in existentes]
+            if novos:
+                await db.execute(insert(model), novos)
+            alterados = [
+                {**{c: row[c] for c in campos_chave}, **{c: row[c] for c in update_columns}}
+                for row in pendentes if chave(row) in existentes
+            ]
+            if alterados:
+                await db.execute(update(model), alterados)
+
+    logger.debug(f"Upsert em lote de {len(rows)} registros em {table.name} ({inseridos} novos, {atualizados} atualizados, {inalterados} inalterados)")
+    return inseridos, atualizados, inalterados
@@ -0,0 +1,149 @@
+# app/services/fetch_orchestrator.py
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.services.lyceum_api import LyceumAPIClientReadOnly, LyceumAPIError
+
+logger = logging.getLogger(__name__)
+
+# Prioridade por endpoint (menor = antes). As tabelas mais longas saem na frente
+# para não ficarem sozinhas no fim da janela de manutenção.
+DEFAULT_PRIORITIES = {
+    "alunos": 0,
+    "matriculas": 0,
+    "turma_docente": 1,
+    "turmas": 1,
+    "grades": 2,
+    "disciplinas": 2,
+    "curriculos": 3,
+    "docentes": 3,
+    "cursos": 4,
+    "coordenacao": 4,
+}
+
+PageCallback = Callable[[str, int, List[Dict]], Awaitable[None]]
+
+
+class PrioritySemaphore:
+    """Semáforo cujas vagas liberadas vão para o pedido de menor prioridade numérica."""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: List = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int = 0) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # Recebeu a vaga mas foi cancelado antes de usá-la: devolve
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._value += 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class LyceumFetchOrchestrator:
+    """
+    Busca vários endpoints Lyceum em paralelo sob um único orçamento global:
+    no máximo `max_concurrency` páginas em voo no total (além do limitador de
+    taxa compartilhado), com vagas distribuídas por prioridade de endpoint.
+    """
+
+    def __init__(
+        self,
+        client: Optional[LyceumAPIClientReadOnly] = None,
+        max_concurrency: Optional[int] = None,
+        priorities: Optional[Dict[str, int]] = None,
+    ):
+        self.client = client or LyceumAPIClientReadOnly()
+        self.max_concurrency = max_concurrency or settings.LYCEUM_FETCH_MAX_CONCURRENCY
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self._semaphore = PrioritySemaphore(self.max_concurrency)
+
+    async def fetch(
+        self,
+        endpoints: Optional[Iterable[str]] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca os endpoints (chaves de ENDPOINTS; todos se omitido).
+        Sem `on_page` os registros são acumulados em `resultado[endpoint]["registros"]`;
+        com `on_page(endpoint, pagina, registros)` cada página é entregue ao callback
+        e nada é acumulado. Falha em um endpoint não interrompe os demais.
+        Retorna estatísticas de tempo por endpoint (+ `_total`).
+        """
+        nomes = list(endpoints or self.client.ENDPOINTS)
+        nomes.sort(key=lambda nome: self.priorities.get(nome, 99))
+        inicio = time.perf_counter()
+        logger.info(f"🚚 Buscando {len(nomes)} endpoints (concorrência global={self.max_concurrency})")
+
+        resultados = await asyncio.gather(*(self._fetch_endpoint(nome, on_page) for nome in nomes))
+        relatorio = dict(zip(nomes, resultados))
+        relatorio["_total"] = {
+            "endpoints": len(nomes),
+            "registros": sum(r["total"] for r in resultados),
+            "paginas": sum(r["paginas"] for r in resultados),
+            "erros": sum(1 for r in resultados if r["erro"]),
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
+        logger.info(f"🏁 Busca concluída: {relatorio['_total']}")
+        return relatorio
+
+    async def _fetch_endpoint(self, nome: str, on_page: Optional[PageCallback]) -> Dict[str, Any]:
+        priority = self.priorities.get(nome, 99)
+        stats: Dict[str, Any] = {
+            "prioridade": priority,
+            "paginas": 0,
+            "total": 0,
+            "erro": None,
+            "iniciado_em": datetime.now(),
+        }
+        if on_page is None:
+            stats["registros"] = []
+        inicio = time.perf_counter()
+        try:
+            async for page, items in self.client.iter_pages(
+                self.client.ENDPOINTS[nome],
+                permit=lambda: self._semaphore.slot(priority),
+            ):
+                stats["paginas"] += 1
+                stats["total"] += len(items)
+                if on_page is None:
+                    stats["registros"].extend(items)
+                else:
+                    await on_page(nome, page, items)
+        except LyceumAPIError as e:
+            stats["erro"] = str(e)
+            logger.error(f"❌ Endpoint {nome} falhou: {e}")
+        stats["segundos"] = round(time.perf_counter() - inicio, 3)
+        stats["concluido_em"] = datetime.now()
+        stats["registros_por_segundo"] = round(stats["total"] / stats["segundos"], 1) if stats["segundos"] else None
+        return stats
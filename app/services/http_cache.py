@@ -0,0 +1,132 @@
+# app/services/http_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+
+class DiskResponseCache:
+    """
+    Cache em disco das páginas da API Lyceum (corpo + validadores HTTP).
+
+    - Dentro do TTL a página é servida sem tocar a rede.
+    - Depois do TTL a página é revalidada com If-None-Match/If-Modified-Since
+      (quando a Lyceum enviou ETag/Last-Modified); um 304 renova a entrada.
+    - O tamanho total é limitado por `max_bytes` com despejo LRU.
+
+    Cada entrada é um arquivo `<sha256>.page`: uma linha JSON com os metadados
+    seguida do corpo bruto da resposta. Os métodos são bloqueantes (I/O de disco);
+    o cliente os chama via `asyncio.to_thread`.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # chave -> tamanho em bytes, da menos para a mais recentemente usada
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        entries = sorted(self.directory.glob("*.page"), key=lambda p: p.stat().st_mtime)
+        for path in entries:
+            self._index[path.stem] = path.stat().st_size
+        self._size = sum(self._index.values())
+
+    @staticmethod
+    def key_for(endpoint: str, params: Optional[Dict] = None) -> str:
+        raw = json.dumps([endpoint, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.page"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(key), "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return CachedResponse(body, meta.get("etag"), meta.get("last_modified"), meta["stored_at"])
+
+    def put(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        meta = json.dumps({"etag": etag, "last_modified": last_modified, "stored_at": time.time()}).encode()
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        with open(tmp, "wb") as f:
+            f.write(meta + b"\n")
+            f.write(body)
+        os.replace(tmp, path)
+        size = len(meta) + 1 + len(body)
+        with self._lock:
+            self._size += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict()
+
+    def refresh(self, key: str) -> None:
+        """Renova o `stored_at` de uma entrada após um 304 Not Modified."""
+        cached = self.get(key)
+        if cached is not None:
+            self.put(key, cached.body, cached.etag, cached.last_modified)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "entradas": len(self._index),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "revalidados": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+_cache: Optional[DiskResponseCache] = None
+
+
+def get_response_cache() -> Optional[DiskResponseCache]:
+    """Cache compartilhado pelo processo, ou None se LYCEUM_HTTP_CACHE_ENABLED=False."""
+    global _cache
+    if not settings.LYCEUM_HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = DiskResponseCache(
+            settings.LYCEUM_HTTP_CACHE_DIR,
+            ttl=settings.LYCEUM_HTTP_CACHE_TTL,
+            max_bytes=settings.LYCEUM_HTTP_CACHE_MAX_MB * 1024 * 1024,
+        )
+        logger.info(f"💾 Cache HTTP Lyceum em {settings.LYCEUM_HTTP_CACHE_DIR} ({len(_cache._index)} páginas)")
+    return _cache
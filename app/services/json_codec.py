@@ -0,0 +1,34 @@
+# app/services/json_codec.py
+"""
+Decodificação JSON das respostas Lyceum: orjson quando instalado, senão json.
+
+Cada página é decodificada inteira a partir do corpo já lido: a página é a
+unidade de nova tentativa, de cache e de checkpoint, e o tamanho dela
+(LYCEUM_API_PAGE_SIZE) é o que limita a memória – não há parser incremental.
+"""
+import json
+import logging
+from typing import Any, Callable, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional (pip install .[fast])
+    orjson = None
+
+
+def _resolve_decoder() -> Callable[[Union[bytes, str]], Any]:
+    escolha = settings.LYCEUM_API_JSON_DECODER
+    if escolha in ("auto", "orjson") and orjson is not None:
+        return orjson.loads
+    if escolha == "orjson":
+        logger.warning("⚠️ LYCEUM_API_JSON_DECODER=orjson, mas o pacote não está instalado – usando json")
+    return json.loads
+
+
+# Decodificador usado para corpos completos (respostas e cache)
+loads = _resolve_decoder()
+DECODER_NAME = "orjson" if loads is not json.loads else "json"
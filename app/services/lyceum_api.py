@@ -1,13 +1,65 @@
 # app/services/lyceum_api.py
 import httpx
 import asyncio
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from typing import List, Dict, Optional, Any, AsyncIterator, AsyncContextManager, Awaitable, Callable, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
+import random
+import time
 from app.core.config import settings
+from app.services import json_codec
+from app.services.http_cache import get_response_cache
+from app.services.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Respostas que justificam nova tentativa (sobrecarga/instabilidade temporária)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# on_page(numero_pagina, registros) de fetch_all_pages/get_all_*
+PageCallback = Callable[[int, List[Dict]], Awaitable[None]]
+
+
+class LyceumAPIError(Exception):
+    """Falha ao obter dados da API Lyceum."""
+
+
+class LyceumPaginationError(LyceumAPIError):
+    """Uma página não pôde ser obtida; a paginação foi interrompida."""
+
+    def __init__(self, endpoint: str, page: int, motivo: str):
+        super().__init__(f"{endpoint} – página {page}: {motivo}")
+        self.endpoint = endpoint
+        self.page = page
+
+
+def _has_records(data: Any) -> bool:
+    if isinstance(data, dict):
+        return bool(data.get("data"))
+    return bool(data)
+
+
+def _parse_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Segundos de espera de um Retry-After: inteiro ou data HTTP (RFC 9110); None se ausente/inválido."""
+    valor = (valor or "").strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        quando = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if quando.tzinfo is None:
+        quando = quando.replace(tzinfo=timezone.utc)
+    return max(0.0, (quando - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryableError(Exception):
+    def __init__(self, motivo: str, retry_after: Optional[float] = None):
+        super().__init__(motivo)
+        self.retry_after = retry_after
+
+
 class LyceumAPIClient:
     """Cliente assíncrono para API Lyceum – APENAS GET com paginação automática."""
 
@@ -24,6 +76,15 @@ class LyceumAPIClient:
         "turma_docente": "/v2/tabela/turma-docente",
     }
 
+    # Páginas simultâneas por endpoint (chave de ENDPOINTS); ausentes usam
+    # settings.LYCEUM_API_PREFETCH_WINDOW
+    PREFETCH_WINDOWS = {
+        "alunos": 4,
+        "matriculas": 4,
+    }
+
+    _http_client: Optional[httpx.AsyncClient] = None
+
     def __init__(self):
         self.base_url = settings.LYCEUM_API_BASE_URL.rstrip("/")
         self.auth = httpx.BasicAuth(
@@ -32,73 +93,331 @@ class LyceumAPIClient:
         )
         self.timeout = settings.LYCEUM_API_TIMEOUT
         self.page_size = settings.LYCEUM_API_PAGE_SIZE
-        self.delay = settings.LYCEUM_API_DELAY
+        # Substitui a pausa fixa entre páginas: taxa adaptativa compartilhada pelo processo
+        self.rate_limiter = get_rate_limiter()
+        # Cache em disco opcional (LYCEUM_HTTP_CACHE_ENABLED)
+        self.cache = get_response_cache()
 
-    async def _make_get_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+    # ------------------------------------------------------------
+    # Pool de conexões compartilhado (um por processo)
+    # ------------------------------------------------------------
+    @staticmethod
+    def _build_http_client() -> httpx.AsyncClient:
+        http2 = settings.LYCEUM_API_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ LYCEUM_API_HTTP2 ativo, mas o pacote 'h2' não está instalado – usando HTTP/1.1")
+                http2 = False
+        logger.info(
+            f"🔌 Abrindo pool HTTP Lyceum (max_connections={settings.LYCEUM_API_MAX_CONNECTIONS}, http2={http2})"
+        )
+        return httpx.AsyncClient(
+            timeout=settings.LYCEUM_API_TIMEOUT,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.LYCEUM_API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LYCEUM_API_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LYCEUM_API_KEEPALIVE_EXPIRY,
+            ),
+            headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+        )
+
+    @classmethod
+    async def open_pool(cls) -> httpx.AsyncClient:
+        """Abre (se necessário) o pool HTTP compartilhado por todas as instâncias."""
+        # Sempre no LyceumAPIClient, para que subclasses compartilhem o mesmo pool
+        pool = LyceumAPIClient._http_client
+        if pool is None or pool.is_closed:
+            pool = LyceumAPIClient._http_client = cls._build_http_client()
+        return pool
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """Fecha o pool HTTP compartilhado (chamado no shutdown da aplicação)."""
+        pool = LyceumAPIClient._http_client
+        LyceumAPIClient._http_client = None
+        if pool is not None and not pool.is_closed:
+            await pool.aclose()
+            logger.info("🔌 Pool HTTP Lyceum fechado")
+
+    async def _make_get_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_retries: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """
+        GET com novas tentativas (backoff exponencial com jitter) para timeouts,
+        erros de rede, 429 e 5xx. Retorna None se todas as tentativas falharem
+        ou se a resposta não for recuperável (ex: 401, 404).
+        """
+        if max_retries is None:
+            max_retries = settings.LYCEUM_API_MAX_RETRIES
+        for tentativa in range(max_retries + 1):
             try:
-                logger.debug(f"GET → {url} | params={params}")
-                resp = await client.get(url, params=params, auth=self.auth, headers={"Accept": "application/json"})
+                return await self._get_once(endpoint, params)
+            except _RetryableError as e:
+                if tentativa == max_retries:
+                    logger.error(f"❌ {endpoint} params={params}: {max_retries + 1} tentativas falharam ({e})")
+                    return None
+                espera = max(self._backoff(tentativa), e.retry_after or 0)
+                logger.warning(
+                    f"🔁 {endpoint} params={params}: tentativa {tentativa + 1} falhou ({e}) – "
+                    f"nova tentativa em {espera:.1f}s"
+                )
+                await asyncio.sleep(espera)
+        return None
+
+    @staticmethod
+    def _backoff(tentativa: int) -> float:
+        """Backoff exponencial com jitter completo."""
+        teto = min(settings.LYCEUM_API_BACKOFF_MAX, settings.LYCEUM_API_BACKOFF_BASE * 2 ** tentativa)
+        return random.uniform(0, teto)
+
+    async def _get_once(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        url = f"{self.base_url}{endpoint}"
+        headers = {}
+        cache_key = cached = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(endpoint, params)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None and cached.is_fresh(self.cache.ttl):
+                self.cache.hits += 1
+                return json_codec.loads(cached.body)
+            if cached is not None:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        client = await self.open_pool()
+        await self.rate_limiter.acquire()
+        status_code = None
+        inicio = time.monotonic()
+        try:
+            logger.debug(f"GET → {url} | params={params}")
+            async with client.stream("GET", url, params=params, auth=self.auth, headers=headers) as resp:
+                status_code = resp.status_code
+                if resp.status_code == 304 and cached is not None:
+                    self.cache.revalidated += 1
+                    await asyncio.to_thread(self.cache.refresh, cache_key)
+                    return json_codec.loads(cached.body)
+                if self.cache is not None:
+                    # Só respostas que não vieram do cache (304 conta como revalidado)
+                    self.cache.misses += 1
+                if resp.status_code in RETRYABLE_STATUS:
+                    raise _RetryableError(
+                        f"HTTP {resp.status_code}", _parse_retry_after(resp.headers.get("Retry-After"))
+                    )
                 if resp.status_code != 200:
                     logger.error(f"HTTP {resp.status_code} – {url}")
                     return None
-                return resp.json()
-            except httpx.TimeoutException:
-                logger.error(f"Timeout – {url}")
-                return None
-            except Exception as e:
-                logger.error(f"Erro na requisição GET – {url}: {e}")
-                return None
+                try:
+                    data, body = await self._read_json(resp)
+                except ValueError as e:
+                    raise _RetryableError(f"JSON inválido: {e}")
+            # Páginas vazias não são guardadas: o fim da paginação é sempre conferido na rede
+            if self.cache is not None and _has_records(data):
+                await asyncio.to_thread(
+                    self.cache.put, cache_key, body,
+                    resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+                )
+            return data
+        except _RetryableError:
+            raise
+        except httpx.TimeoutException:
+            raise _RetryableError("timeout")
+        except httpx.TransportError as e:
+            raise _RetryableError(f"erro de rede: {e}")
+        except Exception as e:
+            logger.error(f"Erro na requisição GET – {url}: {e}")
+            return None
+        finally:
+            await self.rate_limiter.record(status_code, time.monotonic() - inicio)
 
-    async def fetch_all_pages(
+    async def _read_json(self, resp: httpx.Response) -> Tuple[Any, bytes]:
+        """
+        Lê e decodifica o corpo inteiro (orjson, se instalado).
+        Retorna (dados, corpo bruto, guardado no cache).
+        """
+        body = await resp.aread()
+        return json_codec.loads(body), body
+
+    def _prefetch_window(self, endpoint: str) -> int:
+        """Janela de páginas simultâneas configurada para o endpoint (caminho)."""
+        for nome, caminho in self.ENDPOINTS.items():
+            if caminho == endpoint:
+                return self.PREFETCH_WINDOWS.get(nome, settings.LYCEUM_API_PREFETCH_WINDOW)
+        return settings.LYCEUM_API_PREFETCH_WINDOW
+
+    def _page_params(self, page: int, custom_params: Optional[Dict] = None) -> Dict:
+        params = {"page": page, "size": self.page_size}
+        if custom_params:
+            params.update(custom_params)
+        return params
+
+    async def iter_pages(
         self,
         endpoint: str,
         custom_params: Optional[Dict] = None,
         page_start: int = 0,
-    ) -> List[Dict]:
-        all_data = []
+        window: Optional[int] = None,
+        permit: Optional[Callable[[], AsyncContextManager]] = None,
+        page_end: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """
+        Gera `(numero_pagina, registros)` página a página, sem acumular o endpoint inteiro.
+        Com `window` > 1 mantém até N páginas em voo simultaneamente; as páginas são
+        entregues na ordem e a paginação para na primeira página vazia.
+        `permit`, se informado, é uma fábrica de context managers assíncronos que
+        envolve cada requisição (ex: vaga em um orçamento global de concorrência).
+        `page_end` (exclusivo) limita a faixa de páginas, sem buscar além dela.
+        Levanta LyceumPaginationError se uma página falhar mesmo após as novas
+        tentativas – o resultado nunca é truncado silenciosamente.
+        """
+        window = max(1, window or self._prefetch_window(endpoint))
+        pendentes: Dict[int, asyncio.Task] = {}
+        proxima = page_start
         page = page_start
-        while True:
-            params = {"page": page, "size": self.page_size}
-            if custom_params:
-                params.update(custom_params)
+        total = 0
+        try:
+            while page_end is None or page < page_end:
+                # Completa a janela de páginas em voo
+                while len(pendentes) < window and (page_end is None or proxima < page_end):
+                    pendentes[proxima] = asyncio.create_task(
+                        self._fetch_page(endpoint, self._page_params(proxima, custom_params), permit)
+                    )
+                    proxima += 1
+
+                data = await pendentes.pop(page)
+                if data is None:
+                    raise LyceumPaginationError(endpoint, page, "página não obtida após as novas tentativas")
+
+                items = []
+                if isinstance(data, dict) and "data" in data:
+                    items = data["data"]
+                elif isinstance(data, list):
+                    items = data
+                else:
+                    raise LyceumPaginationError(endpoint, page, f"formato de resposta inesperado: {type(data)}")
+
+                if not items:
+                    logger.info(f"✅ Página {page} vazia – fim da paginação")
+                    return
 
-            data = await self._make_get_request(endpoint, params)
+                total += len(items)
+                logger.info(f"📄 Página {page}: {len(items)} registros (total: {total})")
+                yield page, items
+                page += 1
+        finally:
+            # Páginas além do fim (ou após erro/abandono) não são mais necessárias
+            for task in pendentes.values():
+                task.cancel()
+            await asyncio.gather(*pendentes.values(), return_exceptions=True)
+
+    async def count_pages(self, endpoint: str, custom_params: Optional[Dict] = None) -> int:
+        """
+        Número de páginas com registros (índice da primeira página vazia), sem
+        percorrer o endpoint: a API não informa o total, então sonda páginas
+        em saltos exponenciais e faz busca binária – ~2·log2(n) requisições.
+        """
+        async def tem_registros(page: int) -> bool:
+            data = await self._fetch_page(endpoint, self._page_params(page, custom_params))
             if data is None:
-                logger.warning(f"⚠️ Página {page} retornou erro – interrompendo")
-                break
-
-            items = []
-            if isinstance(data, dict) and "data" in data:
-                items = data["data"]
-            elif isinstance(data, list):
-                items = data
+                raise LyceumPaginationError(endpoint, page, "página não obtida após as novas tentativas")
+            return _has_records(data)
+
+        if not await tem_registros(0):
+            return 0
+        cheia, vazia = 0, 1
+        while await tem_registros(vazia):
+            cheia, vazia = vazia, vazia * 2
+        while vazia - cheia > 1:
+            meio = (cheia + vazia) // 2
+            if await tem_registros(meio):
+                cheia = meio
             else:
-                logger.error(f"Formato de resposta inesperado: {type(data)}")
-                break
+                vazia = meio
+        logger.info(f"📏 {endpoint}: {vazia} páginas com registros")
+        return vazia
 
-            if not items:
-                logger.info(f"✅ Página {page} vazia – fim da paginação")
-                break
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        params: Dict,
+        permit: Optional[Callable[[], AsyncContextManager]] = None,
+    ) -> Optional[Dict]:
+        if permit is None:
+            return await self._make_get_request(endpoint, params)
+        async with permit():
+            return await self._make_get_request(endpoint, params)
 
-            all_data.extend(items)
-            logger.info(f"📄 Página {page}: {len(items)} registros (total: {len(all_data)})")
-            page += 1
-            await asyncio.sleep(self.delay)
+    async def iter_records(
+        self,
+        endpoint: str,
+        custom_params: Optional[Dict] = None,
+        page_start: int = 0,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """Gera os registros do endpoint um a um (consome `iter_pages`)."""
+        async for _, items in self.iter_pages(endpoint, custom_params, page_start, window):
+            for item in items:
+                yield item
 
+    async def fetch_all_pages(
+        self,
+        endpoint: str,
+        custom_params: Optional[Dict] = None,
+        page_start: int = 0,
+        window: Optional[int] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> List[Dict]:
+        """
+        Busca todas as páginas do endpoint e devolve os registros em uma única lista.
+        `on_page(numero_pagina, registros)`, se informado, é aguardado a cada página
+        recebida (ex: progresso do job durante o download).
+        """
+        all_data = []
+        async for page, items in self.iter_pages(endpoint, custom_params, page_start, window):
+            all_data.extend(items)
+            if on_page is not None:
+                await on_page(page, items)
         return all_data
 
-    async def get_all_alunos(self) -> List[Dict]:
-        return await self.fetch_all_pages(self.ENDPOINTS["alunos"])
+    async def get_all_alunos(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["alunos"], custom_params, on_page=on_page)
+
+    async def get_all_cursos(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["cursos"], custom_params, on_page=on_page)
+
+    async def get_all_disciplinas(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["disciplinas"], custom_params, on_page=on_page)
+
+    async def get_all_turmas(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["turmas"], custom_params, on_page=on_page)
+
+    async def get_all_docentes(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["docentes"], custom_params, on_page=on_page)
+
+    async def get_all_matriculas(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["matriculas"], custom_params, on_page=on_page)
+
+    async def get_all_curriculos(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["curriculos"], custom_params, on_page=on_page)
+
+    async def get_all_grades(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["grades"], custom_params, on_page=on_page)
 
-    async def get_all_cursos(self) -> List[Dict]:
-        return await self.fetch_all_pages(self.ENDPOINTS["cursos"])
+    async def get_all_coordenacao(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["coordenacao"], custom_params, on_page=on_page)
 
-    # ... demais métodos get_all_* ...
+    async def get_all_turma_docente(self, custom_params: Optional[Dict] = None, on_page: Optional[PageCallback] = None) -> List[Dict]:
+        return await self.fetch_all_pages(self.ENDPOINTS["turma_docente"], custom_params, on_page=on_page)
 
     async def health_check(self) -> Dict[str, Any]:
-        data = await self._make_get_request(self.ENDPOINTS["alunos"], params={"page": 0, "size": 1})
+        data = await self._make_get_request(self.ENDPOINTS["alunos"], params={"page": 0, "size": 1}, max_retries=0)
         if data is not None:
             return {"status": "online", "message": "API Lyceum respondendo", "timestamp": datetime.now().isoformat()}
         return {"status": "offline", "message": "API Lyceum não respondeu", "timestamp": datetime.now().isoformat()}
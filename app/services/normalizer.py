@@ -0,0 +1,241 @@
+# app/services/normalizer.py
+import asyncio
+import logging
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric, String
+
+from app.core.config import settings
+from app.core.database import Base
+from app.services.bulk_upsert import CONTROL_FIELDS, HASH_COLUMN, content_hash
+
+logger = logging.getLogger(__name__)
+
+Converter = Callable[[Any], Any]
+
+# Colunas preenchidas pelo sync/banco, nunca lidas da API
+CONTROL_COLUMNS = CONTROL_FIELDS
+
+
+# Conversores (também expostos como BaseSyncService._safe_*)
+def to_int(v):
+    if v is None:
+        return None
+    try:
+        return int(v)
+    except (ValueError, TypeError):
+        return None
+
+
+def to_float(v):
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except (ValueError, TypeError):
+        return None
+
+
+def to_str(v):
+    if v is None:
+        return None
+    return str(v).strip()
+
+
+def to_datetime(v):
+    if v is None:
+        return None
+    try:
+        if isinstance(v, (int, float)):
+            if v > 1_000_000_000_000:
+                v = v / 1000
+            return datetime.fromtimestamp(v)
+        elif isinstance(v, str):
+            v = v.replace("Z", "+00:00")
+            return datetime.fromisoformat(v.split("+")[0])
+    except Exception:
+        return None
+    return None
+
+
+def to_bool(v):
+    if v is None or isinstance(v, bool):
+        return v
+    return str(v).strip().upper() in ("S", "1", "TRUE", "T", "Y", "SIM")
+
+
+def truncating_str(length: int) -> Converter:
+    """to_str limitado ao tamanho da coluna (String(n))."""
+    def convert(v):
+        if v is None:
+            return None
+        return str(v).strip()[:length]
+    return convert
+
+
+def converter_for(column) -> Converter:
+    """Conversor padrão derivado do tipo SQLAlchemy da coluna."""
+    tipo = column.type
+    if isinstance(tipo, Boolean):
+        return to_bool
+    if isinstance(tipo, Integer):
+        return to_int
+    if isinstance(tipo, (Float, Numeric)):
+        return to_float
+    if isinstance(tipo, DateTime):
+        return to_datetime
+    if isinstance(tipo, String):
+        # Text é String sem tamanho
+        return truncating_str(tipo.length) if tipo.length else to_str
+    return lambda v: v
+
+
+class ModelNormalizer:
+    """
+    Normalizador compilado uma vez por modelo: uma tabela
+    `(campo_api, coluna, conversor)` derivada dos tipos das colunas, percorrida
+    em um laço enxuto por registro.
+
+    - `field_map` renomeia campos (coluna -> campo da API); o padrão é o mesmo nome.
+    - `overrides` substitui o conversor de colunas específicas.
+    - Colunas de controle (CONTROL_COLUMNS) não vêm da API; `data_sincronizacao`
+      e `sincronizado` são preenchidas por lote e `hash_conteudo` é calculado
+      sobre o registro normalizado.
+
+    É serializável (pickle) para rodar em processos de normalização: o estado é
+    recompilado a partir de (modelo, field_map, overrides), então `overrides`
+    devem ser funções de módulo.
+    """
+
+    def __init__(
+        self,
+        model: Type[Base],
+        field_map: Optional[Dict[str, str]] = None,
+        overrides: Optional[Dict[str, Converter]] = None,
+    ):
+        self.model = model
+        self.field_map = field_map = field_map or {}
+        self.overrides = overrides = overrides or {}
+        columns = model.__table__.columns
+        self.table: Tuple[Tuple[str, str, Converter], ...] = tuple(
+            (field_map.get(c.name, c.name), c.name, overrides.get(c.name) or converter_for(c))
+            for c in columns
+            if c.name not in CONTROL_COLUMNS
+        )
+        self._stamp_sync = "data_sincronizacao" in columns
+        self._flag_sync = "sincronizado" in columns
+        self._hash = HASH_COLUMN in columns
+
+    def __reduce__(self):
+        return (ModelNormalizer, (self.model, self.field_map, self.overrides))
+
+    def normalize(self, raw: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+        get = raw.get
+        row = {coluna: convert(get(campo)) for campo, coluna, convert in self.table}
+        if self._stamp_sync:
+            row["data_sincronizacao"] = now or datetime.now()
+        if self._flag_sync:
+            row["sincronizado"] = True
+        if self._hash:
+            row[HASH_COLUMN] = content_hash(row)
+        return row
+
+    def normalize_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        on_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Normaliza um lote. Sem `on_error` o primeiro erro é propagado; com ele o
+        registro defeituoso é descartado e repassado ao callback.
+        """
+        now = datetime.now()
+        table = self.table
+        stamp_sync, flag_sync, com_hash = self._stamp_sync, self._flag_sync, self._hash
+        rows = []
+        append = rows.append
+        for raw in records:
+            get = raw.get
+            try:
+                row = {coluna: convert(get(campo)) for campo, coluna, convert in table}
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(raw, e)
+                continue
+            if stamp_sync:
+                row["data_sincronizacao"] = now
+            if flag_sync:
+                row["sincronizado"] = True
+            if com_hash:
+                row[HASH_COLUMN] = content_hash(row)
+            append(row)
+        return rows
+
+
+def _normalize_batch(normalizer: ModelNormalizer, records: Sequence[Dict[str, Any]]):
+    """Executado no worker: devolve (linhas, [(índice, mensagem de erro), ...])."""
+    erros: List[Tuple[int, str]] = []
+    posicao = {id(raw): i for i, raw in enumerate(records)}
+    rows = normalizer.normalize_many(records, on_error=lambda raw, e: erros.append((posicao[id(raw)], str(e))))
+    return rows, erros
+
+
+_executor: Optional[Executor] = None
+
+
+def get_normalization_executor() -> Optional[Executor]:
+    """
+    Pool compartilhado para normalização fora do event loop, ou None se
+    SYNC_NORMALIZE_WORKERS=0 (normaliza no próprio loop).
+    SYNC_NORMALIZE_EXECUTOR: "process", "thread" ou "auto" (threads só quando o
+    Python roda sem GIL; senão processos).
+    """
+    global _executor
+    if settings.SYNC_NORMALIZE_WORKERS <= 0:
+        return None
+    if _executor is None:
+        tipo = settings.SYNC_NORMALIZE_EXECUTOR
+        if tipo == "auto":
+            sem_gil = not getattr(sys, "_is_gil_enabled", lambda: True)()
+            tipo = "thread" if sem_gil else "process"
+        if tipo == "thread":
+            _executor = ThreadPoolExecutor(settings.SYNC_NORMALIZE_WORKERS, thread_name_prefix="normalizer")
+        else:
+            # spawn: o processo da API tem threads (aiosqlite, pool HTTP) – fork não é seguro
+            _executor = ProcessPoolExecutor(settings.SYNC_NORMALIZE_WORKERS, mp_context=get_context("spawn"))
+        logger.info(f"🧮 Normalização em {tipo} pool com {settings.SYNC_NORMALIZE_WORKERS} workers")
+    return _executor
+
+
+def shutdown_normalization_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("🧮 Pool de normalização encerrado")
+
+
+async def normalize_many_async(
+    normalizer: ModelNormalizer,
+    records: Sequence[Dict[str, Any]],
+    on_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    `normalize_many` no pool de normalização (se configurado), mantendo o event
+    loop livre para as requisições da API durante syncs grandes.
+    """
+    executor = get_normalization_executor()
+    if executor is None or not records:
+        return normalizer.normalize_many(records, on_error=on_error)
+    rows, erros = await asyncio.get_running_loop().run_in_executor(executor, _normalize_batch, normalizer, records)
+    for indice, mensagem in erros:
+        erro = ValueError(mensagem)
+        if on_error is None:
+            raise erro
+        on_error(records[indice], erro)
+    return rows
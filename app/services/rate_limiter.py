@@ -0,0 +1,229 @@
+# app/services/rate_limiter.py
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis é opcional
+    aioredis = None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket com ajuste AIMD da taxa (requisições/segundo) para a API Lyceum.
+
+    - Sucesso com latência abaixo do alvo: aumento aditivo (+increase_step),
+      no máximo um por `cooldown` segundos – senão a taxa cresceria com o
+      número de requisições concorrentes, não com o tempo.
+    - 429, 5xx, timeout ou latência acima do alvo: redução multiplicativa
+      (no máximo uma redução por `cooldown` segundos, para que uma rajada de
+      erros simultâneos não derrube a taxa de uma vez).
+    """
+
+    backend = "local"
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: float,
+        target_latency: float,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.burst = burst
+        self.target_latency = target_latency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.tokens = burst
+        self.reducoes = 0
+        self.aguardas = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._last_increase = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """
+        Reserva uma ficha e aguarda até que ela esteja disponível.
+        O saldo pode ficar negativo (fichas já reservadas por quem está aguardando),
+        o que dispensa lock e mantém a ordem de chegada.
+        """
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens < 0:
+            self.aguardas += 1
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    async def record(self, status_code: Optional[int], latency: float) -> None:
+        """Ajusta a taxa a partir do resultado de uma requisição (None = timeout/erro de rede)."""
+        congestionado = (
+            status_code is None
+            or status_code == 429
+            or status_code >= 500
+            or latency > self.target_latency
+        )
+        now = time.monotonic()
+        if congestionado:
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.reducoes += 1
+            logger.warning(
+                f"🐢 Lyceum congestionada (status={status_code}, latência={latency:.2f}s) – "
+                f"taxa reduzida para {self.rate:.2f} req/s"
+            )
+        elif now - self._last_increase >= self.cooldown:
+            self._last_increase = now
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Estado atual do limitador (exposto como métrica)."""
+        return {
+            "backend": self.backend,
+            "rate_per_second": round(self.rate, 3),
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 3),
+            "reducoes": self.reducoes,
+            "aguardas": self.aguardas,
+        }
+
+
+class RedisRateLimiter(AdaptiveRateLimiter):
+    """
+    Mesmo algoritmo do AdaptiveRateLimiter, com o estado (fichas, taxa) guardado
+    no Redis para que vários processos/containers dividam o mesmo orçamento.
+    """
+
+    backend = "redis"
+
+    # KEYS[1] = hash de estado; ARGV = agora, taxa inicial, burst
+    # Reserva a ficha atomicamente, como o acquire local: o saldo pode ficar
+    # negativo e o retorno é a espera (segundos) até a vez de quem reservou –
+    # quem aguarda não volta a disputar fichas quando o balde reabastece.
+    ACQUIRE_SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rate')
+    local now = tonumber(ARGV[1])
+    local rate = tonumber(state[3]) or tonumber(ARGV[2])
+    local burst = tonumber(ARGV[3])
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate) - 1
+    local wait = 0
+    if tokens < 0 then
+        wait = -tokens / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rate', rate)
+    return tostring(wait)
+    """
+
+    # KEYS[1] = hash de estado; ARGV = agora, congestionado (0/1), min, max,
+    # passo aditivo, fator multiplicativo, cooldown, taxa inicial
+    RECORD_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or tonumber(ARGV[8])
+    if ARGV[2] == '1' then
+        local last = tonumber(redis.call('HGET', KEYS[1], 'last_decrease')) or 0
+        if now - last < tonumber(ARGV[7]) then
+            return tostring(rate)
+        end
+        rate = math.max(tonumber(ARGV[3]), rate * tonumber(ARGV[6]))
+        redis.call('HSET', KEYS[1], 'last_decrease', now)
+        redis.call('HINCRBY', KEYS[1], 'reducoes', 1)
+    else
+        local last = tonumber(redis.call('HGET', KEYS[1], 'last_increase')) or 0
+        if now - last < tonumber(ARGV[7]) then
+            return tostring(rate)
+        end
+        rate = math.min(tonumber(ARGV[4]), rate + tonumber(ARGV[5]))
+        redis.call('HSET', KEYS[1], 'last_increase', now)
+    end
+    redis.call('HSET', KEYS[1], 'rate', rate)
+    return tostring(rate)
+    """
+
+    def __init__(self, redis_client, key: str = "lyceum:rate_limiter", **kwargs):
+        super().__init__(**kwargs)
+        self.redis = redis_client
+        self.key = key
+        self._acquire = redis_client.register_script(self.ACQUIRE_SCRIPT)
+        self._record = redis_client.register_script(self.RECORD_SCRIPT)
+
+    async def acquire(self) -> None:
+        wait = float(await self._acquire(keys=[self.key], args=[time.time(), self.rate, self.burst]))
+        if wait > 0:
+            self.aguardas += 1
+            await asyncio.sleep(wait)
+
+    async def record(self, status_code: Optional[int], latency: float) -> None:
+        congestionado = (
+            status_code is None
+            or status_code == 429
+            or status_code >= 500
+            or latency > self.target_latency
+        )
+        self.rate = float(await self._record(
+            keys=[self.key],
+            args=[
+                time.time(), int(congestionado), self.min_rate, self.max_rate,
+                self.increase_step, self.decrease_factor, self.cooldown, self.rate,
+            ],
+        ))
+
+    async def snapshot(self) -> Dict[str, Any]:
+        state = await self.redis.hgetall(self.key)
+        snapshot = await super().snapshot()
+        snapshot.update({
+            "rate_per_second": round(float(state.get(b"rate", self.rate)), 3),
+            "tokens": round(float(state.get(b"tokens", self.burst)), 3),
+            "reducoes": int(state.get(b"reducoes", 0)),
+        })
+        return snapshot
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Limitador compartilhado por todos os LyceumAPIClient do processo."""
+    global _limiter
+    if _limiter is None:
+        kwargs = dict(
+            rate=1 / settings.LYCEUM_API_DELAY if settings.LYCEUM_API_DELAY > 0 else settings.LYCEUM_RATE_LIMIT_MAX,
+            min_rate=settings.LYCEUM_RATE_LIMIT_MIN,
+            max_rate=settings.LYCEUM_RATE_LIMIT_MAX,
+            burst=settings.LYCEUM_RATE_LIMIT_BURST,
+            target_latency=settings.LYCEUM_RATE_LIMIT_TARGET_LATENCY,
+        )
+        if settings.LYCEUM_RATE_LIMIT_BACKEND == "redis":
+            if aioredis is None:
+                logger.warning("⚠️ LYCEUM_RATE_LIMIT_BACKEND=redis, mas o pacote 'redis' não está instalado – usando limitador local")
+            else:
+                client = aioredis.Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    password=settings.REDIS_PASSWORD or None,
+                )
+                _limiter = RedisRateLimiter(client, **kwargs)
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter(**kwargs)
+        logger.info(f"🚦 Limitador Lyceum ({_limiter.backend}) iniciado com {_limiter.rate:.2f} req/s")
+    return _limiter
@@ -0,0 +1,135 @@
+# app/services/staging_copy.py
+import logging
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from sqlalchemy import BigInteger, Column, MetaData, Table, func, literal_column, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable, DropTable
+
+from app.core.database import Base
+from app.services.bulk_upsert import (
+    GENERATION_COLUMN, HASH_COLUMN, PRESERVED_ON_UPDATE, REMOVED_AT_COLUMN, REMOVED_COLUMN, Key, key_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+ORDER_COLUMN = "_ordem"
+
+
+class StagingCopyLoader:
+    """
+    Carga completa via staging (somente PostgreSQL + asyncpg):
+
+    1. `prepare()` recria a tabela UNLOGGED `stg_<tabela>` com as colunas atuais
+       do destino (uma staging antiga não sobrevive a mudanças no modelo);
+    2. `copy(rows)` envia cada lote normalizado com COPY (`copy_records_to_table`),
+       sem ORM e sem um parâmetro por valor;
+    3. `merge()` grava tudo no destino com um único INSERT .. SELECT DISTINCT ON ..
+       ON CONFLICT DO UPDATE (pulando linhas com `hash_conteudo` igual) e esvazia a staging.
+
+    Se as linhas trazem `geracao_sync`, as barradas pela guarda de hash recebem
+    a nova geração em um UPDATE .. FROM staging (`generation_statement`).
+
+    Tudo roda na transação corrente da sessão: o commit fica com o chamador
+    (o sync confirma a cada página, com o progresso do job; o merge é uma instrução só).
+    A staging não tem chave – repetições são resolvidas no merge pela última
+    ocorrência (coluna `_ordem`).
+    """
+
+    def __init__(self, db: AsyncSession, model: Type[Base], key: Key):
+        self.db = db
+        self.model = model
+        self.key = key_fields(key)
+        self.target = model.__table__
+        self.staging = Table(
+            f"stg_{self.target.name}",
+            MetaData(),
+            *[Column(c.name, c.type) for c in self.target.columns],
+            Column(ORDER_COLUMN, BigInteger),
+            prefixes=["UNLOGGED"],
+        )
+        self.columns: List[str] = []
+        self.copiados = 0
+
+    def prepare_statements(self):
+        """DROP IF EXISTS + CREATE da staging a partir das colunas atuais do destino."""
+        return DropTable(self.staging, if_exists=True), CreateTable(self.staging)
+
+    async def prepare(self) -> None:
+        for stmt in self.prepare_statements():
+            await self.db.execute(stmt)
+        self.copiados = 0
+
+    async def copy(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if not self.columns:
+            self.columns = [c for c in rows[0].keys() if c in self.staging.c]
+        records = []
+        for row in rows:
+            self.copiados += 1
+            records.append((*(row.get(c) for c in self.columns), self.copiados))
+        # Conexão asyncpg da transação corrente da sessão
+        conn = await self.db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            self.staging.name, records=records, columns=[*self.columns, ORDER_COLUMN],
+        )
+
+    def merge_statement(self):
+        """SELECT que executa o merge staging → destino e devolve (inseridos, atualizados)."""
+        stg, key = self.staging, self.key
+        chave_stg = [stg.c[c] for c in key]
+        ultimas = (
+            select(*[stg.c[c] for c in self.columns])
+            .distinct(*chave_stg)
+            .order_by(*chave_stg, stg.c[ORDER_COLUMN].desc())
+        )
+        stmt = postgresql.insert(self.target).from_select(self.columns, ultimas, include_defaults=False)
+        set_ = {c: stmt.excluded[c] for c in self.columns if c not in key and c not in PRESERVED_ON_UPDATE}
+        if "data_atualizacao" in self.target.c and "data_atualizacao" not in self.columns:
+            set_["data_atualizacao"] = func.now()
+        guarda = None
+        if HASH_COLUMN in self.columns:
+            # Linhas com o mesmo hash não são regravadas (nem voltam no RETURNING)
+            guarda = self.target.c[HASH_COLUMN].is_distinct_from(stmt.excluded[HASH_COLUMN])
+        gravados = (
+            stmt.on_conflict_do_update(index_elements=[self.target.c[c] for c in key], set_=set_, where=guarda)
+            .returning(literal_column("(xmax = 0)").label("inserido"))
+            .cte("gravados")
+        )
+        distintos = select(func.count()).select_from(select(*chave_stg).distinct().subquery()).scalar_subquery()
+        return select(
+            func.count().filter(gravados.c.inserido),
+            func.count().filter(~gravados.c.inserido),
+            distintos - func.count(),
+        ).select_from(gravados)
+
+    def generation_statement(self):
+        """UPDATE .. FROM staging que leva a geração da carga às linhas não regravadas pelo merge."""
+        stg, key, target = self.staging, self.key, self.target
+        valores = {c: stg.c[c] for c in (GENERATION_COLUMN, REMOVED_COLUMN, REMOVED_AT_COLUMN) if c in self.columns}
+        if "data_atualizacao" in target.c:
+            valores["data_atualizacao"] = target.c["data_atualizacao"]
+        return (
+            update(target)
+            .where(
+                *(target.c[c] == stg.c[c] for c in key),
+                target.c[GENERATION_COLUMN].is_distinct_from(stg.c[GENERATION_COLUMN]),
+            )
+            .values(valores)
+        )
+
+    async def merge(self) -> Tuple[int, int, int]:
+        if not self.copiados:
+            return 0, 0, 0
+        inseridos, atualizados, inalterados = (await self.db.execute(self.merge_statement())).one()
+        if GENERATION_COLUMN in self.columns and HASH_COLUMN in self.columns and inalterados:
+            await self.db.execute(self.generation_statement())
+        await self.db.execute(text(f'TRUNCATE "{self.staging.name}"'))
+        logger.info(
+            f"🔀 Merge de {self.copiados} linhas de {self.staging.name} em {self.target.name}: "
+            f"{inseridos} inseridos, {atualizados} atualizados, {inalterados} inalterados"
+        )
+        return inseridos or 0, atualizados or 0, inalterados or 0
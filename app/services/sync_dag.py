@@ -0,0 +1,161 @@
+# app/services/sync_dag.py
+import asyncio
+import logging
+import time
+from graphlib import TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.sync_job import SyncJob
+from app.services.sync_jobs import run_in_background, start_job
+from app.services.sync_registry import SYNC_SERVICES, sync_entity
+
+logger = logging.getLogger(__name__)
+
+# Status do job que impedem os dependentes de rodar
+FAILED_STATUSES = ("erro", "interrompido")
+
+
+def dependency_graph(entidades: Optional[Iterable[str]] = None) -> Dict[str, Tuple[str, ...]]:
+    """
+    entidade -> entidades das quais depende (`DEPENDS_ON` dos serviços), só
+    entre as selecionadas: uma dependência fora da seleção não é esperada.
+    """
+    selecionadas = list(SYNC_SERVICES) if entidades is None else list(entidades)
+    desconhecidas = [e for e in selecionadas if e not in SYNC_SERVICES]
+    if desconhecidas:
+        raise ValueError(f"Entidades sem sincronização registrada: {desconhecidas}")
+    return {
+        entidade: tuple(d for d in SYNC_SERVICES[entidade].DEPENDS_ON if d in selecionadas)
+        for entidade in selecionadas
+    }
+
+
+def dependency_levels(grafo: Dict[str, Tuple[str, ...]]) -> List[List[str]]:
+    """Níveis do DAG (entidades de um nível podem rodar juntas); CycleError se houver ciclo."""
+    sorter = TopologicalSorter(grafo)
+    sorter.prepare()
+    niveis = []
+    while sorter.is_active():
+        nivel = sorted(sorter.get_ready())
+        niveis.append(nivel)
+        sorter.done(*nivel)
+    return niveis
+
+
+class SyncDAGRunner:
+    """
+    Sincroniza várias entidades respeitando `DEPENDS_ON`: independentes rodam
+    em paralelo (até SYNC_DAG_MAX_CONCURRENT) e cada dependente começa assim
+    que todas as suas dependências terminam – não espera o nível inteiro.
+    Dependência que falhou (erro/interrompido) ou estava ocupada com outra
+    execução faz seus dependentes serem pulados, transitivamente. Cada
+    entidade é um job normal (`start_job`, single-flight por entidade).
+    """
+
+    def __init__(
+        self,
+        entidades: Optional[Iterable[str]] = None,
+        incremental: bool = False,
+        max_concurrent: Optional[int] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    ):
+        self.graph = dependency_graph(entidades)
+        self.incremental = incremental
+        self.session_factory = session_factory
+        self._slots = asyncio.Semaphore(max_concurrent or settings.SYNC_DAG_MAX_CONCURRENT)
+
+    async def run(self) -> Dict[str, Any]:
+        """Executa o DAG e retorna o relatório de tempos por entidade e total."""
+        sorter = TopologicalSorter(self.graph)
+        sorter.prepare()
+        inicio = time.monotonic()
+        resultados: Dict[str, Dict[str, Any]] = {}
+        em_execucao: Dict[asyncio.Task, str] = {}
+
+        while sorter.is_active():
+            for entidade in sorted(sorter.get_ready()):
+                bloqueio = [d for d in self.graph[entidade] if resultados[d]["status"] in FAILED_STATUSES + ("pulado",)]
+                if bloqueio:
+                    resultados[entidade] = {"status": "pulado", "motivo": f"dependências sem sucesso: {bloqueio}"}
+                    logger.warning(f"⏭️ DAG: {entidade} pulada ({bloqueio} sem sucesso)")
+                    sorter.done(entidade)
+                    continue
+                task = asyncio.create_task(self._run_entity(entidade, inicio), name=f"sync-dag-{entidade}")
+                em_execucao[task] = entidade
+            if not em_execucao:
+                continue  # entidades puladas liberaram outras
+            prontas, _ = await asyncio.wait(em_execucao, return_when=asyncio.FIRST_COMPLETED)
+            for task in prontas:
+                entidade = em_execucao.pop(task)
+                resultados[entidade] = task.result()
+                sorter.done(entidade)
+
+        return self._report(resultados, time.monotonic() - inicio)
+
+    async def _run_entity(self, entidade: str, inicio_dag: float) -> Dict[str, Any]:
+        """Executa uma entidade; qualquer falha vira status "erro" (pula só os dependentes)."""
+        try:
+            return await self._sync_entity(entidade, inicio_dag)
+        except Exception as e:
+            logger.error(f"❌ DAG: {entidade} falhou: {e}")
+            return {"status": "erro", "erro": str(e)}
+
+    async def _sync_entity(self, entidade: str, inicio_dag: float) -> Dict[str, Any]:
+        async with self._slots:
+            async with self.session_factory() as db:
+                job_id, lock = await start_job(db, entidade, incremental=self.incremental, engine=db.bind)
+            if lock is None:
+                # Outra execução da entidade em andamento: o resultado dela não é esperado
+                return {"status": "pulado", "job_id": job_id, "motivo": "execução já em andamento"}
+            comeco = time.monotonic()
+            logger.info(f"▶️ DAG: {entidade} iniciada (job {job_id})")
+            await run_in_background(
+                job_id,
+                lambda session: sync_entity(session, entidade, incremental=self.incremental, job_id=job_id),
+                lock,
+                session_factory=self.session_factory,
+            )
+            fim = time.monotonic()
+            async with self.session_factory() as db:
+                job = await db.get(SyncJob, job_id)
+            logger.info(f"⏹️ DAG: {entidade} terminou com status {job.status} em {fim - comeco:.2f}s")
+            return {
+                "status": job.status,
+                "job_id": job_id,
+                "registros": job.registros,
+                "erro": job.erro,
+                "inicio": round(comeco - inicio_dag, 3),
+                "duracao": round(fim - comeco, 3),
+            }
+
+    def _report(self, resultados: Dict[str, Dict[str, Any]], total: float) -> Dict[str, Any]:
+        """Tempo total, soma das durações (execução serial) e caminho crítico do DAG."""
+        duracao = {e: r.get("duracao", 0.0) for e, r in resultados.items()}
+        fim_caminho: Dict[str, Tuple[float, List[str]]] = {}
+        for nivel in dependency_levels(self.graph):
+            for entidade in nivel:
+                anterior = max(
+                    (fim_caminho[d] for d in self.graph[entidade]), key=lambda c: c[0], default=(0.0, [])
+                )
+                fim_caminho[entidade] = (anterior[0] + duracao[entidade], anterior[1] + [entidade])
+        critico = max(fim_caminho.values(), key=lambda c: c[0], default=(0.0, []))
+        serial = sum(duracao.values())
+        relatorio = {
+            "total_segundos": round(total, 3),
+            "serial_segundos": round(serial, 3),
+            "ganho_paralelismo": round(serial / total, 2) if total > 0 else None,
+            "caminho_critico": critico[1],
+            "caminho_critico_segundos": round(critico[0], 3),
+            "entidades": resultados,
+        }
+        logger.info(
+            f"🏁 DAG concluído em {total:.2f}s (serial: {serial:.2f}s, "
+            f"caminho crítico: {' -> '.join(critico[1])} em {critico[0]:.2f}s)"
+        )
+        for entidade, r in resultados.items():
+            logger.info(f"   {entidade:<15} {r['status']:<20} início {r.get('inicio', '-')}s duração {r.get('duracao', '-')}s")
+        return relatorio
@@ -0,0 +1,200 @@
+# app/services/sync_diff.py
+"""
+Dry-run de uma carga completa: o que a sincronização mudaria, sem gravar nada.
+
+A API é lida página a página e cada registro é normalizado como no sync
+(`_normalize_items`), mas só (chave, hash_conteudo) é guardado – e ordenado
+com memória limitada (`SpillingSorter`: blocos de SYNC_DIFF_API_CHUNK chaves
+ordenados em arquivos temporários e intercalados no fim). O banco é
+lido em streaming (`yield_per`), ordenado pela chave, com a mesma ordem de
+comparação do Python (COLLATE "C" no PostgreSQL = ordem de bytes UTF-8 =
+ordem de code points). Um merge-join linear das duas sequências ordenadas
+classifica cada chave em inserir / atualizar / remover (o que a varredura da
+geração marcaria como removido na origem) / inalterado.
+"""
+import heapq
+import logging
+import pickle
+import tempfile
+import time
+from typing import IO, Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import false, select
+
+from app.core.config import settings
+from app.services.bulk_upsert import HASH_COLUMN, REMOVED_COLUMN, key_fields, key_getter
+
+logger = logging.getLogger(__name__)
+
+DIFF_KINDS = ("inserir", "atualizar", "remover", "inalterados")
+
+# (chave, hash) da API; (chave, hash, removido_origem) do banco
+ApiEntry = Tuple[Any, Optional[str]]
+DbEntry = Tuple[Any, Optional[str], bool]
+
+
+async def merge_diff(api: Iterable[ApiEntry], banco: AsyncIterator[DbEntry]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Merge-join de duas sequências ordenadas por chave (sem chaves repetidas):
+    produz (tipo, chave) para cada chave das duas. Registros já removidos na
+    origem só contam se reaparecem na API (atualizar).
+    """
+    api = iter(api)
+    proximo_api = next(api, None)
+    async for chave_db, hash_db, removido in banco:
+        while proximo_api is not None and proximo_api[0] < chave_db:
+            yield "inserir", proximo_api[0]
+            proximo_api = next(api, None)
+        if proximo_api is not None and proximo_api[0] == chave_db:
+            yield ("atualizar" if removido or proximo_api[1] != hash_db else "inalterados"), chave_db
+            proximo_api = next(api, None)
+        elif not removido:
+            yield "remover", chave_db
+    while proximo_api is not None:
+        yield "inserir", proximo_api[0]
+        proximo_api = next(api, None)
+
+
+class SpillingSorter:
+    """
+    Ordena entradas (chave, hash) com memória limitada: a cada `chunk` chaves o
+    bloco é ordenado e gravado em um arquivo temporário; a iteração intercala
+    os blocos (heapq.merge). Chave repetida: vale a última ocorrência.
+    Iterável uma única vez; `chaves` conta as chaves distintas entregues.
+    """
+
+    def __init__(self, chunk: int):
+        self.chunk = max(1, chunk)
+        self.chaves = 0
+        self._buffer: Dict[Any, Optional[str]] = {}
+        self._blocos: List[IO[bytes]] = []
+
+    def add(self, chave: Any, hash_: Optional[str]) -> None:
+        self._buffer[chave] = hash_
+        if len(self._buffer) >= self.chunk:
+            self._spill()
+
+    @property
+    def blocos(self) -> int:
+        return len(self._blocos)
+
+    def _spill(self) -> None:
+        arquivo = tempfile.TemporaryFile()
+        for entrada in sorted(self._buffer.items()):
+            pickle.dump(entrada, arquivo, pickle.HIGHEST_PROTOCOL)
+        arquivo.seek(0)
+        self._blocos.append(arquivo)
+        self._buffer = {}
+
+    @staticmethod
+    def _read(arquivo: IO[bytes], ordem: int) -> Iterator[Tuple[Any, int, Optional[str]]]:
+        while True:
+            try:
+                chave, hash_ = pickle.load(arquivo)
+            except EOFError:
+                return
+            yield chave, ordem, hash_
+
+    def __iter__(self) -> Iterator[ApiEntry]:
+        n = len(self._blocos)
+        fontes = [self._read(arquivo, ordem) for ordem, arquivo in enumerate(self._blocos)]
+        fontes.append((chave, n, hash_) for chave, hash_ in sorted(self._buffer.items()))
+        self._buffer = {}
+        pendente = None
+        try:
+            # Mesma chave: blocos em ordem de gravação, o último prevalece
+            for chave, _, hash_ in heapq.merge(*fontes, key=lambda e: (e[0], e[1])):
+                if pendente is not None and pendente[0] != chave:
+                    self.chaves += 1
+                    yield pendente
+                pendente = (chave, hash_)
+            if pendente is not None:
+                self.chaves += 1
+                yield pendente
+        finally:
+            for arquivo in self._blocos:
+                arquivo.close()
+
+
+class SortedMergeDiff:
+    """Relatório de mudanças de uma carga completa do serviço, sem escrita no banco."""
+
+    def __init__(self, service, sample: Optional[int] = None):
+        if HASH_COLUMN not in service.MODEL.__table__.c:
+            raise ValueError(f"{service.MODEL.__tablename__} sem {HASH_COLUMN}: dry-run indisponível")
+        self.service = service
+        self.sample = settings.SYNC_DIFF_SAMPLE if sample is None else sample
+        self.campos = key_fields(service.UNIQUE_FIELD)
+
+    async def run(self) -> Dict[str, Any]:
+        inicio = time.monotonic()
+        stats = {"total_api": 0, "paginas": 0, "ignorados": 0, "erros": 0}
+        api = await self._api_entries(stats)
+        relatorio: Dict[str, Any] = {k: 0 for k in DIFF_KINDS}
+        amostras: Dict[str, List[Any]] = {k: [] for k in DIFF_KINDS[:3]}
+        registros_banco = 0
+
+        async def banco() -> AsyncIterator[DbEntry]:
+            nonlocal registros_banco
+            async for entrada in self._db_entries():
+                registros_banco += 1
+                yield entrada
+
+        async for tipo, chave in merge_diff(api, banco()):
+            relatorio[tipo] += 1
+            if tipo in amostras and len(amostras[tipo]) < self.sample:
+                amostras[tipo].append(chave if len(self.campos) == 1 else dict(zip(self.campos, chave)))
+
+        relatorio.update(
+            entidade=self.service.API_ENDPOINT,
+            dry_run=True,
+            registros_api=stats["total_api"],
+            chaves_api=api.chaves,
+            blocos_api_em_disco=api.blocos,
+            registros_banco=registros_banco,
+            paginas=stats["paginas"],
+            ignorados=stats["ignorados"],
+            erros=stats["erros"],
+            amostras=amostras,
+            duracao=round(time.monotonic() - inicio, 3),
+        )
+        logger.info(
+            f"🔍 Dry-run de {self.service.MODEL.__tablename__}: {relatorio['inserir']} a inserir, "
+            f"{relatorio['atualizar']} a atualizar, {relatorio['remover']} a remover, "
+            f"{relatorio['inalterados']} inalterados ({relatorio['duracao']}s)"
+        )
+        return relatorio
+
+    async def _api_entries(self, stats: Dict[str, Any]) -> SpillingSorter:
+        """(chave, hash) de todos os registros da API, ordenado; chave repetida: vale a última."""
+        service = self.service
+        chave = key_getter(service.UNIQUE_FIELD)
+        entradas = SpillingSorter(settings.SYNC_DIFF_API_CHUNK)
+        endpoint = service.api_client.ENDPOINTS[service.API_ENDPOINT]
+        async for _, items in service.api_client.iter_pages(endpoint):
+            stats["total_api"] += len(items)
+            stats["paginas"] += 1
+            # Mesma normalização (e hash) do sync; só chave e hash ficam em memória
+            for row in await service._normalize_items(items, stats, False, {}):
+                entradas.add(chave(row), row.get(HASH_COLUMN))
+        return entradas
+
+    def _db_query(self):
+        table = self.service.MODEL.__table__
+        postgres = self.service.db.bind.dialect.name == "postgresql"
+        removido = table.c[REMOVED_COLUMN] if REMOVED_COLUMN in table.c else false()
+        ordem = [
+            table.c[c].collate("C") if postgres and table.c[c].type.python_type is str else table.c[c]
+            for c in self.campos
+        ]
+        return (
+            select(*(table.c[c] for c in self.campos), table.c[HASH_COLUMN], removido)
+            .order_by(*ordem)
+            .execution_options(yield_per=settings.SYNC_DIFF_DB_BATCH)
+        )
+
+    async def _db_entries(self) -> AsyncIterator[DbEntry]:
+        n = len(self.campos)
+        result = await self.service.db.stream(self._db_query())
+        async for row in result:
+            yield (row[0] if n == 1 else tuple(row[:n])), row[n], bool(row[n + 1])
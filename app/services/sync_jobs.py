@@ -0,0 +1,287 @@
+# app/services/sync_jobs.py
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Type
+from uuid import uuid4
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, Base, async_engine
+from app.models.sync_job import SyncJob
+from app.models.sync_shard import SyncShard
+from app.services.sync_lock import SyncLock
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("concluido", "concluido_com_erros", "interrompido", "erro")
+ACTIVE_STATUSES = ("pendente", "em_andamento", "finalizando")
+
+# Execuções iniciadas por `spawn_job` (referência forte até terminarem)
+_running: Set[asyncio.Task] = set()
+
+
+async def create_job(db: AsyncSession, entidade: str, incremental: bool = False) -> str:
+    """Registra um job pendente (antes de agendá-lo em background) e retorna o id."""
+    job_id = str(uuid4())
+    db.add(SyncJob(id=job_id, entidade=entidade, status="pendente", incremental=incremental))
+    await db.commit()
+    return job_id
+
+
+async def find_active_job(db: AsyncSession, entidade: str) -> Optional[str]:
+    """Job pendente ou em andamento mais recente da entidade."""
+    return await db.scalar(
+        select(SyncJob.id)
+        .where(SyncJob.entidade == entidade, SyncJob.status.in_(ACTIVE_STATUSES))
+        .order_by(SyncJob.criado_em.desc())
+        .limit(1)
+    )
+
+
+async def find_live_sharded_job(db: AsyncSession, entidade: str) -> Optional[str]:
+    """
+    Job distribuído (`sync_shard`) ainda vivo: com faixa pendente ou lease
+    válido. Não segura a trava de `start_job`, então é consultado à parte.
+    """
+    return await db.scalar(
+        select(SyncShard.job_id)
+        .join(SyncJob, SyncJob.id == SyncShard.job_id)
+        .where(
+            SyncJob.entidade == entidade,
+            SyncJob.status.in_(ACTIVE_STATUSES),
+            or_(
+                SyncShard.status == "pendente",
+                and_(SyncShard.status == "em_andamento", SyncShard.lease_ate >= datetime.now()),
+            ),
+        )
+        .limit(1)
+    )
+
+
+async def start_job(
+    db: AsyncSession,
+    entidade: str,
+    incremental: bool = False,
+    engine: Optional[AsyncEngine] = None,
+) -> Tuple[Optional[str], Optional[SyncLock]]:
+    """
+    Single-flight por entidade: com a trava (`SyncLock`) livre, cria um job
+    pendente e devolve (job_id, trava) – a trava deve ser liberada ao fim da
+    execução (`run_in_background`). Se outra execução (deste processo ou de
+    outra réplica) detém a trava, devolve (id do job em andamento, None) para
+    o gatilho se juntar a ele; o id pode ser None se o job ainda não apareceu.
+    Um job distribuído em faixas com workers vivos também conta como em andamento.
+    """
+    lock = await SyncLock.try_acquire(engine or async_engine, entidade)
+    if lock is None:
+        # O dono da trava grava o job logo após obtê-la: tolera essa janela
+        for _ in range(settings.SYNC_LOCK_JOIN_ATTEMPTS):
+            job_id = await find_active_job(db, entidade)
+            if job_id is not None:
+                break
+            await asyncio.sleep(0.1)
+        logger.info(f"⏭️ Sincronização de {entidade} já em andamento – gatilho agregado ao job {job_id}")
+        return job_id, None
+
+    try:
+        job_id = await find_live_sharded_job(db, entidade)
+        if job_id is not None:
+            await lock.release()
+            logger.info(f"⏭️ Carga distribuída de {entidade} em andamento – gatilho agregado ao job {job_id}")
+            return job_id, None
+        # Com a trava em mãos, jobs "ativos" restantes são de execuções que morreram
+        await db.execute(
+            update(SyncJob)
+            .where(SyncJob.entidade == entidade, SyncJob.status.in_(ACTIVE_STATUSES))
+            .values(status="interrompido", erro="Execução abandonada (trava de sincronização livre)",
+                    concluido_em=datetime.now())
+        )
+        job_id = await create_job(db, entidade, incremental=incremental)
+    except Exception:
+        await lock.release()
+        raise
+    return job_id, lock
+
+
+async def run_in_background(
+    job_id: str,
+    sync: Callable[[AsyncSession], Awaitable[Dict[str, Any]]],
+    lock: Optional[SyncLock] = None,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> None:
+    """
+    Executa `sync(db)` em uma sessão própria: a sessão da requisição já foi
+    fechada quando a execução começa. Falhas não tratadas pelo sync encerram
+    o job com status "erro". A trava de `start_job` é liberada ao fim, mesmo
+    se a sessão não abrir ou a execução for cancelada.
+    """
+    try:
+        async with session_factory() as db:
+            try:
+                stats = await sync(db)
+                logger.info(f"Job {job_id} concluído: {stats}")
+            except Exception as e:
+                logger.error(f"❌ Job {job_id} falhou: {e}")
+                await db.rollback()
+                await db.execute(
+                    update(SyncJob)
+                    .where(SyncJob.id == job_id, SyncJob.status.notin_(FINAL_STATUSES))
+                    .values(status="erro", erro=str(e), concluido_em=datetime.now())
+                )
+                await db.commit()
+    finally:
+        if lock is not None:
+            await lock.release()
+
+
+async def spawn_job(
+    job_id: str,
+    sync: Callable[[AsyncSession], Awaitable[Dict[str, Any]]],
+    lock: Optional[SyncLock] = None,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> asyncio.Task:
+    """
+    Agenda `run_in_background` como task do loop, já com a trava de
+    `start_job` em mãos. A trava nunca fica presa: se a task não puder ser
+    criada ela é liberada aqui, e uma task cancelada antes de começar (ex:
+    shutdown) a libera no callback de conclusão.
+    """
+    try:
+        task = asyncio.create_task(run_in_background(job_id, sync, lock, session_factory), name=f"sync-job-{job_id}")
+    except BaseException:
+        if lock is not None:
+            await lock.release()
+        raise
+    _running.add(task)
+
+    def concluida(task: asyncio.Task) -> None:
+        _running.discard(task)
+        if lock is not None and not lock.released:
+            liberacao = asyncio.ensure_future(lock.release())
+            _running.add(liberacao)
+            liberacao.add_done_callback(_running.discard)
+
+    task.add_done_callback(concluida)
+    return task
+
+
+async def cancel_running_jobs() -> None:
+    """Cancela as execuções de `spawn_job` em andamento e espera as travas serem liberadas (shutdown)."""
+    for task in list(_running):
+        task.cancel()
+    while _running:
+        await asyncio.gather(*list(_running), return_exceptions=True)
+
+
+class SyncJobTracker:
+    """
+    Acompanha um job de sincronização (`SyncJob`) para o BaseSyncService.
+
+    O progresso é escrito com UPDATEs de Core na sessão do sync, sem commit
+    próprio: vai para o banco junto com o commit de cada página/lote (como o
+    checkpoint) e no máximo a cada SYNC_JOB_PROGRESS_SECONDS. Vazão e ETA
+    usam os registros processados desde o início; o total estimado vem da
+    última carga completa concluída da entidade ou, sem ela, da tabela local.
+    """
+
+    def __init__(self, db: AsyncSession, job_id: str, total_estimado: Optional[int]):
+        self.db = db
+        self.id = job_id
+        self.total_estimado = total_estimado
+        self._inicio = time.monotonic()
+        self._ultimo = 0.0
+
+    @classmethod
+    async def start(
+        cls,
+        db: AsyncSession,
+        model: Type[Base],
+        entidade: str,
+        incremental: bool,
+        modo: str,
+        retomado: bool,
+        job_id: Optional[str] = None,
+    ) -> "SyncJobTracker":
+        total = None if incremental else await cls._estimate_total(db, model, entidade)
+        valores = dict(
+            entidade=entidade, status="em_andamento", modo=modo, incremental=incremental,
+            retomado=retomado, total_estimado=total, iniciado_em=datetime.now(),
+        )
+        if job_id is not None and await db.get(SyncJob, job_id) is not None:
+            await db.execute(update(SyncJob).where(SyncJob.id == job_id).values(**valores))
+        else:
+            job_id = job_id or str(uuid4())
+            db.add(SyncJob(id=job_id, **valores))
+        await db.commit()
+        logger.info(f"📋 Job {job_id} ({entidade}, {modo}) iniciado – total estimado: {total}")
+        return cls(db, job_id, total)
+
+    @staticmethod
+    async def _estimate_total(db: AsyncSession, model: Type[Base], entidade: str) -> Optional[int]:
+        anterior = await db.scalar(
+            select(SyncJob.registros)
+            .where(SyncJob.entidade == entidade, SyncJob.incremental.is_(False), SyncJob.status == "concluido")
+            .order_by(SyncJob.concluido_em.desc())
+            .limit(1)
+        )
+        if anterior:
+            return anterior
+        return await db.scalar(select(func.count()).select_from(model.__table__)) or None
+
+    def _progress_values(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        processados = stats["inseridos"] + stats["atualizados"] + stats["inalterados"] + stats["ignorados"]
+        segundos = time.monotonic() - self._inicio
+        vazao = processados / segundos if segundos > 0 and processados else None
+        eta = None
+        if vazao and self.total_estimado:
+            eta = round(max(0, self.total_estimado - processados) / vazao, 1)
+        return dict(
+            run_id=stats.get("run_id"),
+            paginas=stats["paginas"],
+            registros=stats["total_api"],
+            processados=processados,
+            erros=stats["erros"],
+            registros_por_segundo=round(vazao, 1) if vazao else None,
+            eta_segundos=eta,
+        )
+
+    async def progress(self, stats: Dict[str, Any]) -> None:
+        """Registra o progresso na transação corrente (o commit fica com o sync)."""
+        agora = time.monotonic()
+        if agora - self._ultimo < settings.SYNC_JOB_PROGRESS_SECONDS:
+            return
+        self._ultimo = agora
+        await self.db.execute(update(SyncJob).where(SyncJob.id == self.id).values(**self._progress_values(stats)))
+
+    async def finish(self, stats: Dict[str, Any], erro: Optional[BaseException] = None) -> None:
+        """Grava estatísticas finais e status do job, com commit próprio."""
+        if erro is not None:
+            status = "erro"
+        elif stats.get("interrompido"):
+            status = "interrompido"
+        elif stats["erros"] or stats.get("lotes_com_erro"):
+            status = "concluido_com_erros"
+        else:
+            status = "concluido"
+        valores = self._progress_values(stats)
+        valores.update(
+            status=status,
+            eta_segundos=0 if status == "concluido" else None,
+            estatisticas=json.loads(json.dumps(stats, default=str)),
+            erro=str(erro) if erro is not None else stats.get("erro"),
+            concluido_em=datetime.now(),
+        )
+        try:
+            if erro is not None:
+                await self.db.rollback()
+            await self.db.execute(update(SyncJob).where(SyncJob.id == self.id).values(**valores))
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Erro ao registrar o fim do job {self.id}: {e}")
@@ -0,0 +1,82 @@
+# app/services/sync_lock.py
+import hashlib
+import logging
+from typing import Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAMESPACE = "lyceum-sync"
+
+# Fallback fora do PostgreSQL: só coordena gatilhos do mesmo processo
+_locais: Set[str] = set()
+
+
+def lock_key(entidade: str) -> int:
+    """Chave bigint estável do advisory lock de uma entidade."""
+    digest = hashlib.sha256(f"{LOCK_NAMESPACE}:{entidade}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class SyncLock:
+    """
+    Trava exclusiva de sincronização por entidade (single-flight).
+
+    No PostgreSQL é um advisory lock de sessão (`pg_try_advisory_lock`) em uma
+    conexão dedicada, mantida aberta até `release()`: vale entre réplicas e é
+    liberado pelo servidor se o processo morrer. A sessão do sync não serve –
+    ela devolve a conexão ao pool a cada commit. Nos demais bancos a trava é
+    só do processo.
+    """
+
+    def __init__(self, entidade: str, conn: Optional[AsyncConnection] = None):
+        self.entidade = entidade
+        self.released = False
+        self._conn = conn
+
+    @classmethod
+    async def try_acquire(cls, engine: AsyncEngine, entidade: str) -> Optional["SyncLock"]:
+        """Tenta travar sem esperar; None se outra execução já detém a trava."""
+        if engine.dialect.name != "postgresql":
+            if entidade in _locais:
+                return None
+            _locais.add(entidade)
+            return cls(entidade)
+
+        conn = await engine.connect()
+        try:
+            obtido = (await conn.execute(select(func.pg_try_advisory_lock(lock_key(entidade))))).scalar()
+            # O lock de sessão sobrevive ao fim da transação: não deixar a conexão "idle in transaction"
+            await conn.commit()
+        except Exception:
+            # O lock pode ter sido obtido: encerrar a sessão no servidor, não devolvê-la ao pool
+            await conn.invalidate()
+            raise
+        if not obtido:
+            await conn.close()
+            return None
+        logger.info(f"🔒 Advisory lock de sincronização obtido para {entidade}")
+        return cls(entidade, conn)
+
+    async def release(self) -> None:
+        """Libera a trava; chamadas repetidas não fazem nada."""
+        if self.released:
+            return
+        self.released = True
+        if self._conn is None:
+            _locais.discard(self.entidade)
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await conn.execute(select(func.pg_advisory_unlock(lock_key(self.entidade))))
+            await conn.commit()
+        except Exception as e:
+            # close() devolveria ao pool a sessão do servidor, ainda com o lock:
+            # invalidar descarta a conexão e encerra a sessão, liberando-o
+            logger.error(f"Erro ao liberar advisory lock de {self.entidade}: {e}")
+            await conn.invalidate()
+            return
+        await conn.close()
+        logger.info(f"🔓 Advisory lock de sincronização liberado para {self.entidade}")
@@ -0,0 +1,137 @@
+# app/services/sync_pipeline.py
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FIM = object()
+
+Page = Tuple[int, List[Dict]]
+NormalizeFn = Callable[[List[Dict]], Awaitable[List[Dict]]]
+WriteFn = Callable[[int, List[Dict], int], Awaitable[None]]
+
+
+class SyncPipeline:
+    """
+    Executa busca → normalização → gravação como três tarefas asyncio ligadas
+    por filas limitadas (`queue_size` páginas cada), sobrepondo rede e banco:
+    enquanto o escritor grava a página N, a N+1 é normalizada e as seguintes
+    são baixadas. Filas cheias seguram o estágio anterior (backpressure), então
+    a memória fica limitada a ~2 × queue_size páginas.
+
+    As páginas chegam ao escritor na ordem, o que preserva o checkpoint por
+    página. Um erro na busca deixa as páginas já baixadas serem gravadas antes
+    de ser propagado (o checkpoint fica na última página completa); um erro na
+    normalização ou gravação cancela os demais estágios e é propagado.
+    Cada estágio contabiliza páginas, registros, tempo ocupado e tempo de espera.
+    """
+
+    STAGES = ("busca", "normalizacao", "gravacao")
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = max(1, queue_size or settings.SYNC_PIPELINE_QUEUE_SIZE)
+        self._fetch_error: Optional[BaseException] = None
+        self.counters: Dict[str, Dict[str, float]] = {
+            stage: {"paginas": 0, "registros": 0, "ocupado_s": 0.0, "espera_s": 0.0}
+            for stage in self.STAGES
+        }
+
+    async def run(self, pages: AsyncIterator[Page], normalize: NormalizeFn, write: WriteFn) -> Dict[str, Any]:
+        """
+        `pages` gera (página, registros); `normalize(registros)` devolve as linhas;
+        `write(página, linhas, registros_recebidos)` grava uma página.
+        Retorna o relatório dos estágios.
+        """
+        brutos: asyncio.Queue = asyncio.Queue(self.queue_size)
+        prontos: asyncio.Queue = asyncio.Queue(self.queue_size)
+        inicio = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._fetch(pages, brutos)),
+            asyncio.create_task(self._normalize(brutos, prontos, normalize)),
+            asyncio.create_task(self._write(prontos, write)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        if self._fetch_error is not None:
+            raise self._fetch_error
+        return self.report(time.perf_counter() - inicio)
+
+    async def _put(self, stage: str, queue: asyncio.Queue, item: Any) -> None:
+        t = time.perf_counter()
+        await queue.put(item)
+        self.counters[stage]["espera_s"] += time.perf_counter() - t
+
+    async def _get(self, stage: str, queue: asyncio.Queue) -> Any:
+        t = time.perf_counter()
+        item = await queue.get()
+        self.counters[stage]["espera_s"] += time.perf_counter() - t
+        return item
+
+    async def _fetch(self, pages: AsyncIterator[Page], saida: asyncio.Queue) -> None:
+        c = self.counters["busca"]
+        try:
+            t = time.perf_counter()
+            async for page, items in pages:
+                c["ocupado_s"] += time.perf_counter() - t
+                c["paginas"] += 1
+                c["registros"] += len(items)
+                await self._put("busca", saida, (page, items))
+                t = time.perf_counter()
+            c["ocupado_s"] += time.perf_counter() - t
+        except Exception as e:
+            # Encerra a fila normalmente: o que já foi baixado ainda é gravado
+            self._fetch_error = e
+        finally:
+            aclose = getattr(pages, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        await saida.put(_FIM)
+
+    async def _normalize(self, entrada: asyncio.Queue, saida: asyncio.Queue, normalize: NormalizeFn) -> None:
+        c = self.counters["normalizacao"]
+        while True:
+            item = await self._get("normalizacao", entrada)
+            if item is _FIM:
+                await saida.put(_FIM)
+                return
+            page, items = item
+            t = time.perf_counter()
+            rows = await normalize(items)
+            c["ocupado_s"] += time.perf_counter() - t
+            c["paginas"] += 1
+            c["registros"] += len(rows)
+            await self._put("normalizacao", saida, (page, rows, len(items)))
+
+    async def _write(self, entrada: asyncio.Queue, write: WriteFn) -> None:
+        c = self.counters["gravacao"]
+        while True:
+            item = await self._get("gravacao", entrada)
+            if item is _FIM:
+                return
+            page, rows, recebidos = item
+            t = time.perf_counter()
+            await write(page, rows, recebidos)
+            c["ocupado_s"] += time.perf_counter() - t
+            c["paginas"] += 1
+            c["registros"] += len(rows)
+
+    def report(self, segundos: float) -> Dict[str, Any]:
+        relatorio: Dict[str, Any] = {"segundos": round(segundos, 3), "fila": self.queue_size}
+        for stage, c in self.counters.items():
+            relatorio[stage] = {
+                "paginas": c["paginas"],
+                "registros": c["registros"],
+                "ocupado_s": round(c["ocupado_s"], 3),
+                "espera_s": round(c["espera_s"], 3),
+                "registros_por_segundo": round(c["registros"] / c["ocupado_s"], 1) if c["ocupado_s"] else None,
+            }
+        return relatorio
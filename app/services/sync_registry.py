@@ -0,0 +1,61 @@
+# app/services/sync_registry.py
+from typing import Dict, Optional, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.registry import ENTITIES, MODELS, EntitySpec
+from app.services.base_sync import BaseSyncService
+from app.services.sync_aluno import SyncAlunoService
+
+
+def build_service(spec: EntitySpec) -> Type[BaseSyncService]:
+    """Serviço de sincronização derivado da spec: mesmo caminho em lote/streaming de alunos."""
+    nome = "Sync" + spec.class_name[2:] + "Service"  # LYTurma -> SyncTurmaService
+    return type(nome, (BaseSyncService,), {
+        "__module__": __name__,
+        "__doc__": f"Sincronização de {spec.comment}, gerada a partir do registro.",
+        "MODEL": MODELS[spec.endpoint],
+        "API_ENDPOINT_METHOD": f"get_all_{spec.endpoint}",
+        "API_ENDPOINT": spec.endpoint,
+        "UNIQUE_FIELD": spec.key[0] if len(spec.key) == 1 else spec.key,
+        "WATERMARK_FIELD": spec.watermark_field,
+        "WATERMARK_PARAM": spec.watermark_param,
+        "DEPENDS_ON": spec.depends_on,
+        "FIELD_MAP": dict(spec.field_map),
+        "CONVERTERS": dict(spec.converters),
+    })
+
+
+# Endpoint (chave de LyceumAPIClient.ENDPOINTS) -> serviço
+SYNC_SERVICES: Dict[str, Type[BaseSyncService]] = {
+    SyncAlunoService.API_ENDPOINT: SyncAlunoService,
+    **{spec.endpoint: build_service(spec) for spec in ENTITIES},
+}
+globals().update({service.__name__: service for service in SYNC_SERVICES.values()})
+
+
+def get_sync_service(entidade: str) -> Type[BaseSyncService]:
+    try:
+        return SYNC_SERVICES[entidade]
+    except KeyError:
+        raise ValueError(f"Entidade sem sincronização registrada: {entidade}") from None
+
+
+async def diff_entity(db: AsyncSession, entidade: str, sample: Optional[int] = None) -> Dict:
+    """Dry-run da carga completa da entidade (`BaseSyncService.dry_run`)."""
+    return await get_sync_service(entidade)(db).dry_run(sample=sample)
+
+
+async def sync_entity(
+    db: AsyncSession,
+    entidade: str,
+    incremental: bool = False,
+    streaming: Optional[bool] = None,
+    resume: bool = False,
+    staging: Optional[bool] = None,
+    job_id: Optional[str] = None,
+) -> Dict:
+    service = get_sync_service(entidade)(db)
+    return await service.sync_all(
+        incremental=incremental, streaming=streaming, resume=resume, staging=staging, job_id=job_id
+    )
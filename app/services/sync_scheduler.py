@@ -0,0 +1,134 @@
+# app/services/sync_scheduler.py
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.sync_job import SyncJob
+from app.services.sync_jobs import FINAL_STATUSES, run_in_background, start_job
+from app.services.sync_registry import SYNC_SERVICES, sync_entity
+
+logger = logging.getLogger(__name__)
+
+# entidade -> (intervalo incremental, intervalo da carga completa), em segundos
+Cadences = Dict[str, Tuple[float, float]]
+
+
+def cadences_from_settings() -> Cadences:
+    """
+    Cadência de cada entidade registrada: SYNC_SCHEDULE_INCREMENTAL_SECONDS /
+    SYNC_SCHEDULE_FULL_SECONDS, com exceções por entidade em
+    SYNC_SCHEDULE_INTERVALS / SYNC_SCHEDULE_FULL_INTERVALS (0 desliga).
+    """
+    cadencias: Cadences = {}
+    for entidade in SYNC_SERVICES:
+        incremental = settings.SYNC_SCHEDULE_INTERVALS.get(entidade, settings.SYNC_SCHEDULE_INCREMENTAL_SECONDS)
+        completa = settings.SYNC_SCHEDULE_FULL_INTERVALS.get(entidade, settings.SYNC_SCHEDULE_FULL_SECONDS)
+        if incremental > 0:
+            cadencias[entidade] = (incremental, completa)
+    return cadencias
+
+
+class SyncScheduler:
+    """
+    Agendador em processo (iniciado no lifespan da aplicação): um laço asyncio
+    por entidade roda uma sincronização incremental a cada intervalo (± jitter,
+    para réplicas e entidades não baterem no Lyceum ao mesmo tempo) e uma
+    carga completa quando a última concluída (em `sync_job`, mesmo com erros
+    de registro) é mais antiga que o intervalo da carga completa – ou nunca
+    houve uma. Depois de uma carga completa que falhou (erro/interrompido) a
+    próxima espera ao menos SYNC_SCHEDULE_FULL_RETRY_SECONDS: uma falha
+    persistente não vira uma carga completa contra o Lyceum a cada rodada.
+
+    Cada execução passa pelo single-flight de `start_job`: se já há uma
+    sincronização da entidade em andamento (gatilho manual, outra réplica ou
+    a execução anterior), a rodada é pulada. No máximo
+    SYNC_SCHEDULER_MAX_CONCURRENT entidades sincronizam ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        cadences: Optional[Cadences] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        jitter: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+    ):
+        self.cadences = cadences if cadences is not None else cadences_from_settings()
+        self.session_factory = session_factory
+        self.jitter = settings.SYNC_SCHEDULE_JITTER if jitter is None else jitter
+        self._slots = asyncio.Semaphore(max_concurrent or settings.SYNC_SCHEDULER_MAX_CONCURRENT)
+        self._tasks: List[asyncio.Task] = []
+        self.counters: Dict[str, Dict[str, int]] = {
+            entidade: {"incrementais": 0, "completas": 0, "puladas": 0, "erros": 0} for entidade in self.cadences
+        }
+
+    def _with_jitter(self, segundos: float) -> float:
+        return max(0.0, segundos * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def start(self) -> None:
+        for entidade in self.cadences:
+            self._tasks.append(asyncio.create_task(self._loop(entidade), name=f"sync-scheduler-{entidade}"))
+        logger.info(f"⏰ Agendador de sincronização iniciado: {self.cadences}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("⏰ Agendador de sincronização encerrado")
+
+    async def _loop(self, entidade: str) -> None:
+        intervalo, _ = self.cadences[entidade]
+        # Primeira rodada espalhada dentro da janela de jitter
+        await asyncio.sleep(random.uniform(0, intervalo * self.jitter))
+        while True:
+            try:
+                await self.run_once(entidade)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters[entidade]["erros"] += 1
+                logger.error(f"❌ Rodada agendada de {entidade} falhou: {e}")
+            await asyncio.sleep(self._with_jitter(intervalo))
+
+    async def _full_due(self, db: AsyncSession, entidade: str) -> bool:
+        _, completa = self.cadences[entidade]
+        concluida, tentativa = (await db.execute(
+            select(
+                func.max(SyncJob.concluido_em).filter(SyncJob.status.in_(("concluido", "concluido_com_erros"))),
+                func.max(SyncJob.concluido_em),
+            )
+            .where(SyncJob.entidade == entidade, SyncJob.incremental.is_(False), SyncJob.status.in_(FINAL_STATUSES))
+        )).one()
+        agora = datetime.now()
+        if concluida is not None and agora - concluida < timedelta(seconds=completa):
+            return False
+        # A última tentativa falhou: espera antes de repetir a carga completa
+        espera = min(completa, settings.SYNC_SCHEDULE_FULL_RETRY_SECONDS)
+        return tentativa is None or tentativa == concluida or agora - tentativa >= timedelta(seconds=espera)
+
+    async def run_once(self, entidade: str) -> Optional[str]:
+        """Uma rodada: decide incremental/completa e executa; None se pulada."""
+        async with self._slots:
+            async with self.session_factory() as db:
+                incremental = not await self._full_due(db, entidade)
+                job_id, lock = await start_job(db, entidade, incremental=incremental, engine=db.bind)
+            if lock is None:
+                self.counters[entidade]["puladas"] += 1
+                logger.info(f"⏭️ Rodada agendada de {entidade} pulada: execução anterior ainda ativa ({job_id})")
+                return None
+            self.counters[entidade]["incrementais" if incremental else "completas"] += 1
+            logger.info(f"⏰ Sincronização agendada de {entidade} (incremental={incremental}, job {job_id})")
+            await run_in_background(
+                job_id,
+                lambda session: sync_entity(session, entidade, incremental=incremental, job_id=job_id),
+                lock,
+                session_factory=self.session_factory,
+            )
+            return job_id
@@ -0,0 +1,362 @@
+# app/services/sync_shards.py
+"""
+Carga completa distribuída entre workers (processos ou nós) por uma tabela de leases.
+
+`plan_sharded_job` divide a carga de uma entidade em faixas de páginas
+(`sync_shard`, SYNC_SHARD_PAGES páginas cada; a última vai até a página vazia).
+Cada `ShardWorker` reivindica uma faixa livre com `SELECT ... FOR UPDATE SKIP
+LOCKED` – workers concorrentes nunca esperam nem pegam a mesma faixa – e a
+grava página a página; cada commit renova o lease (heartbeat) e registra a
+última página gravada. Lease expirado (worker morto) torna a faixa
+reivindicável de novo, retomando da página seguinte. Faixa que falhou volta
+a "pendente" só depois de uma espera exponencial (`proxima_tentativa`) e vira
+"erro" após SYNC_SHARD_MAX_ATTEMPTS tentativas. O worker que conclui a
+última faixa agrega as estatísticas, avança a marca d'água, faz a varredura
+da geração e encerra o job.
+"""
+import logging
+import math
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.sync_job import SyncJob
+from app.models.sync_shard import SyncShard
+from app.services.bulk_upsert import GENERATION_COLUMN, next_generation
+from app.services.lyceum_api import LyceumAPIClientReadOnly, LyceumAPIError
+from app.services.sync_jobs import SyncJobTracker, start_job
+from app.services.sync_registry import get_sync_service
+
+logger = logging.getLogger(__name__)
+
+SHARD_FINAL_STATUSES = ("concluido", "erro")
+SHARD_COUNTERS = (
+    "total_api", "inseridos", "atualizados", "ignorados", "inalterados", "erros", "lotes_com_erro", "paginas",
+)
+
+
+def _claimable(agora: datetime):
+    """Faixa livre (pendente e fora da espera, ou com lease vencido) de um job ainda em andamento."""
+    return and_(
+        or_(
+            and_(
+                SyncShard.status == "pendente",
+                or_(SyncShard.proxima_tentativa.is_(None), SyncShard.proxima_tentativa <= agora),
+            ),
+            and_(SyncShard.status == "em_andamento", SyncShard.lease_ate < agora),
+        ),
+        SyncShard.job_id.in_(select(SyncJob.id).where(SyncJob.status == "em_andamento")),
+    )
+
+
+async def plan_sharded_job(
+    db: AsyncSession,
+    entidade: str,
+    pages_per_shard: Optional[int] = None,
+    engine: Optional[AsyncEngine] = None,
+) -> Tuple[Optional[str], bool]:
+    """
+    Cria um job de carga completa em modo "shards" e suas faixas pendentes.
+    Passa pelo single-flight de `start_job`: com outra sincronização da
+    entidade ativa devolve (id dela, False). O número de faixas sai do total
+    estimado (última carga completa ou tabela local); sem estimativa (primeira
+    carga) as páginas são contadas sondando a API (`count_pages`).
+    Levanta LyceumAPIError se a sondagem falhar (o job fica com status "erro").
+    """
+    service_cls = get_sync_service(entidade)
+    model = service_cls.MODEL
+    job_id, lock = await start_job(db, entidade, incremental=False, engine=engine)
+    if lock is None:
+        return job_id, False
+    try:
+        por_faixa = pages_per_shard or settings.SYNC_SHARD_PAGES
+        total = await SyncJobTracker._estimate_total(db, model, entidade)
+        if total:
+            paginas = math.ceil(total / settings.LYCEUM_API_PAGE_SIZE)
+        else:
+            # Primeira carga: sem estimativa, uma única faixa não distribuiria nada
+            api_client = LyceumAPIClientReadOnly()
+            try:
+                paginas = await api_client.count_pages(api_client.ENDPOINTS[service_cls.API_ENDPOINT])
+            except LyceumAPIError as e:
+                await db.execute(
+                    update(SyncJob).where(SyncJob.id == job_id)
+                    .values(status="erro", erro=f"Contagem de páginas falhou: {e}", concluido_em=datetime.now())
+                )
+                await db.commit()
+                raise
+            total = paginas * settings.LYCEUM_API_PAGE_SIZE or None
+        faixas = max(1, math.ceil(paginas / por_faixa))
+        geracao = None
+        if settings.SYNC_MARK_SWEEP and GENERATION_COLUMN in model.__table__.c:
+            geracao = await next_generation(db, model)
+        for i in range(faixas):
+            db.add(SyncShard(
+                job_id=job_id,
+                entidade=entidade,
+                pagina_inicial=i * por_faixa,
+                pagina_final=None if i == faixas - 1 else (i + 1) * por_faixa,
+                geracao=geracao,
+                status="pendente",
+                tentativas=0,
+            ))
+        await db.execute(
+            update(SyncJob)
+            .where(SyncJob.id == job_id)
+            .values(status="em_andamento", modo="shards", total_estimado=total, iniciado_em=datetime.now())
+        )
+        await db.commit()
+    finally:
+        # Daqui em diante a vida do job é medida pelos leases das faixas
+        await lock.release()
+    logger.info(f"🧩 Job {job_id} ({entidade}) dividido em {faixas} faixas de {por_faixa} páginas")
+    return job_id, True
+
+
+class ShardWorker:
+    """
+    Worker de faixas: reivindica, grava e conclui faixas até não haver mais
+    nenhuma livre (opcionalmente só de `entidade`). Pode rodar no processo da
+    API (BackgroundTask) ou em quantos processos/nós houver
+    (scripts/sync_worker.py), todos contra o mesmo banco.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        entidade: Optional[str] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        lease_seconds: Optional[float] = None,
+    ):
+        self.id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.entidade = entidade
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.SYNC_SHARD_LEASE_SECONDS
+        self.counters = {"faixas": 0, "paginas": 0, "perdidas": 0, "erros": 0}
+
+    def _lease(self) -> datetime:
+        return datetime.now() + timedelta(seconds=self.lease_seconds)
+
+    @staticmethod
+    def _retry_at(tentativas: int) -> datetime:
+        """Próxima reivindicação de uma faixa que falhou: espera exponencial, com teto."""
+        espera = min(
+            settings.SYNC_SHARD_RETRY_MAX_SECONDS,
+            settings.SYNC_SHARD_RETRY_SECONDS * 2 ** max(0, tentativas - 1),
+        )
+        return datetime.now() + timedelta(seconds=espera)
+
+    async def run(self, max_shards: Optional[int] = None) -> Dict[str, int]:
+        """Processa faixas até esgotar as livres (ou `max_shards`); retorna os contadores."""
+        while max_shards is None or self.counters["faixas"] < max_shards:
+            async with self.session_factory() as db:
+                await self._fail_exhausted(db)
+                shard = await self.claim(db)
+            if shard is None:
+                break
+            await self._process(shard)
+        return self.counters
+
+    async def claim(self, db: AsyncSession) -> Optional[SyncShard]:
+        """Reivindica a próxima faixa livre (FOR UPDATE SKIP LOCKED + compare-and-set)."""
+        while True:
+            agora = datetime.now()
+            candidata = (
+                select(SyncShard.id)
+                .where(_claimable(agora))
+                .order_by(SyncShard.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if self.entidade:
+                candidata = candidata.where(SyncShard.entidade == self.entidade)
+            shard_id = await db.scalar(candidata)
+            if shard_id is None:
+                await db.rollback()
+                return None
+            # A condição repetida no UPDATE cobre bancos sem SKIP LOCKED (SQLite)
+            result = await db.execute(
+                update(SyncShard)
+                .where(SyncShard.id == shard_id, _claimable(agora))
+                .values(status="em_andamento", worker=self.id, lease_ate=self._lease(),
+                        tentativas=SyncShard.tentativas + 1)
+            )
+            await db.commit()
+            if result.rowcount == 1:
+                shard = await db.get(SyncShard, shard_id, populate_existing=True)
+                logger.info(
+                    f"🧩 Worker {self.id} reivindicou a faixa {shard.pagina_inicial}-{shard.pagina_final} "
+                    f"de {shard.entidade} (tentativa {shard.tentativas})"
+                )
+                return shard
+
+    async def _fail_exhausted(self, db: AsyncSession) -> None:
+        """Faixas com lease vencido após SYNC_SHARD_MAX_ATTEMPTS tentativas viram "erro"."""
+        agora = datetime.now()
+        esgotadas = and_(
+            SyncShard.status == "em_andamento",
+            SyncShard.lease_ate < agora,
+            SyncShard.tentativas >= settings.SYNC_SHARD_MAX_ATTEMPTS,
+        )
+        jobs = (await db.execute(select(SyncShard.job_id).where(esgotadas).distinct())).scalars().all()
+        if not jobs:
+            return
+        await db.execute(
+            update(SyncShard).where(esgotadas)
+            .values(status="erro", lease_ate=None, erro="Lease vencido após o limite de tentativas")
+        )
+        await db.commit()
+        for job_id in jobs:
+            await self._finalize(db, job_id)
+
+    async def _heartbeat(self, db: AsyncSession, shard_id: int, **valores: Any) -> bool:
+        """Renova o lease na transação corrente; False se a faixa não é mais deste worker."""
+        result = await db.execute(
+            update(SyncShard)
+            .where(SyncShard.id == shard_id, SyncShard.worker == self.id, SyncShard.status == "em_andamento")
+            .values(**{"lease_ate": self._lease(), **valores})
+        )
+        return result.rowcount == 1
+
+    async def _process(self, shard: SyncShard) -> None:
+        async with self.session_factory() as db:
+            service = get_sync_service(shard.entidade)(db)
+            service._generation = shard.geracao
+            service._max_watermark = shard.watermark
+            stats = {c: 0 for c in SHARD_COUNTERS}
+            stats.update(shard.estatisticas or {})
+            inicio = shard.pagina_inicial if shard.ultima_pagina is None else shard.ultima_pagina + 1
+            endpoint = service.api_client.ENDPOINTS[service.API_ENDPOINT]
+            try:
+                async for page, items in service.api_client.iter_pages(
+                    endpoint, page_start=inicio, page_end=shard.pagina_final
+                ):
+                    stats["total_api"] += len(items)
+                    stats["paginas"] += 1
+                    rows = await service._normalize_items(items, stats, False, {})
+                    await service._write_rows(rows, stats)
+                    # Página, checkpoint da faixa, lease e progresso do job no mesmo commit
+                    if not await self._heartbeat(
+                        db, shard.id, ultima_pagina=page, watermark=service._max_watermark, estatisticas=dict(stats)
+                    ):
+                        await db.rollback()
+                        self.counters["perdidas"] += 1
+                        logger.warning(f"⚠️ Worker {self.id} perdeu o lease da faixa {shard.id}: abandonando")
+                        return
+                    await db.execute(
+                        update(SyncJob).where(SyncJob.id == shard.job_id).values(
+                            paginas=SyncJob.paginas + 1, registros=SyncJob.registros + len(items),
+                        )
+                    )
+                    await db.commit()
+                    db.expunge_all()
+                    self.counters["paginas"] += 1
+                if not await self._heartbeat(db, shard.id, status="concluido", lease_ate=None):
+                    await db.rollback()
+                    self.counters["perdidas"] += 1
+                    return
+                await db.commit()
+            except (LyceumAPIError, SQLAlchemyError) as e:
+                await db.rollback()
+                self.counters["erros"] += 1
+                status = "erro" if shard.tentativas >= settings.SYNC_SHARD_MAX_ATTEMPTS else "pendente"
+                proxima = self._retry_at(shard.tentativas) if status == "pendente" else None
+                espera = f", nova tentativa a partir de {proxima:%H:%M:%S}" if proxima else ""
+                logger.error(
+                    f"❌ Faixa {shard.id} de {shard.entidade} falhou na tentativa {shard.tentativas} ({status}{espera}): {e}"
+                )
+                await db.execute(
+                    update(SyncShard)
+                    .where(SyncShard.id == shard.id, SyncShard.worker == self.id)
+                    .values(status=status, worker=None, lease_ate=None, erro=str(e), proxima_tentativa=proxima)
+                )
+                await db.commit()
+                if status == "pendente":
+                    return
+            else:
+                self.counters["faixas"] += 1
+                logger.info(f"✅ Faixa {shard.id} de {shard.entidade} concluída: {stats}")
+            await self._finalize(db, shard.job_id)
+
+    async def _finalize(self, db: AsyncSession, job_id: str) -> None:
+        """
+        Encerra o job quando todas as faixas terminaram. Só um worker vence a
+        transição em_andamento -> finalizando; os demais saem sem fazer nada.
+        """
+        restantes = await db.scalar(
+            select(func.count()).select_from(SyncShard)
+            .where(SyncShard.job_id == job_id, SyncShard.status.notin_(SHARD_FINAL_STATUSES))
+        )
+        if restantes:
+            return
+        result = await db.execute(
+            update(SyncJob)
+            .where(SyncJob.id == job_id, SyncJob.status == "em_andamento")
+            .values(status="finalizando")
+        )
+        await db.commit()
+        if result.rowcount != 1:
+            return
+
+        shards: List[SyncShard] = (await db.execute(
+            select(SyncShard).where(SyncShard.job_id == job_id).order_by(SyncShard.pagina_inicial)
+        )).scalars().all()
+        job = await db.get(SyncJob, job_id)
+        stats: Dict[str, Any] = {c: 0 for c in SHARD_COUNTERS}
+        for shard in shards:
+            for c in SHARD_COUNTERS:
+                stats[c] += (shard.estatisticas or {}).get(c, 0)
+        falhas = [s for s in shards if s.status == "erro"]
+        stats.update(shards=len(shards), faixas_com_erro=len(falhas), removidos_origem=0, job_id=job_id)
+
+        service = get_sync_service(job.entidade)(db)
+        erro = None
+        try:
+            if falhas:
+                erro = "; ".join(f"faixa {s.pagina_inicial}-{s.pagina_final}: {s.erro}" for s in falhas)
+                # Faixas perdidas não carimbaram a geração: a varredura deve ser pulada
+                stats["erros"] += len(falhas)
+            elif not (stats["erros"] or stats["lotes_com_erro"]):
+                service._max_watermark = max((s.watermark for s in shards if s.watermark), default=None)
+                await service._save_watermark(stats)
+            service._generation = shards[0].geracao
+            await service._sweep(stats)
+            processados = stats["inseridos"] + stats["atualizados"] + stats["inalterados"] + stats["ignorados"]
+            agora = datetime.now()
+            segundos = (agora - job.iniciado_em).total_seconds() if job.iniciado_em else 0
+            status = "concluido_com_erros" if stats["erros"] or stats["lotes_com_erro"] else "concluido"
+            await db.execute(
+                update(SyncJob)
+                .where(SyncJob.id == job_id, SyncJob.status == "finalizando")
+                .values(
+                    status=status,
+                    paginas=stats["paginas"],
+                    registros=stats["total_api"],
+                    processados=processados,
+                    erros=stats["erros"],
+                    registros_por_segundo=round(processados / segundos, 1) if segundos > 0 and processados else None,
+                    eta_segundos=0 if status == "concluido" else None,
+                    estatisticas=stats,
+                    erro=erro,
+                    concluido_em=agora,
+                )
+            )
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"❌ Erro ao finalizar o job {job_id}: {e}")
+            await db.execute(
+                update(SyncJob).where(SyncJob.id == job_id)
+                .values(status="erro", erro=str(e), concluido_em=datetime.now())
+            )
+            await db.commit()
+            return
+        logger.info(f"🏁 Job {job_id} ({job.entidade}, {len(shards)} faixas) finalizado: {status}")
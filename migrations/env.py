@@ -10,7 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.config import settings
 from app.core.database import Base
-from app.models import LYAluno  # importe todos os modelos aqui
+import app.models  # noqa: F401 – registra todos os modelos (inclusive os do registro) no metadata
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.SYNC_DATABASE_URL)
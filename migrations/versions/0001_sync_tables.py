@@ -0,0 +1,180 @@
+"""tabelas de controle do sync e colunas de controle em ly_aluno
+
+Cria sync_checkpoint, sync_watermark, sync_job e sync_shard e acrescenta a
+ly_aluno as colunas hash_conteudo, geracao_sync, removido_origem e
+data_remocao_origem. Em bancos novos (sem ly_aluno) a tabela é criada
+completa; em bancos existentes só as colunas que faltam são adicionadas.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 05:40:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _colunas_controle() -> list:
+    """Colunas de controle do sync em ly_aluno (objetos novos a cada chamada)."""
+    return [
+        sa.Column('hash_conteudo', sa.String(length=64), nullable=True, comment='SHA-256 do registro normalizado (sem campos de controle)'),
+        sa.Column('geracao_sync', sa.Integer(), nullable=True, comment='Geração da última carga completa que trouxe o registro'),
+        sa.Column('removido_origem', sa.Boolean(), server_default=sa.false(), nullable=False, comment='Registro não existe mais no Lyceum'),
+        sa.Column('data_remocao_origem', sa.DateTime(), nullable=True, comment='Data em que o registro foi marcado como removido na origem'),
+    ]
+
+
+def upgrade() -> None:
+    # No modo offline (--sql) não há conexão para inspecionar: assume a
+    # ly_aluno existente, como nas instalações anteriores a esta revisão.
+    inspector = None if context.is_offline_mode() else sa.inspect(op.get_bind())
+    if inspector is not None and not inspector.has_table('ly_aluno'):
+        op.create_table('ly_aluno',
+        sa.Column('aluno', sa.String(length=50), nullable=False, comment='Matrícula do aluno'),
+        sa.Column('ano_ingresso', sa.Integer(), nullable=True, comment='Ano de ingresso'),
+        sa.Column('anoconcl2g', sa.Integer(), nullable=True, comment='Ano conclusão 2º grau'),
+        sa.Column('areacnpq', sa.String(length=100), nullable=True, comment='Área CNPQ'),
+        sa.Column('candidato', sa.String(length=100), nullable=True, comment='Candidato'),
+        sa.Column('cidade2g', sa.String(length=100), nullable=True, comment='Cidade 2º grau'),
+        sa.Column('classif_aluno', sa.String(length=50), nullable=True, comment='Classificação do aluno'),
+        sa.Column('cod_cartao', sa.String(length=50), nullable=True, comment='Código do cartão'),
+        sa.Column('concurso', sa.String(length=100), nullable=True, comment='Concurso'),
+        sa.Column('cred_educativo', sa.String(length=10), nullable=True, comment='Crédito educativo'),
+        sa.Column('creditos', sa.Integer(), nullable=True, comment='Créditos acumulados'),
+        sa.Column('curriculo', sa.String(length=100), nullable=True, comment='Currículo'),
+        sa.Column('curso', sa.String(length=100), nullable=True, comment='Curso'),
+        sa.Column('curso_ant', sa.String(length=100), nullable=True, comment='Curso anterior'),
+        sa.Column('discipoutraserie', sa.String(length=10), nullable=True, comment='Disciplina outra série'),
+        sa.Column('dist_aluno_unidade', sa.Integer(), nullable=True, comment='Distância aluno-unidade'),
+        sa.Column('dt_ingresso', sa.DateTime(), nullable=True, comment='Data de ingresso'),
+        sa.Column('e_mail_interno', sa.String(length=200), nullable=True, comment='E-mail interno'),
+        sa.Column('faculdade_conveniada', sa.String(length=200), nullable=True, comment='Faculdade conveniada'),
+        sa.Column('grupo', sa.String(length=100), nullable=True, comment='Grupo'),
+        sa.Column('instituicao', sa.String(length=200), nullable=True, comment='Instituição'),
+        sa.Column('nome_abrev', sa.String(length=100), nullable=True, comment='Nome abreviado'),
+        sa.Column('nome_compl', sa.String(length=200), nullable=True, comment='Nome completo'),
+        sa.Column('nome_conjuge', sa.String(length=200), nullable=True, comment='Nome do cônjuge'),
+        sa.Column('nome_social', sa.String(length=200), nullable=True, comment='Nome social'),
+        sa.Column('num_chamada', sa.Integer(), nullable=True, comment='Número de chamada'),
+        sa.Column('obs_aluno_finan', sa.Text(), nullable=True, comment='Observações financeiras'),
+        sa.Column('obs_tel_com', sa.Text(), nullable=True, comment='Observações telefone comercial'),
+        sa.Column('obs_tel_res', sa.Text(), nullable=True, comment='Observações telefone residencial'),
+        sa.Column('outra_faculdade', sa.String(length=200), nullable=True, comment='Outra faculdade'),
+        sa.Column('pais2g', sa.String(length=100), nullable=True, comment='País 2º grau'),
+        sa.Column('pessoa', sa.Integer(), nullable=True, comment='Código pessoa'),
+        sa.Column('ref_aluno_ant', sa.String(length=100), nullable=True, comment='Referência aluno anterior'),
+        sa.Column('representante_turma', sa.String(length=1), nullable=True, comment='Representante de turma (S/N)'),
+        sa.Column('sem_ingresso', sa.Integer(), nullable=True, comment='Semestre de ingresso'),
+        sa.Column('serie', sa.Integer(), nullable=True, comment='Série'),
+        sa.Column('sit_aluno', sa.String(length=50), nullable=True, comment='Situação do aluno'),
+        sa.Column('sit_aprov', sa.String(length=50), nullable=True, comment='Situação aprovação'),
+        sa.Column('stamp_atualizacao', sa.String(length=50), nullable=True, comment='Timestamp atualização'),
+        sa.Column('tipo_aluno', sa.String(length=50), nullable=True, comment='Tipo de aluno'),
+        sa.Column('tipo_escola', sa.String(length=100), nullable=True, comment='Tipo de escola'),
+        sa.Column('tipo_ingresso', sa.String(length=100), nullable=True, comment='Tipo de ingresso'),
+        sa.Column('turma_pref', sa.String(length=50), nullable=True, comment='Turma preferencial'),
+        sa.Column('turno', sa.String(length=50), nullable=True, comment='Turno'),
+        sa.Column('unidade_ensino', sa.String(length=100), nullable=True, comment='Unidade de ensino'),
+        sa.Column('unidade_fisica', sa.String(length=100), nullable=True, comment='Unidade física'),
+        sa.Column('data_sincronizacao', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Data da última sincronização'),
+        sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Data de criação no sistema'),
+        sa.Column('data_atualizacao', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Data da última atualização'),
+        sa.Column('sincronizado', sa.Boolean(), nullable=False, comment='Sincronizado com sucesso'),
+        *_colunas_controle(),
+        sa.PrimaryKeyConstraint('aluno')
+        )
+        op.create_index(op.f('ix_ly_aluno_aluno'), 'ly_aluno', ['aluno'], unique=False)
+    else:
+        existentes = {coluna['name'] for coluna in inspector.get_columns('ly_aluno')} if inspector else set()
+        for coluna in _colunas_controle():
+            if coluna.name not in existentes:
+                op.add_column('ly_aluno', coluna)
+
+    op.create_table('sync_checkpoint',
+    sa.Column('endpoint', sa.String(length=50), nullable=False, comment='Chave do endpoint em LyceumAPIClient.ENDPOINTS'),
+    sa.Column('run_id', sa.String(length=36), nullable=False, comment='Identificador da execução'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='em_andamento, interrompido ou concluido'),
+    sa.Column('incremental', sa.Boolean(), nullable=False, comment='Execução incremental'),
+    sa.Column('parametros', sa.JSON(), nullable=True, comment="Filtros enviados à API (ex.: marca d'água)"),
+    sa.Column('ultima_pagina', sa.Integer(), nullable=True, comment='Última página gravada com sucesso'),
+    sa.Column('geracao', sa.Integer(), nullable=True, comment='Geração da carga completa (mark-and-sweep)'),
+    sa.Column('registros', sa.Integer(), nullable=False, comment='Registros recebidos até o checkpoint'),
+    sa.Column('iniciado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Início da execução'),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Último checkpoint'),
+    sa.PrimaryKeyConstraint('endpoint')
+    )
+    op.create_table('sync_watermark',
+    sa.Column('entidade', sa.String(length=50), nullable=False, comment='Chave do endpoint em LyceumAPIClient.ENDPOINTS'),
+    sa.Column('campo', sa.String(length=100), nullable=False, comment="Campo da API usado como marca d'água"),
+    sa.Column('valor', sa.String(length=100), nullable=False, comment='Maior valor sincronizado com sucesso'),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Data da última atualização'),
+    sa.PrimaryKeyConstraint('entidade')
+    )
+    op.create_table('sync_job',
+    sa.Column('id', sa.String(length=36), nullable=False, comment='Identificador do job'),
+    sa.Column('entidade', sa.String(length=50), nullable=False, comment='Chave do endpoint em LyceumAPIClient.ENDPOINTS'),
+    sa.Column('run_id', sa.String(length=36), nullable=True, comment='Execução do checkpoint (streaming)'),
+    sa.Column('status', sa.String(length=30), nullable=False, comment='pendente, em_andamento, concluido, concluido_com_erros, interrompido ou erro'),
+    sa.Column('modo', sa.String(length=20), nullable=True, comment='lista, streaming ou staging'),
+    sa.Column('incremental', sa.Boolean(), nullable=False, comment='Execução incremental'),
+    sa.Column('retomado', sa.Boolean(), nullable=False, comment='Retomada a partir do checkpoint'),
+    sa.Column('paginas', sa.Integer(), nullable=False, comment='Páginas recebidas da API'),
+    sa.Column('registros', sa.Integer(), nullable=False, comment='Registros recebidos da API'),
+    sa.Column('processados', sa.Integer(), nullable=False, comment='Registros gravados, inalterados ou ignorados'),
+    sa.Column('erros', sa.Integer(), nullable=False, comment='Registros com erro'),
+    sa.Column('registros_por_segundo', sa.Float(), nullable=True, comment='Vazão de registros processados'),
+    sa.Column('total_estimado', sa.Integer(), nullable=True, comment='Total esperado (última carga completa ou tabela local)'),
+    sa.Column('eta_segundos', sa.Float(), nullable=True, comment='Tempo restante estimado'),
+    sa.Column('estatisticas', sa.JSON(), nullable=True, comment='Estatísticas finais retornadas por sync_all'),
+    sa.Column('erro', sa.Text(), nullable=True, comment='Mensagem do erro que encerrou o job'),
+    sa.Column('criado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Criação do job'),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True, comment='Início da execução'),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Último progresso'),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True, comment='Fim da execução'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_job_entidade'), 'sync_job', ['entidade'], unique=False)
+    op.create_table('sync_shard',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Identificador do shard'),
+    sa.Column('job_id', sa.String(length=36), nullable=False, comment='Job (sync_job) da carga distribuída'),
+    sa.Column('entidade', sa.String(length=50), nullable=False, comment='Chave do endpoint em LyceumAPIClient.ENDPOINTS'),
+    sa.Column('pagina_inicial', sa.Integer(), nullable=False, comment='Primeira página da faixa'),
+    sa.Column('pagina_final', sa.Integer(), nullable=True, comment='Página final (exclusiva); nula = até a página vazia'),
+    sa.Column('ultima_pagina', sa.Integer(), nullable=True, comment='Última página gravada (retomada após perda do lease)'),
+    sa.Column('geracao', sa.Integer(), nullable=True, comment='Geração da carga completa (mark-and-sweep)'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='pendente, em_andamento, concluido ou erro'),
+    sa.Column('worker', sa.String(length=100), nullable=True, comment='Worker dono do lease'),
+    sa.Column('lease_ate', sa.DateTime(), nullable=True, comment='Validade do lease; expirado pode ser reivindicado'),
+    sa.Column('tentativas', sa.Integer(), nullable=False, comment='Reivindicações do shard'),
+    sa.Column('proxima_tentativa', sa.DateTime(), nullable=True, comment='Após uma falha, não reivindicar antes desta data'),
+    sa.Column('watermark', sa.String(length=100), nullable=True, comment="Maior marca d'água vista na faixa"),
+    sa.Column('estatisticas', sa.JSON(), nullable=True, comment='Contadores do sync da faixa'),
+    sa.Column('erro', sa.Text(), nullable=True, comment='Último erro'),
+    sa.Column('atualizado_em', sa.DateTime(), server_default=sa.func.now(), nullable=False, comment='Último heartbeat'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_shard_job_id'), 'sync_shard', ['job_id'], unique=False)
+    op.create_index(op.f('ix_sync_shard_status'), 'sync_shard', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('sync_watermark')
+    op.drop_index(op.f('ix_sync_shard_status'), table_name='sync_shard')
+    op.drop_index(op.f('ix_sync_shard_job_id'), table_name='sync_shard')
+    op.drop_table('sync_shard')
+    op.drop_index(op.f('ix_sync_job_entidade'), table_name='sync_job')
+    op.drop_table('sync_job')
+    op.drop_table('sync_checkpoint')
+    # ly_aluno volta ao formato anterior; a tabela em si é preservada
+    with op.batch_alter_table('ly_aluno') as batch_op:
+        for coluna in reversed(_colunas_controle()):
+            batch_op.drop_column(coluna.name)
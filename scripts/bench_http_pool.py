@@ -0,0 +1,68 @@
+# scripts/bench_http_pool.py
+"""
+Benchmark: páginas/segundo com um httpx.AsyncClient por requisição (comportamento
+antigo) versus o pool compartilhado do LyceumAPIClient.
+
+    python scripts/bench_http_pool.py --paginas 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from scripts.fake_lyceum_server import FakeLyceumServer
+from app.core.config import settings
+from app.services import rate_limiter
+from app.services.lyceum_api import LyceumAPIClient
+
+ENDPOINT = LyceumAPIClient.ENDPOINTS["alunos"]
+
+
+async def paginas_cliente_por_requisicao(base_url: str, paginas: int) -> float:
+    inicio = time.perf_counter()
+    for page in range(paginas):
+        async with httpx.AsyncClient(timeout=settings.LYCEUM_API_TIMEOUT) as client:
+            resp = await client.get(f"{base_url}{ENDPOINT}", params={"page": page, "size": settings.LYCEUM_API_PAGE_SIZE})
+            resp.json()
+    return paginas / (time.perf_counter() - inicio)
+
+
+async def paginas_pool_compartilhado(base_url: str, paginas: int) -> float:
+    # Mede apenas o transporte: limitador sem throttling
+    rate_limiter._limiter = rate_limiter.AdaptiveRateLimiter(
+        rate=1e6, min_rate=1e6, max_rate=1e6, burst=1e6, target_latency=60,
+    )
+    client = LyceumAPIClient()
+    client.base_url = base_url
+    await LyceumAPIClient.open_pool()
+    try:
+        inicio = time.perf_counter()
+        for page in range(paginas):
+            await client._make_get_request(ENDPOINT, {"page": page, "size": settings.LYCEUM_API_PAGE_SIZE})
+        return paginas / (time.perf_counter() - inicio)
+    finally:
+        await LyceumAPIClient.close_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paginas", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    registros = args.paginas * settings.LYCEUM_API_PAGE_SIZE
+    with FakeLyceumServer(port=args.port, registros=registros) as server:
+        antes = asyncio.run(paginas_cliente_por_requisicao(server.base_url, args.paginas))
+        depois = asyncio.run(paginas_pool_compartilhado(server.base_url, args.paginas))
+
+    print(f"Cliente por requisição: {antes:8.1f} páginas/s")
+    print(f"Pool compartilhado:     {depois:8.1f} páginas/s  ({depois / antes:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
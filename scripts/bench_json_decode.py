@@ -0,0 +1,50 @@
+# scripts/bench_json_decode.py
+"""
+Micro-benchmark de decodificação de páginas Lyceum: json (stdlib) e orjson.
+
+    python scripts/bench_json_decode.py                      # páginas sintéticas
+    python scripts/bench_json_decode.py pagina1.json ...     # páginas gravadas da API
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_lyceum_server import gerar_aluno
+from app.services.json_codec import orjson
+
+def medir(nome: str, func, corpo: bytes, repeticoes: int) -> None:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func(corpo)
+    seg = (time.perf_counter() - inicio) / repeticoes
+    print(f"  {nome:<14} {seg * 1000:8.2f} ms/página  {len(corpo) / seg / 1e6:8.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("arquivos", nargs="*", help="Páginas JSON gravadas da API Lyceum")
+    parser.add_argument("--tamanhos", default="100,1000,5000", help="Registros por página sintética")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.arquivos:
+        paginas = [(os.path.basename(a), open(a, "rb").read()) for a in args.arquivos]
+    else:
+        paginas = [
+            (f"sintética {n} registros", json.dumps({"data": [gerar_aluno(i) for i in range(n)]}).encode())
+            for n in map(int, args.tamanhos.split(","))
+        ]
+
+    for nome, corpo in paginas:
+        print(f"{nome} ({len(corpo) / 1024:.0f} KiB)")
+        medir("json", json.loads, corpo, args.repeticoes)
+        if orjson is not None:
+            medir("orjson", orjson.loads, corpo, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
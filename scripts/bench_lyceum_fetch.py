@@ -0,0 +1,178 @@
+# scripts/bench_lyceum_fetch.py
+"""
+Suíte de benchmark do cliente Lyceum contra o servidor fake local.
+
+Cenários (cada um roda em um processo próprio, para medir o pico de RSS isolado):
+  - cliente:      LyceumAPIClient.iter_pages no endpoint de alunos
+  - orquestrador: LyceumFetchOrchestrator em todos os ENDPOINTS
+  - sync:         SyncAlunoService.sync_all(streaming=True) em um SQLite temporário
+
+Métricas: páginas/s, registros/s, latência de página p50/p99 e pico de RSS.
+
+    python scripts/bench_lyceum_fetch.py --registros 20000 --latencia 0.01 --janela 4
+    python scripts/bench_lyceum_fetch.py --cenario sync --taxa-429 0.02 --seed 1
+"""
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_lyceum_server import FakeLyceumServer, add_server_arguments, server_kwargs
+
+CENARIOS = ("cliente", "orquestrador", "sync")
+
+
+def percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def instrumentar(client, latencias: List[float]) -> None:
+    """Mede a latência de cada página (incluindo novas tentativas) na instância."""
+    original = client._make_get_request
+
+    async def cronometrado(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            latencias.append(time.perf_counter() - inicio)
+
+    client._make_get_request = cronometrado
+
+
+def configurar(base_url: str, page_size: int, janela: int, sem_limite: bool) -> None:
+    from app.core.config import settings
+    from app.services import rate_limiter
+
+    settings.LYCEUM_API_BASE_URL = base_url
+    settings.LYCEUM_API_PAGE_SIZE = page_size
+    settings.LYCEUM_API_PREFETCH_WINDOW = janela
+    if sem_limite:
+        rate_limiter._limiter = rate_limiter.AdaptiveRateLimiter(
+            rate=1e6, min_rate=1e6, max_rate=1e6, burst=1e6, target_latency=60,
+        )
+
+
+async def cenario_cliente(latencias: List[float], janela: int) -> Dict:
+    from app.services.lyceum_api import LyceumAPIClient
+
+    client = LyceumAPIClient()
+    instrumentar(client, latencias)
+    paginas = registros = 0
+    async for _, items in client.iter_pages(client.ENDPOINTS["alunos"], window=janela):
+        paginas += 1
+        registros += len(items)
+    return {"paginas": paginas, "registros": registros}
+
+
+async def cenario_orquestrador(latencias: List[float], janela: int) -> Dict:
+    from app.services.fetch_orchestrator import LyceumFetchOrchestrator
+
+    orquestrador = LyceumFetchOrchestrator()
+    orquestrador.client.PREFETCH_WINDOWS = {nome: janela for nome in orquestrador.client.ENDPOINTS}
+    instrumentar(orquestrador.client, latencias)
+
+    async def descartar(endpoint, page, items):
+        pass
+
+    relatorio = await orquestrador.fetch(on_page=descartar)
+    total = relatorio["_total"]
+    return {"paginas": total["paginas"], "registros": total["registros"], "erros": total["erros"]}
+
+
+async def cenario_sync(latencias: List[float], janela: int) -> Dict:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401 – registra os modelos no metadata
+    from app.core.database import Base
+    from app.services.sync_aluno import SyncAlunoService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                service = SyncAlunoService(db)
+                instrumentar(service.api_client, latencias)
+                stats = await service.sync_all(streaming=True)
+        finally:
+            await engine.dispose()
+    return {"paginas": stats["paginas"], "registros": stats["total_api"], "erros": stats["erros"]}
+
+
+async def executar(nome: str, janela: int) -> Dict:
+    from app.services.lyceum_api import LyceumAPIClient
+
+    cenario = {"cliente": cenario_cliente, "orquestrador": cenario_orquestrador, "sync": cenario_sync}[nome]
+    latencias: List[float] = []
+    await LyceumAPIClient.open_pool()
+    try:
+        inicio = time.perf_counter()
+        resultado = await cenario(latencias, janela)
+        segundos = time.perf_counter() - inicio
+    finally:
+        await LyceumAPIClient.close_pool()
+    resultado.update({
+        "segundos": segundos,
+        "paginas_s": resultado["paginas"] / segundos,
+        "registros_s": resultado["registros"] / segundos,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+    })
+    return resultado
+
+
+def rodar_cenario(nome: str, base_url: str, page_size: int, janela: int, sem_limite: bool) -> Dict:
+    """Ponto de entrada do processo filho."""
+    import logging
+
+    logging.basicConfig(level=logging.WARNING)
+    configurar(base_url, page_size, janela, sem_limite)
+    resultado = asyncio.run(executar(nome, janela))
+    # ru_maxrss é em KiB no Linux
+    resultado["pico_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do cliente Lyceum contra o servidor fake")
+    add_server_arguments(parser)
+    parser.add_argument("--cenario", choices=CENARIOS, action="append", help="Padrão: todos")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--janela", type=int, default=4, help="Páginas em voo por endpoint")
+    parser.add_argument("--com-limitador", action="store_true",
+                        help="Mantém o limitador de taxa configurado (padrão: sem throttling)")
+    args = parser.parse_args()
+
+    cenarios = args.cenario or list(CENARIOS)
+    ctx = get_context("spawn")
+    print(f"{'cenário':<13} {'páginas':>8} {'registros':>10} {'seg':>7} {'pág/s':>8} "
+          f"{'reg/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8}")
+    with FakeLyceumServer(**server_kwargs(args)) as server:
+        for nome in cenarios:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                r = pool.submit(
+                    rodar_cenario, nome, server.base_url, args.page_size, args.janela, not args.com_limitador,
+                ).result()
+            print(f"{nome:<13} {r['paginas']:>8} {r['registros']:>10} {r['segundos']:>7.2f} "
+                  f"{r['paginas_s']:>8.1f} {r['registros_s']:>10.0f} {r['p50_ms']:>8.1f} "
+                  f"{r['p99_ms']:>8.1f} {r['pico_rss_mb']:>8.1f}")
+        print(f"servidor: {server.contadores}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# scripts/fake_lyceum_server.py
+"""
+Servidor local que imita a API Lyceum (apenas GET, paginação page/size).
+Usado pelos benchmarks e testes – nunca aponta para a API real.
+
+Serve todos os caminhos de LyceumAPIClient.ENDPOINTS, com:
+  - quantidade de registros por tabela (padrão + sobrescritas por tabela);
+  - latência por página (fixa + jitter aleatório);
+  - injeção de erros 500 e de 429 com Retry-After (taxas entre 0 e 1);
+  - ETag por página (If-None-Match → 304);
+  - filtro `stamp_atualizacao_min` (marca d'água incremental).
+
+    python scripts/fake_lyceum_server.py --port 8099 --registros 20000 \\
+        --tabela matriculas=50000 --latencia 0.02 --jitter 0.01 --taxa-429 0.01
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Query, Request, Response
+
+
+def gerar_aluno(i: int) -> Dict:
+    return {
+        "aluno": f"{2024000000 + i}",
+        "nome_compl": f"Aluno Teste {i}",
+        "nome_abrev": f"Aluno {i}",
+        "curso": f"CURSO{i % 40:02d}",
+        "serie": i % 10 + 1,
+        "turno": "Noturno" if i % 2 else "Diurno",
+        "e_mail_interno": f"aluno{i}@lyceum.edu.br",
+        "dt_ingresso": "2024-02-01T00:00:00Z",
+        "stamp_atualizacao": f"2025021114{i % 60:02d}00",
+    }
+
+
+def gerar_generico(*chaves: str) -> Callable[[int], Dict]:
+    """
+    Registro sintético para as tabelas sem gerador próprio, com os campos da
+    chave (simples ou composta) do registro de entidades preenchidos.
+    """
+    def valor(campo: str, i: int):
+        if campo == "ano":
+            return 2020 + i % 6
+        if campo == "semestre":
+            return 1 + i % 2
+        if campo == "turno":
+            return ("MATUTINO", "NOTURNO")[i % 2]
+        return f"{campo.upper()}{i:07d}"
+
+    def gerar(i: int) -> Dict:
+        registro = {
+            "descricao": f"{chaves[0]} {i}",
+            "curso": f"CURSO{i % 40:02d}",
+            "ativo": "S" if i % 7 else "N",
+            "stamp_atualizacao": f"2025021114{i % 60:02d}00",
+        }
+        registro.update({campo: valor(campo, i) for campo in chaves})
+        return registro
+    return gerar
+
+
+# Último segmento do caminho em ENDPOINTS → gerador de registros
+# (chaves iguais às de app/models/registry.py)
+TABELAS: Dict[str, Callable[[int], Dict]] = {
+    "alunos": gerar_aluno,
+    "cursos": gerar_generico("curso"),
+    "disciplinas": gerar_generico("disciplina"),
+    "turmas": gerar_generico("turma", "disciplina", "ano", "semestre"),
+    "docente": gerar_generico("num_func"),
+    "matriculas": gerar_generico("aluno", "disciplina", "turma", "ano", "semestre"),
+    "curriculos": gerar_generico("curriculo", "curso", "turno"),
+    "grades": gerar_generico("disciplina", "curso", "turno", "curriculo"),
+    "coordenacao": gerar_generico("num_func", "curso"),
+    "turma-docente": gerar_generico("turma", "disciplina", "ano", "semestre", "num_func"),
+}
+
+
+def create_app(
+    registros: int = 10_000,
+    latencia: float = 0.0,
+    por_tabela: Optional[Dict[str, int]] = None,
+    jitter: float = 0.0,
+    taxa_erro: float = 0.0,
+    taxa_429: float = 0.0,
+    retry_after: int = 1,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """
+    `registros` vale para todas as tabelas; `por_tabela` sobrescreve por
+    segmento do caminho (ex: {"matriculas": 50000}). Contadores de requisições
+    ficam em `app.state.contadores`.
+    """
+    app = FastAPI(title="Fake Lyceum")
+    app.state.contadores = {"requisicoes": 0, "paginas": 0, "erros": 0, "429": 0, "304": 0}
+    totais = {tabela: (por_tabela or {}).get(tabela, registros) for tabela in TABELAS}
+    sorteio = random.Random(seed)
+    # Corpos já serializados: o servidor não deve ser o gargalo do benchmark
+    paginas: Dict[tuple, bytes] = {}
+    filtrados: Dict[tuple, List[int]] = {}
+
+    def indices(tabela: str, stamp_min: Optional[str]) -> range:
+        if stamp_min is None:
+            return range(totais[tabela])
+        chave = (tabela, stamp_min)
+        if chave not in filtrados:
+            gerar = TABELAS[tabela]
+            filtrados[chave] = [
+                i for i in range(totais[tabela]) if gerar(i)["stamp_atualizacao"] >= stamp_min
+            ]
+        return filtrados[chave]
+
+    @app.get("/v2/tabela/{tabela}")
+    async def tabela(
+        tabela: str,
+        request: Request,
+        page: int = Query(0, ge=0),
+        size: int = Query(100, ge=1),
+        stamp_atualizacao_min: Optional[str] = None,
+    ):
+        contadores = app.state.contadores
+        contadores["requisicoes"] += 1
+        if tabela not in TABELAS:
+            return Response(status_code=404)
+        if latencia or jitter:
+            await asyncio.sleep(latencia + sorteio.uniform(0, jitter))
+        if taxa_429 and sorteio.random() < taxa_429:
+            contadores["429"] += 1
+            return Response(status_code=429, headers={"Retry-After": str(retry_after)})
+        if taxa_erro and sorteio.random() < taxa_erro:
+            contadores["erros"] += 1
+            return Response(status_code=500)
+
+        chave = (tabela, page, size, stamp_atualizacao_min)
+        etag = '"' + hashlib.md5(repr(chave).encode()).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            contadores["304"] += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        if chave not in paginas:
+            selecionados = indices(tabela, stamp_atualizacao_min)[page * size:(page + 1) * size]
+            gerar = TABELAS[tabela]
+            paginas[chave] = json.dumps({"data": [gerar(i) for i in selecionados]}).encode()
+        contadores["paginas"] += 1
+        return Response(paginas[chave], media_type="application/json", headers={"ETag": etag})
+
+    return app
+
+
+class FakeLyceumServer:
+    """Sobe o servidor fake em uma thread (context manager)."""
+
+    def __init__(self, port: int = 8099, **app_kwargs):
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.app = create_app(**app_kwargs)
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def contadores(self) -> Dict[str, int]:
+        return dict(self.app.state.contadores)
+
+    def __enter__(self) -> "FakeLyceumServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def parse_tabelas(valores: List[str]) -> Dict[str, int]:
+    """Converte ["matriculas=50000", ...] em {"matriculas": 50000}."""
+    resultado = {}
+    for valor in valores:
+        tabela, _, total = valor.partition("=")
+        if tabela not in TABELAS or not total.isdigit():
+            raise argparse.ArgumentTypeError(f"--tabela inválida: {valor!r} (tabelas: {', '.join(TABELAS)})")
+        resultado[tabela] = int(total)
+    return resultado
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--registros", type=int, default=10_000, help="Registros por tabela")
+    parser.add_argument("--tabela", action="append", default=[], metavar="NOME=N",
+                        help="Sobrescreve a quantidade de uma tabela (repetível)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência por página (segundos)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latência extra aleatória até N segundos")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração de respostas 500")
+    parser.add_argument("--taxa-429", type=float, default=0.0, help="Fração de respostas 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After das respostas 429")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def server_kwargs(args: argparse.Namespace) -> Dict:
+    return dict(
+        registros=args.registros,
+        latencia=args.latencia,
+        por_tabela=parse_tabelas(args.tabela),
+        jitter=args.jitter,
+        taxa_erro=args.taxa_erro,
+        taxa_429=args.taxa_429,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor fake da API Lyceum")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(**server_kwargs(args)), host="127.0.0.1", port=args.port)
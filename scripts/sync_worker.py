@@ -0,0 +1,57 @@
+# scripts/sync_worker.py
+"""
+Worker de carga completa distribuída: reivindica faixas (`sync_shard`) por
+lease e as grava. Rode quantos quiser, em qualquer nó com acesso ao banco.
+
+    python scripts/sync_worker.py --planejar alunos          # cria o job e trabalha nele
+    python scripts/sync_worker.py --continuo                 # atende qualquer job, indefinidamente
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.lyceum_api import LyceumAPIClient
+from app.services.sync_shards import ShardWorker, plan_sharded_job
+
+logger = logging.getLogger("sync_worker")
+
+
+async def executar(args: argparse.Namespace) -> None:
+    await LyceumAPIClient.open_pool()
+    try:
+        if args.planejar:
+            async with AsyncSessionLocal() as db:
+                job_id, criado = await plan_sharded_job(db, args.planejar, pages_per_shard=args.paginas_por_faixa)
+            logger.info(f"Job {job_id} {'criado' if criado else 'já em andamento'}")
+        worker = ShardWorker(worker_id=args.worker_id, entidade=args.entidade or args.planejar)
+        while True:
+            contadores = await worker.run()
+            logger.info(f"Worker {worker.id}: {contadores}")
+            if not args.continuo:
+                break
+            await asyncio.sleep(settings.SYNC_SHARD_POLL_SECONDS)
+    finally:
+        await LyceumAPIClient.close_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entidade", help="Atender só faixas desta entidade")
+    parser.add_argument("--planejar", metavar="ENTIDADE", help="Criar um job distribuído da entidade antes")
+    parser.add_argument("--paginas-por-faixa", type=int, default=None)
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--continuo", action="store_true", help="Continuar aguardando novas faixas")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 import sys
 import os
 from pathlib import Path
+import httpx
 import pytest
+import pytest_asyncio
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -28,4 +30,107 @@ os.environ["REDIS_HOST"] = "localhost"
 os.environ["REDIS_PORT"] = "6379"
 os.environ["REDIS_PASSWORD"] = ""
 
-# Agora podemos importar o app e outros módulos com segurança
\ No newline at end of file
+# Agora podemos importar o app e outros módulos com segurança
+
+@pytest.fixture(autouse=True)
+def limitador_sem_espera():
+    """Limitador Lyceum sem throttling (a API é sempre fake nos testes)."""
+    from app.services import rate_limiter
+
+    rate_limiter._limiter = rate_limiter.AdaptiveRateLimiter(
+        rate=1e6, min_rate=1e6, max_rate=1e6, burst=1e6, target_latency=60,
+    )
+    yield rate_limiter._limiter
+    rate_limiter._limiter = None
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Sessão assíncrona em um SQLite em memória com todas as tabelas criadas."""
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    import app.models  # noqa: F401 – registra os modelos no metadata
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_arquivo(tmp_path):
+    """
+    Fábrica de sessões de um SQLite em arquivo com todas as tabelas criadas,
+    para testes com várias sessões independentes (jobs, workers, agendador).
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    import app.models  # noqa: F401 – registra os modelos no metadata
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/sync.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def pool_fake():
+    """Instala no pool compartilhado do cliente Lyceum um handler httpx.MockTransport ou um app ASGI."""
+    from app.services.lyceum_api import LyceumAPIClient
+
+    def instalar(handler=None, app=None):
+        transport = httpx.ASGITransport(app=app) if app is not None else httpx.MockTransport(handler)
+        LyceumAPIClient._http_client = httpx.AsyncClient(transport=transport)
+        return LyceumAPIClient._http_client
+
+    yield instalar
+    LyceumAPIClient._http_client = None
+
+
+@pytest.fixture
+def servidor_fake(pool_fake):
+    """Pool compartilhado apontando para o servidor fake (`create_app(**kwargs)`); retorna o app."""
+    from scripts.fake_lyceum_server import create_app
+
+    def instalar(**kwargs):
+        app = create_app(**kwargs)
+        pool_fake(app=app)
+        return app
+
+    return instalar
+
+
+@pytest.fixture
+def lyceum_fake(pool_fake):
+    """Pool compartilhado servindo `total` alunos em páginas de 2 registros."""
+    def instalar(total: int):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            data = [
+                {"aluno": f"{i:05d}", "nome_compl": f"Aluno {i}", "stamp_atualizacao": "1"}
+                for i in range(page * 2, min(page * 2 + 2, total))
+            ]
+            return httpx.Response(200, json={"data": data})
+
+        pool_fake(handler)
+
+    return instalar
+
+
+@pytest.fixture(scope="session")
+def test_db_tables():
+    """Cria as tabelas no banco de teste da aplicação (test.db) e remove o arquivo ao final."""
+    from app.core.database import Base, sync_engine
+    import app.models  # noqa: F401 – registra os modelos no metadata
+
+    Base.metadata.create_all(sync_engine)
+    yield
+    Base.metadata.drop_all(sync_engine)
+    sync_engine.dispose()
+    Path("test.db").unlink(missing_ok=True)
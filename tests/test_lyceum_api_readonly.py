@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
 from app.services.lyceum_api import LyceumAPIClientReadOnly
+from app.models.ly_aluno import LYAluno
 from app.services.sync_aluno import SyncAlunoService
 from app.main import app
 
@@ -21,8 +22,10 @@ MOCK_ALUNO_API = {
 MOCK_ALUNO_API_LIST = [MOCK_ALUNO_API]
 
 @pytest.fixture
-def client():
-    return TestClient(app)
+def client(test_db_tables):
+    # Um único loop para o teste: as execuções disparadas pelos endpoints rodam nele
+    with TestClient(app) as client:
+        yield client
 
 # ------------------------------------------------------------
 # TESTE 1 – Cliente Lyceum só faz GET (agora rápido!)
@@ -48,12 +51,8 @@ async def test_lyceum_client_only_get():
 # TESTE 2 – Serviço não modifica API externa
 # ------------------------------------------------------------
 @pytest.mark.asyncio
-async def test_sync_service_no_modification():
-    mock_db = AsyncMock()
-    mock_db.execute.return_value.scalar_one_or_none.return_value = None
-    mock_db.execute.return_value.scalars.return_value.all.return_value = []
-
-    service = SyncAlunoService(mock_db)
+async def test_sync_service_no_modification(db_session):
+    service = SyncAlunoService(db_session)
 
     # Mock do método que busca alunos – retorna lista finita
     service.api_client.get_all_alunos = AsyncMock(return_value=MOCK_ALUNO_API_LIST)
@@ -64,8 +63,8 @@ async def test_sync_service_no_modification():
     assert stats["inseridos"] == 1
     assert stats["atualizados"] == 0
     assert stats["erros"] == 0
-    mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    aluno = await db_session.get(LYAluno, "2024001")
+    assert aluno.nome_compl == "João da Silva"
     service.api_client.get_all_alunos.assert_called_once()
 
 # ------------------------------------------------------------
@@ -84,8 +83,29 @@ async def test_normalize_aluno_data():
 # TESTE 4 – Endpoint de sincronização (background task)
 # ------------------------------------------------------------
 def test_sync_endpoint_background(client, mocker):
-    mock_sync = mocker.patch("app.api.v1.endpoints.alunos.sync_alunos", new_callable=AsyncMock)
+    mock_sync = mocker.patch("app.api.v1.endpoints.sync.sync_alunos", new_callable=AsyncMock)
     mock_sync.return_value = {"total_api": 1, "inseridos": 1}
     response = client.post("/api/v1/alunos/sync?incremental=false")
     assert response.status_code == 200
-    assert response.json()["message"] == "Sincronização de alunos iniciada em background"
\ No newline at end of file
+    assert response.json()["message"] == "Sincronização de alunos iniciada em background"
+
+def test_sync_endpoint_registra_job(client, mocker):
+    mocker.patch("app.api.v1.endpoints.sync.sync_alunos", new_callable=AsyncMock)
+    response = client.post("/api/v1/sync/alunos")
+    job_id = response.json()["job_id"]
+
+    job = client.get(f"/api/v1/sync/jobs/{job_id}")
+    assert job.status_code == 200
+    assert job.json()["entidade"] == "alunos"
+    assert job_id in [j["id"] for j in client.get("/api/v1/sync/jobs?entidade=alunos").json()]
+    assert client.get("/api/v1/sync/status").json()["entidades"]["alunos"]["id"] == job_id
+    assert client.get("/api/v1/sync/jobs/inexistente").status_code == 404
+
+def test_sync_dag_ciclo_e_erro_de_configuracao(client, mocker):
+    from app.services.sync_registry import SYNC_SERVICES
+
+    assert client.post("/api/v1/sync/dag?entidades=inexistente").status_code == 404
+    mocker.patch.object(SYNC_SERVICES["cursos"], "DEPENDS_ON", ("disciplinas",))
+    response = client.post("/api/v1/sync/dag?entidades=cursos&entidades=disciplinas")
+    assert response.status_code == 422
+    assert "ciclo" in response.json()["detail"]
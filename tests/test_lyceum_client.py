@@ -0,0 +1,295 @@
+# tests/test_lyceum_client.py
+import httpx
+import pytest
+
+from app.services.lyceum_api import LyceumAPIClient, LyceumAPIClientReadOnly
+
+
+def paginas_fake(total: int, size: int = 2):
+    """Handler httpx.MockTransport que serve `total` alunos paginados."""
+    chamadas = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        chamadas.append(request)
+        page = int(request.url.params["page"])
+        inicio = page * size
+        data = [{"aluno": str(i)} for i in range(inicio, min(inicio + size, total))]
+        return httpx.Response(200, json={"data": data})
+
+    return handler, chamadas
+
+
+@pytest.mark.asyncio
+async def test_pool_compartilhado_entre_instancias(pool_fake):
+    handler, chamadas = paginas_fake(total=5)
+    pool = pool_fake(handler)
+
+    a, b = LyceumAPIClient(), LyceumAPIClientReadOnly()
+    assert await a.open_pool() is pool
+    assert await b.open_pool() is pool
+
+    a.page_size = b.page_size = 2
+    assert len(await a.get_all_alunos()) == 5
+    assert len(await b.get_all_alunos()) == 5
+    assert all(r.method == "GET" for r in chamadas)
+
+
+@pytest.mark.asyncio
+async def test_close_pool_permite_reabrir(pool_fake):
+    handler, _ = paginas_fake(total=1)
+    pool = pool_fake(handler)
+    await LyceumAPIClient.close_pool()
+    assert pool.is_closed
+    assert LyceumAPIClient._http_client is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_pages_janela_concorrente_mantem_ordem(pool_fake):
+    import asyncio
+
+    em_voo = {"atual": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        em_voo["atual"] += 1
+        em_voo["max"] = max(em_voo["max"], em_voo["atual"])
+        # Páginas pares demoram mais: respostas chegam fora de ordem
+        await asyncio.sleep(0.02 if page % 2 == 0 else 0.001)
+        em_voo["atual"] -= 1
+        data = [{"aluno": f"{page}-{i}"} for i in range(2)] if page < 7 else []
+        return httpx.Response(200, json={"data": data})
+
+    pool_fake(handler)
+    client = LyceumAPIClient()
+
+    result = await client.fetch_all_pages(client.ENDPOINTS["alunos"], window=3)
+
+    assert [r["aluno"] for r in result] == [f"{p}-{i}" for p in range(7) for i in range(2)]
+    assert em_voo["max"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_aimd():
+    from app.services.rate_limiter import AdaptiveRateLimiter
+
+    limiter = AdaptiveRateLimiter(rate=10, min_rate=1, max_rate=12, burst=1, target_latency=1.0, cooldown=0)
+
+    await limiter.record(200, 0.1)
+    assert limiter.rate == 10.5
+    await limiter.record(429, 0.1)
+    assert limiter.rate == 5.25
+    await limiter.record(503, 0.1)
+    await limiter.record(None, 0.1)
+    await limiter.record(200, 5.0)  # latência acima do alvo também conta como congestionamento
+    assert limiter.rate == 1
+    for _ in range(50):
+        await limiter.record(200, 0.1)
+    assert limiter.rate == 12
+    assert (await limiter.snapshot())["reducoes"] == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_aumenta_no_maximo_uma_vez_por_janela():
+    from app.services.rate_limiter import AdaptiveRateLimiter
+
+    limiter = AdaptiveRateLimiter(rate=2, min_rate=1, max_rate=100, burst=1, target_latency=1.0, cooldown=60)
+
+    # Uma rajada de respostas concorrentes conta como um único sinal de folga
+    for _ in range(20):
+        await limiter.record(200, 0.1)
+    assert limiter.rate == 2.5
+
+    limiter._last_increase -= 60  # a janela passou
+    await limiter.record(200, 0.1)
+    await limiter.record(200, 0.1)
+    assert limiter.rate == 3.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_redis_reserva_a_ficha_em_uma_chamada(monkeypatch):
+    from app.services import rate_limiter
+
+    chamadas, esperas = [], []
+
+    class RedisFake:
+        def register_script(self, script):
+            async def executar(keys, args):
+                chamadas.append(script)
+                return "0.25"  # ficha reservada, vez daqui a 0,25 s
+            return executar
+
+    async def sleep(segundos):
+        esperas.append(segundos)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", sleep)
+    limiter = rate_limiter.RedisRateLimiter(
+        RedisFake(), rate=4, min_rate=1, max_rate=4, burst=1, target_latency=1.0,
+    )
+    await limiter.acquire()
+
+    # Sem nova consulta ao acordar: a espera já é a vez reservada
+    assert chamadas == [limiter.ACQUIRE_SCRIPT]
+    assert esperas == [0.25] and limiter.aguardas == 1
+
+
+def test_retry_after_em_segundos_ou_data_http():
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    from app.services.lyceum_api import _parse_retry_after
+
+    assert _parse_retry_after("7") == 7.0
+    daqui_a_pouco = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < _parse_retry_after(daqui_a_pouco) <= 30
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # já passou
+    assert _parse_retry_after("logo") is None
+    assert _parse_retry_after(None) is None
+
+
+def test_decodificador_json_usa_orjson_e_recai_no_json(monkeypatch, caplog):
+    import json
+    from types import SimpleNamespace
+
+    from app.core.config import settings
+    from app.services import json_codec
+
+    orjson_fake = SimpleNamespace(loads=lambda body: ("orjson", json.loads(body)))
+    monkeypatch.setattr(json_codec, "orjson", orjson_fake)
+    monkeypatch.setattr(settings, "LYCEUM_API_JSON_DECODER", "auto")
+    assert json_codec._resolve_decoder()(b'{"data": []}') == ("orjson", {"data": []})
+    monkeypatch.setattr(settings, "LYCEUM_API_JSON_DECODER", "json")
+    assert json_codec._resolve_decoder() is json.loads
+
+    # Sem orjson instalado: json da biblioteca padrão, com aviso se orjson foi pedido
+    monkeypatch.setattr(json_codec, "orjson", None)
+    monkeypatch.setattr(settings, "LYCEUM_API_JSON_DECODER", "auto")
+    assert json_codec._resolve_decoder() is json.loads
+    monkeypatch.setattr(settings, "LYCEUM_API_JSON_DECODER", "orjson")
+    assert json_codec._resolve_decoder() is json.loads
+    assert "não está instalado" in caplog.text
+    assert json_codec.loads(b'{"data": [{"aluno": "1"}]}') == {"data": [{"aluno": "1"}]}
+
+
+@pytest.mark.asyncio
+async def test_retry_com_backoff_e_erro_sem_truncar(pool_fake, monkeypatch):
+    from app.core.config import settings
+    from app.services.lyceum_api import LyceumPaginationError
+
+    monkeypatch.setattr(settings, "LYCEUM_API_BACKOFF_BASE", 0)
+    monkeypatch.setattr(settings, "LYCEUM_API_MAX_RETRIES", 2)
+    tentativas = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        tentativas[page] = tentativas.get(page, 0) + 1
+        if page == 0 and tentativas[page] < 3:
+            return httpx.Response(503)  # recupera na 3ª tentativa
+        if page == 1:
+            return httpx.Response(500)  # nunca recupera
+        return httpx.Response(200, json={"data": [{"aluno": str(page)}]})
+
+    pool_fake(handler)
+    client = LyceumAPIClient()
+    client.page_size = 1
+
+    with pytest.raises(LyceumPaginationError) as exc:
+        await client.fetch_all_pages(client.ENDPOINTS["alunos"], window=1)
+
+    assert exc.value.page == 1
+    assert tentativas == {0: 3, 1: 3}
+
+
+@pytest.mark.asyncio
+async def test_cache_http_em_disco_get_condicional(pool_fake, tmp_path):
+    from app.services.http_cache import DiskResponseCache
+
+    recebidos = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        recebidos.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": [{"aluno": "1"}]}, headers={"ETag": '"v1"'})
+
+    pool_fake(handler)
+    client = LyceumAPIClient()
+    client.cache = DiskResponseCache(str(tmp_path), ttl=60, max_bytes=10_000)
+    params = {"page": 0, "size": 1}
+
+    assert await client._make_get_request("/v2/tabela/alunos", params) == {"data": [{"aluno": "1"}]}
+    assert await client._make_get_request("/v2/tabela/alunos", params) == {"data": [{"aluno": "1"}]}
+    assert recebidos == [None]  # segunda chamada servida do disco, sem rede
+
+    client.cache.ttl = 0  # expirado: revalida com If-None-Match e recebe 304
+    assert await client._make_get_request("/v2/tabela/alunos", params) == {"data": [{"aluno": "1"}]}
+    assert recebidos == [None, '"v1"']
+    assert (client.cache.hits, client.cache.revalidated, client.cache.misses) == (1, 1, 1)
+
+
+def test_cache_http_despejo_lru(tmp_path):
+    from app.services.http_cache import DiskResponseCache
+
+    cache = DiskResponseCache(str(tmp_path), ttl=60, max_bytes=400)  # ~170 bytes por entrada
+    for i in range(3):
+        cache.put(f"k{i}", b"x" * 100)
+    assert cache.get("k0") is None
+    assert cache.get("k2").body == b"x" * 100
+    assert len(list(tmp_path.glob("*.page"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_orquestrador_limite_global_e_prioridade(pool_fake):
+    import asyncio
+
+    from app.services.fetch_orchestrator import LyceumFetchOrchestrator
+
+    em_voo = {"atual": 0, "max": 0}
+    ordem = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        page = int(request.url.params["page"])
+        if endpoint == "cursos":
+            return httpx.Response(404)
+        ordem.append(endpoint)
+        em_voo["atual"] += 1
+        em_voo["max"] = max(em_voo["max"], em_voo["atual"])
+        try:
+            await asyncio.sleep(0.005)
+        finally:
+            em_voo["atual"] -= 1
+        data = [{"id": f"{endpoint}-{page}"}] if page < 3 else []
+        return httpx.Response(200, json={"data": data})
+
+    pool_fake(handler)
+    client = LyceumAPIClient()
+    client.PREFETCH_WINDOWS = {nome: 4 for nome in client.ENDPOINTS}
+    orquestrador = LyceumFetchOrchestrator(client, max_concurrency=2, priorities={"docentes": -1})
+
+    relatorio = await orquestrador.fetch(["alunos", "docentes", "cursos", "turmas"])
+
+    assert em_voo["max"] <= 2
+    assert ordem[0] == "docente"
+    assert relatorio["alunos"]["total"] == 3
+    assert [r["id"] for r in relatorio["turmas"]["registros"]] == ["turmas-0", "turmas-1", "turmas-2"]
+    assert relatorio["cursos"]["erro"] and relatorio["cursos"]["total"] == 0
+    assert relatorio["_total"]["erros"] == 1
+    assert relatorio["_total"]["registros"] == 9
+
+
+@pytest.mark.asyncio
+async def test_cliente_contra_servidor_fake_com_erros_injetados(servidor_fake, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LYCEUM_API_BACKOFF_BASE", 0)
+    monkeypatch.setattr(settings, "LYCEUM_API_MAX_RETRIES", 10)
+    app = servidor_fake(registros=45, por_tabela={"matriculas": 7}, taxa_429=0.2, taxa_erro=0.1, retry_after=0, seed=3)
+    client = LyceumAPIClient()
+    client.page_size = 10
+
+    alunos = await client.get_all_alunos()
+    assert len({a["aluno"] for a in alunos}) == 45
+    assert len(await client.get_all_matriculas()) == 7
+    assert len(await client.get_all_alunos({"stamp_atualizacao_min": "20250211143000"})) == 15
+    contadores = app.state.contadores
+    assert contadores["429"] and contadores["erros"]
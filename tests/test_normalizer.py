@@ -0,0 +1,93 @@
+# tests/test_normalizer.py
+from datetime import datetime
+
+import pytest
+
+from app.models.ly_aluno import LYAluno
+from app.services.normalizer import ModelNormalizer
+from app.services.sync_aluno import SyncAlunoService
+
+
+def test_conversores_derivados_das_colunas():
+    normalizer = SyncAlunoService.get_normalizer()
+    assert normalizer is SyncAlunoService.get_normalizer()  # compilado uma vez
+
+    row = normalizer.normalize({
+        "aluno": " 2024001 ",
+        "serie": "3",
+        "creditos": "x",
+        "dt_ingresso": "2024-02-01T10:00:00Z",
+        "representante_turma": " s ",
+        "turno": "N" * 80,  # String(50)
+        "obs_aluno_finan": "  texto longo  " * 20,  # Text: sem limite
+    })
+
+    assert row["aluno"] == "2024001"
+    assert (row["serie"], row["creditos"]) == (3, None)
+    assert row["dt_ingresso"] == datetime(2024, 2, 1, 10, 0)
+    assert row["representante_turma"] == "S"
+    assert row["turno"] == "N" * 50
+    assert len(row["obs_aluno_finan"]) > 200
+    assert row["sincronizado"] is True
+    assert len(row["hash_conteudo"]) == 64
+    assert not {"data_criacao", "data_atualizacao"} & row.keys()
+
+
+def test_normalize_many_descarta_registro_com_erro():
+    def falha_em_x(v):
+        if v == "x":
+            raise ValueError("valor inválido")
+        return v
+
+    normalizer = ModelNormalizer(LYAluno, field_map={"nome_compl": "nome"}, overrides={"curso": falha_em_x})
+    erros = []
+    rows = normalizer.normalize_many(
+        [{"aluno": "1", "nome": "Ana", "curso": "ADM"}, {"aluno": "2", "curso": "x"}],
+        on_error=lambda raw, e: erros.append(raw["aluno"]),
+    )
+
+    assert [(r["aluno"], r["nome_compl"], r["curso"]) for r in rows] == [("1", "Ana", "ADM")]
+    assert erros == ["2"]
+
+
+def test_normalizador_serializavel_para_processos():
+    import pickle
+
+    normalizer = SyncAlunoService.get_normalizer()
+    copia = pickle.loads(pickle.dumps(normalizer))
+
+    raw = {"aluno": "1", "representante_turma": "n", "turno": "T" * 80}
+    esperado, obtido = normalizer.normalize(raw), copia.normalize(raw)
+    esperado.pop("data_sincronizacao"), obtido.pop("data_sincronizacao")
+    assert obtido == esperado
+
+
+@pytest.mark.asyncio
+async def test_normalizacao_fora_do_event_loop(monkeypatch):
+    import threading
+
+    from app.core.config import settings
+    from app.services import normalizer as modulo
+
+    threads = []
+
+    def registrando(v):
+        threads.append(threading.current_thread().name)
+        return v
+
+    monkeypatch.setattr(settings, "SYNC_NORMALIZE_WORKERS", 2)
+    monkeypatch.setattr(settings, "SYNC_NORMALIZE_EXECUTOR", "thread")
+    normalizer = ModelNormalizer(LYAluno, overrides={"curso": registrando, "serie": lambda v: int(v)})
+    erros = []
+    try:
+        rows = await modulo.normalize_many_async(
+            normalizer,
+            [{"aluno": "1", "serie": "2"}, {"aluno": "2", "serie": "x"}],
+            on_error=lambda raw, e: erros.append(raw["aluno"]),
+        )
+    finally:
+        modulo.shutdown_normalization_executor()
+
+    assert [r["aluno"] for r in rows] == ["1"]
+    assert erros == ["2"]
+    assert threads and all(nome.startswith("normalizer") for nome in threads)
@@ -0,0 +1,802 @@
+# tests/test_sync_service.py
+import httpx
+import pytest
+from sqlalchemy import func, select, update
+
+from app.models.ly_aluno import LYAluno
+from app.services.lyceum_api import LyceumAPIClient
+from app.services.sync_aluno import SyncAlunoService
+
+
+def novo_servico(db) -> SyncAlunoService:
+    service = SyncAlunoService(db)
+    service.api_client.page_size = 2
+    return service
+
+
+@pytest.mark.asyncio
+async def test_sync_streaming_insere_e_atualiza(db_session, lyceum_fake):
+    lyceum_fake(total=5)
+
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    assert (stats["total_api"], stats["inseridos"], stats["erros"]) == (5, 5, 0)
+
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    assert (stats["inseridos"], stats["atualizados"], stats["inalterados"]) == (0, 0, 5)
+
+    total = await db_session.scalar(select(func.count()).select_from(LYAluno))
+    assert total == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_interrompido_retoma_do_checkpoint(db_session, pool_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models.sync_checkpoint import SyncCheckpoint
+
+    monkeypatch.setattr(settings, "LYCEUM_API_MAX_RETRIES", 0)
+    falhar = {"pagina": 2}
+    pedidas = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        pedidas.append(page)
+        if page == falhar["pagina"]:
+            return httpx.Response(503)
+        data = [{"aluno": f"{i:05d}"} for i in range(page * 2, min(page * 2 + 2, 7))]
+        return httpx.Response(200, json={"data": data})
+
+    pool_fake(handler)
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    assert stats["interrompido"] is True
+    assert stats["inseridos"] == 4
+    checkpoint = await db_session.get(SyncCheckpoint, "alunos")
+    await db_session.refresh(checkpoint)
+    assert (checkpoint.status, checkpoint.ultima_pagina) == ("interrompido", 1)
+
+    falhar["pagina"] = None
+    pedidas.clear()
+    stats = await novo_servico(db_session).sync_all(resume=True)
+    assert stats["interrompido"] is False
+    assert stats["pagina_inicial"] == 2
+    assert min(pedidas) == 2
+    assert stats["inseridos"] == 3
+    total = await db_session.scalar(select(func.count()).select_from(LYAluno))
+    assert total == 7
+
+
+@pytest.mark.asyncio
+async def test_retomada_ignora_checkpoint_de_outra_listagem(db_session, pool_fake, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LYCEUM_API_MAX_RETRIES", 0)
+    falhar = {"pagina": 2}
+    pedidas = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        pedidas.append(page)
+        if page == falhar["pagina"]:
+            return httpx.Response(503)
+        data = [{"aluno": f"{i:05d}", "stamp_atualizacao": "1"} for i in range(page * 2, min(page * 2 + 2, 7))]
+        return httpx.Response(200, json={"data": data})
+
+    pool_fake(handler)
+    interrompida = await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert interrompida["interrompido"] is True
+
+    # Carga completa com resume: o checkpoint incremental não vale para ela
+    falhar["pagina"] = None
+    pedidas.clear()
+    stats = await novo_servico(db_session).sync_all(resume=True)
+    assert stats["interrompido"] is False
+    assert stats["pagina_inicial"] == 0 and min(pedidas) == 0
+    assert stats["run_id"] != interrompida["run_id"]
+    assert (stats["total_api"], stats["geracao"]) == (7, 1)
+
+
+@pytest.mark.asyncio
+async def test_incremental_envia_marca_dagua_para_api(db_session, pool_fake):
+    from app.models.sync_watermark import SyncWatermark
+
+    registros = [{"aluno": f"{i:05d}", "stamp_atualizacao": f"2025010100000{i}"} for i in range(5)]
+    filtros = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        minimo = request.url.params.get("stamp_atualizacao_min")
+        filtros.append(minimo)
+        filtrados = [r for r in registros if minimo is None or r["stamp_atualizacao"] >= minimo]
+        return httpx.Response(200, json={"data": filtrados[page * 2:page * 2 + 2]})
+
+    pool_fake(handler)
+    stats = await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert stats["inseridos"] == 5
+    assert set(filtros) == {None}
+    watermark = await db_session.get(SyncWatermark, "alunos")
+    assert watermark.valor == "20250101000004"
+
+    registros[1]["stamp_atualizacao"] = "20250102000000"
+    filtros.clear()
+    stats = await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert set(filtros) == {"20250101000004"}
+    assert stats["total_api"] == 2  # apenas o alterado e o da própria marca d'água
+    watermark = await db_session.get(SyncWatermark, "alunos", populate_existing=True)
+    assert watermark.valor == "20250102000000"
+
+
+@pytest.mark.asyncio
+async def test_registro_com_erro_de_normalizacao_nao_avanca_marca_dagua(db_session, pool_fake):
+    from app.models.sync_watermark import SyncWatermark
+
+    registros = [{"aluno": f"{i:05d}", "stamp_atualizacao": f"2025010100000{i}"} for i in range(3)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        minimo = request.url.params.get("stamp_atualizacao_min")
+        filtrados = [r for r in registros if minimo is None or r["stamp_atualizacao"] >= minimo]
+        return httpx.Response(200, json={"data": filtrados[page * 2:page * 2 + 2]})
+
+    pool_fake(handler)
+    await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert (await db_session.get(SyncWatermark, "alunos")).valor == "20250101000002"
+
+    # O registro mais recente falha na normalização: a marca d'água não pode passar dele
+    registros.append({"aluno": "00009", "stamp_atualizacao": "20250105000000"})
+    registros[0]["stamp_atualizacao"] = "20250103000000"
+    service = novo_servico(db_session)
+    normalize = service.normalize_data
+
+    async def normalize_com_defeito(raw):
+        if raw["aluno"] == "00009":
+            raise ValueError("registro inválido")
+        return await normalize(raw)
+
+    service.normalize_data = normalize_com_defeito
+    stats = await service.sync_all(incremental=True, streaming=True)
+    assert (stats["erros"], stats["atualizados"]) == (1, 1)
+    watermark = await db_session.get(SyncWatermark, "alunos", populate_existing=True)
+    assert watermark.valor == "20250101000002"
+
+    # Corrigido na origem, o registro ainda passa pelo filtro da próxima execução
+    stats = await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert stats["inseridos"] == 1
+    watermark = await db_session.get(SyncWatermark, "alunos", populate_existing=True)
+    assert watermark.valor == "20250105000000"
+
+
+@pytest.mark.asyncio
+async def test_upsert_em_lote_conta_e_preserva_data_criacao(db_session, monkeypatch):
+    from datetime import datetime
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SYNC_UPSERT_CHUNK_SIZE", 2)
+    service = novo_servico(db_session)
+    itens = [{"aluno": f"{i:05d}", "nome_compl": f"Aluno {i}", "stamp_atualizacao": "1"} for i in range(3)]
+
+    stats = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "ignorados": 0, "erros": 0}
+    await service._process_items(itens, stats, False, {})
+    await db_session.commit()
+    criado = (await db_session.get(LYAluno, "00001")).data_criacao
+    await db_session.execute(update(LYAluno).values(data_criacao=datetime(2020, 1, 1)))
+    await db_session.commit()
+
+    # Repetido no mesmo lote + um novo + dois existentes
+    itens = [
+        {"aluno": "00001", "nome_compl": "Antigo", "stamp_atualizacao": "2"},
+        {"aluno": "00001", "nome_compl": "Novo", "stamp_atualizacao": "3"},
+        {"aluno": "00002", "nome_compl": "Aluno 2", "stamp_atualizacao": "2"},
+        {"aluno": "00009", "nome_compl": "Aluno 9", "stamp_atualizacao": "2"},
+        {"nome_compl": "Sem chave"},
+    ]
+    stats = {"inseridos": 0, "atualizados": 0, "inalterados": 0, "ignorados": 0, "erros": 0}
+    await service._process_items(itens, stats, False, {})
+    await db_session.commit()
+
+    assert criado is not None
+    assert stats == {"inseridos": 1, "atualizados": 2, "inalterados": 0, "ignorados": 2, "erros": 0}
+    aluno = await db_session.get(LYAluno, "00001", populate_existing=True)
+    assert (aluno.nome_compl, aluno.stamp_atualizacao) == ("Novo", "3")
+    assert aluno.data_criacao == datetime(2020, 1, 1)
+    assert await db_session.scalar(select(func.count()).select_from(LYAluno)) == 4
+
+
+def test_staging_merge_sql_postgresql():
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.staging_copy import StagingCopyLoader
+
+    loader = StagingCopyLoader(None, LYAluno, "aluno")
+    loader.columns = ["aluno", "nome_compl", "data_criacao"]
+    sql = str(loader.merge_statement().compile(dialect=postgresql.dialect()))
+
+    assert "SELECT DISTINCT ON (stg_ly_aluno.aluno)" in sql
+    assert "ORDER BY stg_ly_aluno.aluno, stg_ly_aluno._ordem DESC" in sql
+    assert "ON CONFLICT (aluno) DO UPDATE SET nome_compl = excluded.nome_compl, data_atualizacao = now()" in sql
+    assert "RETURNING (xmax = 0) AS inserido" in sql
+    drop, create = (str(stmt.compile(dialect=postgresql.dialect())).strip() for stmt in loader.prepare_statements())
+    assert drop == "DROP TABLE IF EXISTS stg_ly_aluno"
+    assert create.startswith("CREATE UNLOGGED TABLE stg_ly_aluno (")
+    assert "hash_conteudo" in create and "_ordem BIGINT" in create
+
+
+@pytest.mark.asyncio
+async def test_staging_fora_do_postgresql_usa_upsert_em_lote(db_session, lyceum_fake):
+    lyceum_fake(total=5)
+
+    stats = await novo_servico(db_session).sync_all(staging=True)
+
+    assert (stats["total_api"], stats["inseridos"], stats["erros"]) == (5, 5, 0)
+    assert "staging" not in stats
+
+
+@pytest.mark.asyncio
+async def test_hash_de_conteudo_evita_update_de_linha_inalterada(db_session):
+    from datetime import datetime
+
+    service = novo_servico(db_session)
+    novo_stats = lambda: {"inseridos": 0, "atualizados": 0, "inalterados": 0, "ignorados": 0, "erros": 0}
+    itens = [{"aluno": f"{i:05d}", "nome_compl": f"Aluno {i}"} for i in range(3)]
+    await service._process_items(itens, novo_stats(), False, {})
+    await db_session.commit()
+    await db_session.execute(update(LYAluno).values(data_atualizacao=datetime(2020, 1, 1)))
+    await db_session.commit()
+
+    # Sem stamp: só o conteúdo diz o que mudou
+    itens[1] = {"aluno": "00001", "nome_compl": "Renomeado"}
+    stats = novo_stats()
+    await service._process_items(itens, stats, False, {})
+    await db_session.commit()
+
+    assert (stats["inseridos"], stats["atualizados"], stats["inalterados"]) == (0, 1, 2)
+    datas = dict((await db_session.execute(select(LYAluno.aluno, LYAluno.data_atualizacao))).all())
+    assert datas["00000"] == datas["00002"] == datetime(2020, 1, 1)
+    assert datas["00001"] != datetime(2020, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_carga_completa_marca_removidos_na_origem(db_session, lyceum_fake):
+    from datetime import datetime
+
+    lyceum_fake(total=5)
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    assert (stats["geracao"], stats["removidos_origem"]) == (1, 0)
+
+    # Dois alunos sumiram da origem; os inalterados também recebem a nova geração
+    await db_session.execute(update(LYAluno).values(data_atualizacao=datetime(2020, 1, 1)))
+    await db_session.commit()
+    lyceum_fake(total=3)
+    stats = await novo_servico(db_session).sync_all(streaming=False)
+    assert (stats["geracao"], stats["inalterados"], stats["removidos_origem"]) == (2, 3, 2)
+    linhas = (await db_session.execute(
+        select(LYAluno.aluno, LYAluno.geracao_sync, LYAluno.removido_origem).order_by(LYAluno.aluno)
+    )).all()
+    assert [tuple(l) for l in linhas] == [
+        ("00000", 2, False), ("00001", 2, False), ("00002", 2, False), ("00003", 1, True), ("00004", 1, True),
+    ]
+    datas = dict((await db_session.execute(select(LYAluno.aluno, LYAluno.data_atualizacao))).all())
+    assert datas["00000"] == datetime(2020, 1, 1)
+
+    # Incremental não varre; uma nova carga completa reativa quem voltou
+    stats = await novo_servico(db_session).sync_all(incremental=True, streaming=True)
+    assert "geracao" not in stats
+    lyceum_fake(total=5)
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    assert (stats["geracao"], stats["removidos_origem"]) == (3, 0)
+    removidos = await db_session.scalar(select(func.count()).where(LYAluno.removido_origem.is_(True)))
+    assert removidos == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_registra_job_com_progresso_e_estatisticas(db_session, lyceum_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+
+    monkeypatch.setattr(settings, "SYNC_JOB_PROGRESS_SECONDS", 0)
+    lyceum_fake(total=5)
+    stats = await novo_servico(db_session).sync_all(streaming=True)
+    job = await db_session.get(SyncJob, stats["job_id"])
+    assert (job.status, job.modo, job.paginas, job.registros, job.processados) == ("concluido", "streaming", 3, 5, 5)
+    assert job.run_id == stats["run_id"]
+    assert job.estatisticas["inseridos"] == 5
+    assert job.total_estimado is None and job.concluido_em is not None
+
+    # Nova carga completa: total estimado pela anterior
+    stats = await novo_servico(db_session).sync_all(streaming=False)
+    job = await db_session.get(SyncJob, stats["job_id"])
+    assert (job.status, job.modo, job.total_estimado, job.eta_segundos) == ("concluido", "lista", 5, 0)
+    assert job.registros_por_segundo > 0
+
+
+@pytest.mark.asyncio
+async def test_modo_lista_registra_progresso_a_cada_pagina_baixada(db_session, lyceum_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+    from app.services.sync_jobs import SyncJobTracker
+
+    monkeypatch.setattr(settings, "SYNC_JOB_PROGRESS_SECONDS", 0)
+    lyceum_fake(total=5)
+    visto = []
+    progress = SyncJobTracker.progress
+
+    async def progress_observado(self, stats):
+        await progress(self, stats)
+        # O que GET /sync/jobs/{id} veria neste momento
+        job = await self.db.get(SyncJob, self.id, populate_existing=True)
+        visto.append((job.paginas, job.registros, stats["inseridos"]))
+
+    monkeypatch.setattr(SyncJobTracker, "progress", progress_observado)
+    stats = await novo_servico(db_session).sync_all(streaming=False)
+
+    assert stats["paginas"] == 3
+    # Antes da gravação (inseridos = 0) o job já mostra as páginas baixadas
+    assert visto[:3] == [(1, 2, 0), (2, 4, 0), (3, 5, 0)]
+
+
+@pytest.mark.asyncio
+async def test_gatilhos_simultaneos_se_juntam_ao_job_em_andamento(db_session):
+    from app.models.sync_job import SyncJob
+    from app.services.sync_jobs import start_job
+    from app.services.sync_lock import lock_key
+
+    job_id, lock = await start_job(db_session, "alunos", engine=db_session.bind)
+    assert lock is not None
+    assert await start_job(db_session, "alunos", engine=db_session.bind) == (job_id, None)
+
+    outra, lock_outra = await start_job(db_session, "docentes", engine=db_session.bind)
+    assert lock_outra is not None and outra != job_id
+    await lock_outra.release()
+
+    # Trava liberada com o job ainda "pendente": execução abandonada
+    await lock.release()
+    novo, lock = await start_job(db_session, "alunos", engine=db_session.bind)
+    await lock.release()
+    assert novo != job_id
+    assert (await db_session.get(SyncJob, job_id, populate_existing=True)).status == "interrompido"
+    assert lock_key("alunos") == lock_key("alunos") != lock_key("docentes")
+
+
+@pytest.mark.asyncio
+async def test_falha_ao_liberar_advisory_lock_descarta_a_conexao():
+    from app.services.sync_lock import SyncLock
+
+    class ConexaoComFalha:
+        chamadas = []
+
+        async def execute(self, stmt):
+            raise RuntimeError("conexão perdida")
+
+        async def invalidate(self):
+            self.chamadas.append("invalidate")
+
+        async def close(self):
+            self.chamadas.append("close")
+
+    conn = ConexaoComFalha()
+    await SyncLock("alunos", conn).release()
+    # close() devolveria ao pool a sessão que ainda segura o lock
+    assert conn.chamadas == ["invalidate"]
+
+
+@pytest.mark.asyncio
+async def test_execucao_cancelada_antes_de_comecar_libera_a_trava(db_session):
+    import asyncio
+
+    from app.services.sync_jobs import cancel_running_jobs, spawn_job
+    from app.services.sync_lock import SyncLock
+
+    chamadas = []
+
+    async def sync(db):
+        chamadas.append(db)
+
+    lock = await SyncLock.try_acquire(db_session.bind, "alunos")
+    task = await spawn_job("job", sync, lock)
+    task.cancel()  # ex: shutdown antes de a execução começar
+    await asyncio.gather(task, return_exceptions=True)
+    await cancel_running_jobs()
+
+    assert chamadas == [] and lock.released
+    outra = await SyncLock.try_acquire(db_session.bind, "alunos")
+    assert outra is not None
+    await lock.release()  # repetida: não solta a trava da outra execução
+    assert await SyncLock.try_acquire(db_session.bind, "alunos") is None
+    await outra.release()
+
+
+@pytest.mark.asyncio
+async def test_registro_sincroniza_todas_as_entidades_com_chave_composta(db_session, servidor_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models import LYMatricula, MODELS
+    from app.models.sync_watermark import SyncWatermark
+    from app.services.sync_registry import SYNC_SERVICES, sync_entity
+
+    monkeypatch.setattr(settings, "LYCEUM_API_PAGE_SIZE", 3)
+    servidor_fake(registros=7)
+    assert set(SYNC_SERVICES) == set(LyceumAPIClient.ENDPOINTS)
+    for entidade, model in MODELS.items():
+        stats = await sync_entity(db_session, entidade, streaming=entidade == "matriculas")
+        assert (stats["inseridos"], stats["ignorados"], stats["erros"]) == (7, 0, 0), entidade
+        assert await db_session.scalar(select(func.count()).select_from(model)) == 7
+
+    stats = await sync_entity(db_session, "matriculas")
+    assert (stats["inseridos"], stats["inalterados"]) == (0, 7)
+
+    matricula = await db_session.get(LYMatricula, ("ALUNO0000003", "DISCIPLINA0000003", "TURMA0000003", 2023, 2))
+    assert matricula is not None and matricula.hash_conteudo
+    # Sem filtro de marca d'água na API: nenhuma marca gravada (nunca seria lida)
+    assert await db_session.scalar(select(func.count()).select_from(SyncWatermark)) == 0
+
+
+@pytest.mark.asyncio
+async def test_agendador_alterna_completa_e_incremental_e_pula_execucao_ativa(db_arquivo, servidor_fake):
+    import asyncio
+
+    from app.models.sync_job import SyncJob
+    from app.services.sync_jobs import start_job
+    from app.services.sync_scheduler import SyncScheduler
+
+    servidor_fake(registros=4)
+    # Sessões independentes (agendador + execuções): banco em arquivo
+    scheduler = SyncScheduler({"cursos": (0.01, 3600), "docentes": (3600, 3600)}, session_factory=db_arquivo, jitter=0)
+
+    # Execução manual da entidade em andamento: a rodada agendada é pulada
+    async with db_arquivo() as db:
+        _, lock = await start_job(db, "docentes", engine=db.bind)
+    assert await scheduler.run_once("docentes") is None
+    await lock.release()
+
+    scheduler.cadences.pop("docentes")
+    scheduler.start()
+    for _ in range(200):
+        if scheduler.counters["cursos"]["incrementais"] >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+    async with db_arquivo() as db:
+        modos = (await db.execute(
+            # A última rodada pode ser cancelada pelo stop() antes de iniciar
+            select(SyncJob.incremental)
+            .where(SyncJob.entidade == "cursos", SyncJob.iniciado_em.isnot(None))
+            .order_by(SyncJob.iniciado_em)
+        )).scalars().all()
+
+    assert scheduler.counters["docentes"]["puladas"] == 1
+    assert scheduler.counters["cursos"]["completas"] == 1
+    assert modos[0] is False and all(modos[1:]) and len(modos) >= 2
+
+
+@pytest.mark.asyncio
+async def test_agendador_nao_repete_carga_completa_com_erros_nem_falha_recente(db_session, monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+    from app.services.sync_scheduler import SyncScheduler
+
+    monkeypatch.setattr(settings, "SYNC_SCHEDULE_FULL_RETRY_SECONDS", 3600)
+    scheduler = SyncScheduler({"alunos": (900, 86400)}, jitter=0)
+    agora = datetime.now()
+
+    async def completa(status, ha):
+        db_session.add(SyncJob(id=f"{status}-{ha}", entidade="alunos", status=status, incremental=False,
+                               concluido_em=agora - ha))
+        await db_session.commit()
+
+    assert await scheduler._full_due(db_session, "alunos")
+    # Concluída com erros de registro conta como concluída
+    await completa("concluido_com_erros", timedelta(minutes=1))
+    assert not await scheduler._full_due(db_session, "alunos")
+
+    await db_session.execute(SyncJob.__table__.delete())
+    await completa("concluido_com_erros", timedelta(days=2))
+    assert await scheduler._full_due(db_session, "alunos")
+    # Carga completa que falhou há pouco: espera SYNC_SCHEDULE_FULL_RETRY_SECONDS
+    await completa("erro", timedelta(minutes=10))
+    assert not await scheduler._full_due(db_session, "alunos")
+    await db_session.execute(SyncJob.__table__.delete().where(SyncJob.status == "erro"))
+    await completa("interrompido", timedelta(hours=2))
+    assert await scheduler._full_due(db_session, "alunos")
+
+
+@pytest.mark.asyncio
+async def test_primeira_carga_distribuida_conta_paginas_na_api(db_arquivo, lyceum_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+    from app.models.sync_shard import SyncShard
+    from app.services.sync_shards import ShardWorker, plan_sharded_job
+
+    monkeypatch.setattr(settings, "LYCEUM_API_PAGE_SIZE", 2)
+    lyceum_fake(total=13)  # 7 páginas, a última com 1 registro
+    async with db_arquivo() as db:
+        # Sem job anterior e com a tabela vazia não há estimativa
+        job_id, criado = await plan_sharded_job(db, "alunos", pages_per_shard=3, engine=db.bind)
+        faixas = (await db.execute(
+            select(SyncShard.pagina_inicial, SyncShard.pagina_final).order_by(SyncShard.pagina_inicial)
+        )).all()
+    await ShardWorker(session_factory=db_arquivo).run()
+    async with db_arquivo() as db:
+        job = await db.get(SyncJob, job_id)
+        alunos = await db.scalar(select(func.count()).select_from(LYAluno))
+
+    assert criado
+    assert faixas == [(0, 3), (3, 6), (6, None)]
+    assert (job.status, job.total_estimado, alunos) == ("concluido", 14, 13)
+
+
+@pytest.mark.asyncio
+async def test_carga_distribuida_em_faixas_com_lease_vencido_reivindicado(db_arquivo, lyceum_fake, monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+    from app.models.sync_shard import SyncShard
+    from app.services.sync_jobs import start_job
+    from app.services.sync_shards import ShardWorker, plan_sharded_job
+
+    monkeypatch.setattr(settings, "LYCEUM_API_PAGE_SIZE", 2)
+    lyceum_fake(total=10)
+    async with db_arquivo() as db:
+        # Carga anterior estima 10 registros = 5 páginas = 3 faixas de 2 páginas
+        db.add(SyncJob(id="anterior", entidade="alunos", status="concluido", incremental=False,
+                       registros=10, concluido_em=datetime.now()))
+        await db.commit()
+        job_id, criado = await plan_sharded_job(db, "alunos", pages_per_shard=2, engine=db.bind)
+        assert criado
+        # Faixas vivas seguram o single-flight mesmo sem a trava
+        assert await start_job(db, "alunos", engine=db.bind) == (job_id, None)
+
+    # Worker A reivindica a primeira faixa e "morre": o lease vence
+    morto = ShardWorker(worker_id="morto", session_factory=db_arquivo)
+    async with db_arquivo() as db:
+        faixa = await morto.claim(db)
+        await db.execute(update(SyncShard).where(SyncShard.id == faixa.id)
+                         .values(lease_ate=datetime.now() - timedelta(seconds=1)))
+        await db.commit()
+
+    # Em sequência: o SQLite não tem escritores concorrentes (no PostgreSQL, SKIP LOCKED)
+    workers = [ShardWorker(worker_id=f"w{i}", session_factory=db_arquivo) for i in range(2)]
+    await workers[0].run(max_shards=2)
+    await workers[1].run()
+    # O worker antigo volta e perde a faixa no primeiro heartbeat
+    await morto._process(faixa)
+
+    async with db_arquivo() as db:
+        job = await db.get(SyncJob, job_id)
+        faixas = (await db.execute(select(SyncShard).order_by(SyncShard.pagina_inicial))).scalars().all()
+        alunos = await db.scalar(select(func.count()).select_from(LYAluno))
+
+    assert [(f.pagina_inicial, f.pagina_final, f.status) for f in faixas] == [
+        (0, 2, "concluido"), (2, 4, "concluido"), (4, None, "concluido"),
+    ]
+    assert faixas[0].tentativas == 2 and faixas[0].worker != "morto"
+    assert [w.counters["faixas"] for w in workers] == [2, 1]
+    assert morto.counters["perdidas"] == 1
+    assert alunos == 10
+    assert (job.status, job.modo, job.registros, job.processados) == ("concluido", "shards", 10, 10)
+    assert job.estatisticas["shards"] == 3
+
+
+@pytest.mark.asyncio
+async def test_faixa_com_falha_espera_antes_de_nova_tentativa_e_esgota(db_arquivo, pool_fake, monkeypatch):
+    from datetime import datetime, timedelta
+
+    from app.core.config import settings
+    from app.models.sync_job import SyncJob
+    from app.models.sync_shard import SyncShard
+    from app.services.sync_shards import ShardWorker, plan_sharded_job
+
+    monkeypatch.setattr(settings, "LYCEUM_API_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "LYCEUM_API_MAX_RETRIES", 0)
+    monkeypatch.setattr(settings, "SYNC_SHARD_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "SYNC_SHARD_RETRY_SECONDS", 60)
+    pedidas = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        pedidas.append(page)
+        if page == 3:
+            return httpx.Response(503)  # falha determinística dentro da segunda faixa
+        data = [{"aluno": f"{i:05d}"} for i in range(page * 2, min(page * 2 + 2, 10))]
+        return httpx.Response(200, json={"data": data})
+
+    pool_fake(handler)
+    async with db_arquivo() as db:
+        db.add(SyncJob(id="anterior", entidade="alunos", status="concluido", incremental=False,
+                       registros=10, concluido_em=datetime.now()))
+        await db.commit()
+        job_id, _ = await plan_sharded_job(db, "alunos", pages_per_shard=2, engine=db.bind)
+
+    worker = ShardWorker(session_factory=db_arquivo)
+    await worker.run()
+    async with db_arquivo() as db:
+        faixa = await db.scalar(select(SyncShard).where(SyncShard.pagina_inicial == 2))
+    # Não é reivindicada de novo na mesma rodada: espera a próxima tentativa
+    assert (faixa.status, faixa.tentativas, worker.counters["erros"]) == ("pendente", 1, 1)
+    assert faixa.proxima_tentativa > datetime.now() + timedelta(seconds=50)
+    assert pedidas.count(3) == 1
+
+    async with db_arquivo() as db:
+        await db.execute(update(SyncShard).where(SyncShard.id == faixa.id)
+                         .values(proxima_tentativa=datetime.now() - timedelta(seconds=1)))
+        await db.commit()
+    await worker.run()
+    async with db_arquivo() as db:
+        faixa = await db.get(SyncShard, faixa.id)
+        job = await db.get(SyncJob, job_id)
+    # Limite de tentativas: a faixa vira erro e o job é encerrado
+    assert (faixa.status, faixa.tentativas, faixa.proxima_tentativa) == ("erro", 2, None)
+    assert job.status == "concluido_com_erros" and "faixa 2-4" in job.erro
+    assert pedidas.count(3) == 2
+
+
+@pytest.mark.asyncio
+async def test_dag_roda_independentes_em_paralelo_e_pula_dependentes_de_falha(db_arquivo, servidor_fake, monkeypatch):
+    import asyncio
+
+    from app.services import sync_dag
+    from app.services.sync_dag import SyncDAGRunner, dependency_graph, dependency_levels
+
+    assert dependency_levels(dependency_graph())[0] == ["cursos"]
+
+    eventos = []
+    banco = asyncio.Lock()  # SQLite: um escritor por vez; a espera simula a API
+    sync_real = sync_dag.sync_entity
+
+    async def sync_instrumentado(db, entidade, **kwargs):
+        eventos.append(("inicio", entidade))
+        await asyncio.sleep(0.05)
+        if entidade == "docentes":
+            raise RuntimeError("falha simulada")
+        async with banco:
+            stats = await sync_real(db, entidade, **kwargs)
+        eventos.append(("fim", entidade))
+        return stats
+
+    monkeypatch.setattr(sync_dag, "sync_entity", sync_instrumentado)
+    servidor_fake(registros=4)
+    runner = SyncDAGRunner(
+        ["turma_docente", "turmas", "docentes", "disciplinas", "cursos"], max_concurrent=3, session_factory=db_arquivo
+    )
+    relatorio = await runner.run()
+
+    status = {e: r["status"] for e, r in relatorio["entidades"].items()}
+    assert status == {
+        "cursos": "concluido", "disciplinas": "concluido", "docentes": "erro",
+        "turmas": "concluido", "turma_docente": "pulado",
+    }
+    # Filhas de cursos começam juntas, só depois dele; turmas espera disciplinas
+    assert eventos.index(("fim", "cursos")) < eventos.index(("inicio", "disciplinas"))
+    assert {eventos[2], eventos[3]} == {("inicio", "disciplinas"), ("inicio", "docentes")}
+    assert eventos.index(("fim", "disciplinas")) < eventos.index(("inicio", "turmas"))
+    assert relatorio["caminho_critico"] == ["cursos", "disciplinas", "turmas"]
+    assert relatorio["total_segundos"] < relatorio["serial_segundos"]
+
+
+@pytest.mark.asyncio
+async def test_dag_transforma_excecao_de_infraestrutura_em_erro_da_entidade():
+    from app.services.sync_dag import SyncDAGRunner
+
+    def sessao_indisponivel():
+        raise RuntimeError("banco fora do ar")
+
+    runner = SyncDAGRunner(["cursos", "disciplinas", "docentes"], session_factory=sessao_indisponivel)
+    relatorio = await runner.run()
+
+    status = {e: r["status"] for e, r in relatorio["entidades"].items()}
+    assert status == {"cursos": "erro", "disciplinas": "pulado", "docentes": "pulado"}
+    assert relatorio["entidades"]["cursos"]["erro"] == "banco fora do ar"
+
+
+@pytest.mark.asyncio
+async def test_dry_run_compara_api_e_banco_por_merge_ordenado_sem_gravar(db_session, lyceum_fake):
+    lyceum_fake(total=6)
+    await novo_servico(db_session).sync_all(streaming=False)
+    await db_session.execute(update(LYAluno).where(LYAluno.aluno == "00001").values(hash_conteudo="antigo"))
+    await db_session.execute(update(LYAluno).where(LYAluno.aluno == "00002").values(removido_origem=True))
+    db_session.add(LYAluno(aluno="99999", nome_compl="Só no banco"))
+    await db_session.commit()
+
+    lyceum_fake(total=8)
+    relatorio = await novo_servico(db_session).dry_run()
+
+    assert {k: relatorio[k] for k in ("inserir", "atualizar", "remover", "inalterados")} == {
+        "inserir": 2, "atualizar": 2, "remover": 1, "inalterados": 4,
+    }
+    assert relatorio["amostras"] == {
+        "inserir": ["00006", "00007"], "atualizar": ["00001", "00002"], "remover": ["99999"],
+    }
+    assert (relatorio["registros_api"], relatorio["registros_banco"]) == (8, 7)
+    # Nada foi gravado
+    assert await db_session.scalar(select(func.count()).select_from(LYAluno)) == 7
+    assert (await db_session.get(LYAluno, "00001")).hash_conteudo == "antigo"
+
+
+@pytest.mark.asyncio
+async def test_lote_com_erro_nao_derruba_a_sincronizacao(db_session, lyceum_fake, monkeypatch):
+    from app.core.config import settings
+    from app.models.sync_watermark import SyncWatermark
+
+    monkeypatch.setattr(settings, "SYNC_COMMIT_EVERY", 2)
+    lyceum_fake(total=5)
+    service = novo_servico(db_session)
+    normalize = service.normalize_data
+
+    async def normalize_com_defeito(raw):
+        row = await normalize(raw)
+        if raw["aluno"] == "00003":
+            row["data_sincronizacao"] = None  # viola NOT NULL: derruba o lote 2
+        return row
+
+    service.normalize_data = normalize_com_defeito
+    stats = await service.sync_all(streaming=False)
+
+    assert (stats["inseridos"], stats["erros"], stats["lotes_com_erro"]) == (3, 2, 1)
+    assert not stats["interrompido"]
+    alunos = (await db_session.execute(select(LYAluno.aluno).order_by(LYAluno.aluno))).scalars().all()
+    assert alunos == ["00000", "00001", "00004"]
+    assert await db_session.get(SyncWatermark, "alunos") is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sobrepoe_estagios_com_backpressure():
+    import asyncio
+
+    from app.services.lyceum_api import LyceumPaginationError
+    from app.services.sync_pipeline import SyncPipeline
+
+    eventos = []
+
+    async def paginas():
+        for page in range(6):
+            await asyncio.sleep(0.002)
+            eventos.append(("baixada", page))
+            yield page, [{"aluno": str(page)}]
+        raise LyceumPaginationError("/alunos", 6, "falha simulada")
+
+    async def normalizar(items):
+        return items
+
+    gravadas = []
+
+    async def gravar(page, rows, recebidos):
+        eventos.append(("gravando", page))
+        await asyncio.sleep(0.01)
+        gravadas.append(page)
+
+    pipeline = SyncPipeline(queue_size=1)
+    with pytest.raises(LyceumPaginationError):
+        await pipeline.run(paginas(), normalizar, gravar)
+
+    # Páginas baixadas antes do erro ainda são gravadas, na ordem
+    assert gravadas == list(range(6))
+    # A página 1 foi baixada enquanto a 0 era gravada
+    assert eventos.index(("baixada", 1)) > eventos.index(("gravando", 0))
+    assert eventos.index(("baixada", 1)) < eventos.index(("gravando", 1))
+    # Backpressure: a busca nunca fica mais que 2 filas + 1 estágio à frente
+    for page in range(6):
+        adiantadas = eventos[:eventos.index(("gravando", page))].count
+        assert sum(adiantadas(("baixada", p)) for p in range(6)) <= page + 4
+    assert pipeline.counters["gravacao"]["paginas"] == 6
+
+
+@pytest.mark.asyncio
+async def test_dry_run_ordena_chaves_da_api_em_blocos_no_disco(db_session, lyceum_fake, monkeypatch):
+    from app.core.config import settings
+    from app.services.sync_diff import SpillingSorter
+
+    ordenador = SpillingSorter(chunk=2)
+    for chave, hash_ in [("c", "1"), ("a", "1"), ("b", "1"), ("a", "2"), ("d", "1"), ("c", "2"), ("e", "1")]:
+        ordenador.add(chave, hash_)
+    assert ordenador.blocos == 3
+    # Chave repetida em blocos diferentes: vale a última ocorrência
+    assert list(ordenador) == [("a", "2"), ("b", "1"), ("c", "2"), ("d", "1"), ("e", "1")]
+    assert ordenador.chaves == 5
+
+    monkeypatch.setattr(settings, "SYNC_DIFF_API_CHUNK", 3)
+    lyceum_fake(total=4)
+    await novo_servico(db_session).sync_all(streaming=False)
+    lyceum_fake(total=8)
+    relatorio = await novo_servico(db_session).dry_run()
+    assert (relatorio["inserir"], relatorio["inalterados"], relatorio["chaves_api"]) == (4, 4, 8)
+    assert relatorio["blocos_api_em_disco"] == 2